@@ -39,7 +39,7 @@ except ImportError:
 # 이미지 처리 관련 임포트 (선택적)
 try:
     from PIL import Image
-    import pytesseract
+    from .utils.file_utils import ocr_image
     IMAGE_PROCESSING_AVAILABLE = True
     print("✅ 이미지 처리 사용 가능")
 except ImportError:
@@ -290,7 +290,8 @@ class AdvancedAIIntegration:
         """이미지 내용 추출 (OCR)"""
         try:
             image = Image.open(file_path)
-            text = pytesseract.image_to_string(image, lang='kor+eng')
+            # 공용 OCR 경로 사용 (미리 로드된 tesserocr/GPU 모델 재사용), 블로킹 작업이라 스레드에서 실행
+            text = await asyncio.to_thread(ocr_image, image)
             return text[:2000]  # 최대 2000자
         except Exception as e:
             logger.warning(f"이미지 OCR 실패: {e}")
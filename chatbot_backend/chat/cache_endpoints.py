@@ -99,6 +99,7 @@ def get_cache_statistics(request):
         return Response({
             'success': True,
             'statistics': stats,
+            'generation_cache': llm_cache_manager.get_generation_statistics(),
             'session_id': session_id
         })
         
@@ -1,6 +1,7 @@
 """
 AI 모델 설정 및 상수
 """
+import os
 
 KOREAN_LANGUAGE_INSTRUCTION = "\n\nIMPORTANT: Regardless of the question language, you MUST respond in natural and fluent Korean. Never reply in any other language."
 
@@ -19,3 +20,12 @@ OPENAI_MODEL_COMPLETION_LIMITS = [
 
 DEFAULT_OPENAI_COMPLETION_LIMIT = 4096
 
+# Ollama 동시 요청 수 (Ollama 서버의 OLLAMA_NUM_PARALLEL과 맞춰 설정)
+OLLAMA_NUM_PARALLEL = int(os.getenv('OLLAMA_NUM_PARALLEL', '4'))
+
+# 의미 기반 응답 캐시: 첫 질문의 임베딩 코사인 유사도가 이 값 이상이면 같은 질문으로 보고 캐시된 응답 재사용
+# 다른 질문에 잘못된 응답을 돌려줄 수 있으므로 기본값은 비활성화
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', '').lower() in ('1', 'true')
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+# 한국어 질문을 구분할 수 있도록 다국어 임베딩 모델 사용
+SEMANTIC_CACHE_MODEL = os.getenv('SEMANTIC_CACHE_MODEL', 'paraphrase-multilingual-MiniLM-L12-v2')
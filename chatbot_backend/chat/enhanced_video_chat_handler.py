@@ -646,11 +646,22 @@ class EnhancedVideoChatHandler:
                 logger.info(f"✅ chatbots 사용 가능, 모델 수: {len(chatbots)}")
                 logger.info(f"   가능한 모델: {list(chatbots.keys())}")
                 
+                # 우선순위 모델들을 동시에 호출 (순차 호출 시 지연이 모델 수만큼 누적됨)
+                from .utils.chatbot import chat_concurrently
+                named_bots = {}
                 for model_key in priority_model_keys:
-                    if model_key in chatbots:
+                    try:
+                        named_bots[model_key] = chatbots[model_key]
+                    except KeyError:
+                        pass
+                chat_results = chat_concurrently(named_bots, ai_prompt)
+                
+                for model_key in priority_model_keys:
+                    if model_key in chat_results:
                         try:
-                            bot = chatbots[model_key]
-                            response = bot.chat(ai_prompt)
+                            response = chat_results[model_key]
+                            if isinstance(response, Exception):
+                                raise response
                             
                             # 부적절한 응답 필터링 (영상 정보 부재 메시지 및 불필요한 기술 정보)
                             blocked_patterns = [
@@ -777,9 +788,9 @@ class EnhancedVideoChatHandler:
         """다중 AI 응답 통합 (HCX-DASH-001 사용)"""
         try:
             # 각 AI의 응답을 정리
-            responses_text = ""
-            for model_name, response in ai_responses.items():
-                responses_text += f"### {model_name.upper()}:\n{response}\n\n"
+            responses_text = "".join(
+                f"### {model_name.upper()}:\n{response}\n\n" for model_name, response in ai_responses.items()
+            )
             
             # HCX-DASH-001로 통합 답변 생성
             chatbots = get_chatbots()
@@ -17,10 +17,21 @@ from dataclasses import dataclass
 from datetime import datetime
 import hashlib
 import time
+from functools import lru_cache
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+# 응답 간 충돌 감지용 연도/지역 언급 패턴
+_YEAR_MENTION_RE = re.compile(r'\d{4}년|\d{4}에')
+_LOCATION_MENTION_RE = re.compile(r'[가-힣]+시|[가-힣]+도')
+
+
+@lru_cache(maxsize=64)
+def _fact_mentions(response: str) -> Tuple[frozenset, frozenset]:
+    """응답의 (연도 언급 집합, 지역 언급 집합) - 충돌 감지/신뢰도/경고 계산이 같은 응답을 한 번만 스캔하도록 캐시"""
+    return frozenset(_YEAR_MENTION_RE.findall(response)), frozenset(_LOCATION_MENTION_RE.findall(response))
+
 @dataclass
 class FactualClaim:
     """사실적 주장"""
@@ -1416,8 +1427,6 @@ class FactualVerificationSystem:
     
     def _detect_conflicts(self, verified_responses: Dict[str, str], query: str) -> Dict[str, List[str]]:
         """응답들 간의 충돌 정보 감지"""
-        import re
-        
         conflicts = {
             'years': [],
             'locations': [],
@@ -1427,9 +1436,10 @@ class FactualVerificationSystem:
         # 각 AI의 정보 수집
         ai_info = {}
         for ai_name, response in verified_responses.items():
+            years, locations = _fact_mentions(response)
             ai_info[ai_name] = {
-                'years': re.findall(r'\d{4}년|\d{4}에', response),
-                'locations': re.findall(r'[가-힣]+시|[가-힣]+도', response)
+                'years': years,
+                'locations': locations
             }
         
         # 연도 충돌 확인
@@ -1463,15 +1473,13 @@ class FactualVerificationSystem:
         """AI 응답의 신뢰도 계산"""
         confidence = 70.0  # 기본 신뢰도
         
-        # 충돌 정보가 있으면 신뢰도 감소
-        import re
-        response_years = re.findall(r'\d{4}년|\d{4}에', response)
-        response_locations = re.findall(r'[가-힣]+시|[가-힣]+도', response)
+        # 충돌 정보가 있으면 신뢰도 감소 (충돌 목록과 응답 언급 집합의 교집합 여부만 확인)
+        response_years, response_locations = _fact_mentions(response)
         
-        if conflicts['years'] and any(year in response_years for year in conflicts['years']):
+        if not response_years.isdisjoint(conflicts['years']):
             confidence -= 20
         
-        if conflicts['locations'] and any(loc in response_locations for loc in conflicts['locations']):
+        if not response_locations.isdisjoint(conflicts['locations']):
             confidence -= 15
         
         # 정확한 정보가 많으면 신뢰도 증가
@@ -1486,18 +1494,16 @@ class FactualVerificationSystem:
         """특정 AI의 충돌 경고 생성"""
         warnings = []
         
-        import re
-        response_years = re.findall(r'\d{4}년|\d{4}에', response)
-        response_locations = re.findall(r'[가-힣]+시|[가-힣]+도', response)
+        response_years, response_locations = _fact_mentions(response)
         
-        if conflicts['years'] and any(year in response_years for year in conflicts['years']):
+        if not response_years.isdisjoint(conflicts['years']):
             warnings.append("설립 연도 불일치")
         
         # 위치 정보 충돌은 관련 질문에만 적용
         location_relevant_keywords = ['대학', '학교', '기관', '회사', '조직', '도시', '나라', '국가']
         if (conflicts['locations'] and 
             any(keyword in query.lower() for keyword in location_relevant_keywords) and
-            any(loc in response_locations for loc in conflicts['locations'])):
+            not response_locations.isdisjoint(conflicts['locations'])):
             warnings.append("위치 정보 불일치")
         
         return warnings
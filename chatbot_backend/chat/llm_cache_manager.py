@@ -3,21 +3,48 @@ LLM 캐시 관리 시스템
 새로고침 시 캐시 초기화하되, 세션 내에서는 대화 기억 유지
 """
 
+import re
 import json
+import hashlib
+import unicodedata
 import logging
+import threading
+import importlib.util
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+import numpy as np
 from django.core.cache import cache
 from django.conf import settings
 
+from .config.ai_config import SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD
+
+# sentence-transformers는 import만으로도 torch를 올리므로 설치 여부만 확인하고 처음 사용할 때 로드
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_cache_text(text: str) -> str:
+    """캐시 키/임베딩용 텍스트 정규화 (앞뒤 공백 제거, 연속 공백 축약, NFC)
+
+    모델에 보내는 원문은 그대로 두고 캐시 비교에만 사용한다.
+    """
+    return unicodedata.normalize("NFC", _WHITESPACE_RE.sub(" ", text.strip()))
+
+
 class LLMCacheManager:
     """LLM 응답 캐시를 관리하는 클래스"""
     
     def __init__(self, cache_timeout: int = 1800):  # 30분
         self.cache_timeout = cache_timeout
         self.session_cache_timeout = 3600  # 1시간 (세션 유지)
+        self.generation_cache_timeout = 86400  # 24시간 (세션과 무관한 동일 요청 응답)
+        # 동일 요청 응답 캐시 히트/미스 횟수 (프로세스 단위)
+        self.generation_hits = 0
+        self.generation_misses = 0
     
     def get_session_key(self, session_id: str) -> str:
         """세션별 캐시 키 생성"""
@@ -25,10 +52,74 @@ class LLMCacheManager:
     
     def get_cache_key(self, session_id: str, query: str) -> str:
         """쿼리별 캐시 키 생성"""
-        import hashlib
         query_hash = hashlib.md5(query.encode()).hexdigest()
         return f"llm_cache_{session_id}_{query_hash}"
     
+    def get_generation_key(self, model: str, messages: List[Dict[str, Any]], options: Optional[Dict[str, Any]] = None) -> str:
+        """모델 + 메시지 + 옵션으로 LLM 호출 결과 캐시 키 생성 (완전히 같은 요청만 히트)"""
+        # 공백/유니코드 표현만 다른 메시지도 같은 키가 되도록 content를 정규화
+        normalized_messages = [
+            {**message, 'content': normalize_cache_text(message['content'])}
+            if isinstance(message.get('content'), str) else message
+            for message in messages
+        ]
+        payload = json.dumps(
+            {'model': model, 'messages': normalized_messages, 'options': options or {}},
+            ensure_ascii=False, sort_keys=True
+        )
+        return f"llm_gen_{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+    
+    def get_generation(self, cache_key: str) -> Optional[str]:
+        """캐시된 LLM 호출 결과 가져오기"""
+        try:
+            return self._count_generation(cache.get(cache_key))
+        except Exception as e:
+            logger.error(f"❌ LLM 호출 캐시 조회 실패: {e}")
+            return None
+    
+    def store_generation(self, cache_key: str, content: str) -> None:
+        """LLM 호출 결과 저장 (빈 응답은 저장하지 않음)"""
+        if not content:
+            return
+        try:
+            cache.set(cache_key, content, self.generation_cache_timeout)
+        except Exception as e:
+            logger.error(f"❌ LLM 호출 캐시 저장 실패: {e}")
+    
+    async def aget_generation(self, cache_key: str) -> Optional[str]:
+        """get_generation의 비동기 버전"""
+        try:
+            return self._count_generation(await cache.aget(cache_key))
+        except Exception as e:
+            logger.error(f"❌ LLM 호출 캐시 조회 실패: {e}")
+            return None
+    
+    async def astore_generation(self, cache_key: str, content: str) -> None:
+        """store_generation의 비동기 버전"""
+        if not content:
+            return
+        try:
+            await cache.aset(cache_key, content, self.generation_cache_timeout)
+        except Exception as e:
+            logger.error(f"❌ LLM 호출 캐시 저장 실패: {e}")
+    
+    def _count_generation(self, content: Optional[str]) -> Optional[str]:
+        """동일 요청 캐시 조회 결과를 히트/미스로 집계"""
+        if content is None:
+            self.generation_misses += 1
+        else:
+            self.generation_hits += 1
+        return content
+    
+    def get_generation_statistics(self) -> Dict[str, Any]:
+        """동일 요청 응답 캐시 히트/미스 통계"""
+        total = self.generation_hits + self.generation_misses
+        return {
+            'hits': self.generation_hits,
+            'misses': self.generation_misses,
+            'hit_rate': self.generation_hits / total if total else 0.0
+        }
+    
     def store_llm_response(self, session_id: str, query: str, ai_name: str, response: str) -> None:
         """LLM 응답을 캐시에 저장"""
         try:
@@ -109,11 +200,11 @@ class LLMCacheManager:
         """모든 LLM 캐시 초기화"""
         try:
             # 패턴으로 모든 LLM 관련 캐시 삭제
-            from django.core.cache.utils import make_template_fragment_key
-            
             # 모든 세션 캐시 삭제
             cache.delete_many(cache.keys("llm_session_*"))
             cache.delete_many(cache.keys("llm_cache_*"))
+            cache.delete_many(cache.keys("llm_gen_*"))
+            semantic_response_cache.clear()
             
             logger.info("✅ 모든 LLM 캐시 초기화 완료")
             
@@ -331,6 +422,122 @@ class ConversationContextManager:
             logger.error(f"❌ 최적 응답 선택 실패: {e}")
             return list(ai_responses.values())[0] if ai_responses else ""
 
+class SemanticResponseCache:
+    """질문 임베딩 유사도로 표현만 다른 같은 질문의 응답을 재사용하는 프로세스 내 캐시
+    
+    네임스페이스(모델)마다 정규화된 임베딩 행렬을 두고 내적(=코사인 유사도)으로 전수 탐색한다.
+    항목 수가 max_entries를 넘으면 가장 오래 쓰이지 않은 항목의 자리를 재사용한다 (LRU).
+    """
+    
+    def __init__(self, model_name: str = SEMANTIC_CACHE_MODEL, threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 max_entries: int = 50000, enabled: bool = SEMANTIC_CACHE_ENABLED):
+        self.enabled = enabled
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._model = None  # None: 미초기화, False: 사용 불가
+        self._model_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, Dict[str, Any]] = {}
+    
+    @property
+    def available(self) -> bool:
+        return (self.enabled and SENTENCE_TRANSFORMERS_AVAILABLE
+                and self._model is not False and self.threshold < 1.0)
+    
+    def _get_model(self):
+        """임베딩 모델 지연 로드 (실패하면 이후 조회는 모두 미스)"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                        self._model = SentenceTransformer(self.model_name)
+                        logger.info(f"✅ 의미 캐시 임베딩 모델 로드: {self.model_name}")
+                    except Exception as e:
+                        logger.warning(f"⚠️ 의미 캐시 임베딩 모델 로드 실패, 의미 캐시를 사용하지 않습니다: {e}")
+                        self._model = False
+        return self._model or None
+    
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        model = self._get_model()
+        if model is None:
+            return None
+        return np.asarray(model.encode(normalize_cache_text(text), normalize_embeddings=True), dtype=np.float32)
+    
+    def lookup(self, namespace: str, text: str) -> Optional[str]:
+        """유사도가 threshold 이상인 가장 비슷한 질문의 응답 반환 (없으면 None)"""
+        if not self.available:
+            return None
+        try:
+            vector = self._embed(text)
+            if vector is None:
+                return None
+            with self._lock:
+                store = self._namespaces.get(namespace)
+                if not store or not store['lru']:
+                    return None
+                scores = store['vectors'][:store['allocated']] @ vector
+                scores[~store['used'][:store['allocated']]] = -1.0
+                slot = int(np.argmax(scores))
+                if scores[slot] < self.threshold:
+                    return None
+                store['lru'].move_to_end(slot)
+                logger.info(f"✅ 의미 캐시 히트: {namespace} (유사도 {scores[slot]:.3f})")
+                return store['responses'][slot]
+        except Exception as e:
+            logger.error(f"❌ 의미 캐시 조회 실패: {e}")
+            return None
+    
+    def insert(self, namespace: str, text: str, response: str) -> None:
+        """질문 임베딩과 응답 저장"""
+        if not response or not self.available:
+            return
+        try:
+            vector = self._embed(text)
+            if vector is None:
+                return
+            with self._lock:
+                store = self._namespaces.get(namespace)
+                if store is None:
+                    store = {
+                        'vectors': np.zeros((64, vector.shape[0]), dtype=np.float32),
+                        'used': np.zeros(64, dtype=bool),
+                        'responses': [None] * 64,
+                        'allocated': 0,
+                        'lru': OrderedDict(),
+                    }
+                    self._namespaces[namespace] = store
+                
+                if store['allocated'] < self.max_entries:
+                    slot = store['allocated']
+                    if slot == len(store['used']):
+                        # 용량을 두 배로 늘림 (max_entries를 넘지 않게)
+                        capacity = min(self.max_entries, slot * 2)
+                        store['vectors'] = np.concatenate(
+                            [store['vectors'], np.zeros((capacity - slot, vector.shape[0]), dtype=np.float32)]
+                        )
+                        store['used'] = np.concatenate([store['used'], np.zeros(capacity - slot, dtype=bool)])
+                        store['responses'].extend([None] * (capacity - slot))
+                    store['allocated'] += 1
+                else:
+                    slot, _ = store['lru'].popitem(last=False)
+                
+                store['vectors'][slot] = vector
+                store['used'][slot] = True
+                store['responses'][slot] = response
+                store['lru'][slot] = None
+                store['lru'].move_to_end(slot)
+        except Exception as e:
+            logger.error(f"❌ 의미 캐시 저장 실패: {e}")
+    
+    def clear(self) -> None:
+        """모든 의미 캐시 항목 삭제"""
+        with self._lock:
+            self._namespaces.clear()
+
+
 # 전역 인스턴스 생성
 llm_cache_manager = LLMCacheManager()
 conversation_context_manager = ConversationContextManager()
+semantic_response_cache = SemanticResponseCache()
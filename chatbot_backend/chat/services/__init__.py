@@ -13,6 +13,7 @@ from .video_search import (
     search_wikipedia,
     extract_search_terms_from_question,
     search_wikipedia_api,
+    search_wikipedia_titles,
     get_wikipedia_full_text,
     search_google_simple
 )
@@ -35,6 +36,7 @@ __all__ = [
     'search_wikipedia',
     'extract_search_terms_from_question',
     'search_wikipedia_api',
+    'search_wikipedia_titles',
     'get_wikipedia_full_text',
     'search_google_simple',
     
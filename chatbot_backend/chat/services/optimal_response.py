@@ -5,41 +5,73 @@
 import os
 import re
 import json
+import time
+import hashlib
 import asyncio
-import aiohttp
+import logging
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import openai
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
 from difflib import SequenceMatcher
+from django.core.cache import cache
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 # 로컬 imports
 from ..utils.error_handlers import get_user_friendly_error_message
-from ..utils.ai_utils import get_openai_completion_limit
+from ..utils.ai_utils import get_background_loop, get_openai_completion_limit
 from .verification_sources import get_best_verification_source
+from ..llm_cache_manager import normalize_cache_text
 
+logger = logging.getLogger(__name__)
 
-def detect_question_type_from_content(content):
-    """질문 내용에서 실제 질문 유형 감지: code, image, document, creative, general"""
-    
-    content_lower = content.lower()
-    
-    # 코드 관련 키워드
-    code_keywords = ['코드', 'code', '함수', 'function', '프로그래밍', 'programming', '알고리즘', 'algorithm', 
-                     '구현', 'implement', '작성', 'write', '개발', 'develop', '스크립트', 'script',
-                     '파이썬', 'python', '자바', 'java', '자바스크립트', 'javascript', 'c++', 'c#']
-    
-    # 이미지 관련 키워드
-    image_keywords = ['이미지', 'image', '사진', 'photo', '그림', 'picture', '시각', 'visual', '화면']
-    
-    # 문서 관련 키워드
-    document_keywords = ['문서', 'document', 'pdf', '파일', 'file', '요약', 'summary', '내용', 'content']
-    
-    # 창작/글쓰기 관련 키워드
-    creative_keywords = ['글쓰기', 'writing', '창작', 'creative', '소설', 'novel', '시', 'poem', '에세이', 'essay',
-                        '이야기', 'story', '내용 작성', 'write content', '문장', 'sentence']
-    
-    # 코드 관련 질문 감지
-    if any(keyword in content_lower for keyword in code_keywords):
-        code_patterns = [
+
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key):
+    """API 키별 OpenAI 클라이언트 (호출마다 새로 만들지 않고 httpx 커넥션 풀/keep-alive 재사용)"""
+    return openai.OpenAI(api_key=api_key)
+
+
+def _json_loads(data):
+    """응답 본문 파싱 (str/bytes, orjson이 있으면 우선 사용)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _compile_question_type_rule(keywords, patterns):
+    """(키워드 목록, 키워드 정규식, 질문 패턴 정규식)을 미리 컴파일"""
+    keyword_re = re.compile("|".join(re.escape(keyword) for keyword in keywords))
+    pattern_re = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    return keywords, keyword_re, pattern_re
+
+
+# 질문 유형 감지 규칙 (우선순위 순): 키워드가 있고 질문 패턴도 맞아야 해당 유형
+QUESTION_TYPE_RULES = [
+    # 코드 관련
+    ('code', *_compile_question_type_rule(
+        ['코드', 'code', '함수', 'function', '프로그래밍', 'programming', '알고리즘', 'algorithm',
+         '구현', 'implement', '작성', 'write', '개발', 'develop', '스크립트', 'script',
+         '파이썬', 'python', '자바', 'java', '자바스크립트', 'javascript', 'c++', 'c#'],
+        [
             r'코드.*작성|작성.*코드',
             r'함수.*만들|만들.*함수',
             r'구현.*해|해.*구현',
@@ -48,34 +80,32 @@ def detect_question_type_from_content(content):
             r'파이썬.*코드|코드.*파이썬',
             r'알고리즘.*구현|구현.*알고리즘'
         ]
-        if any(re.search(pattern, content_lower) for pattern in code_patterns):
-            return 'code'
-    
-    # 이미지 관련 질문 감지
-    if any(keyword in content_lower for keyword in image_keywords):
-        image_patterns = [
+    )),
+    # 이미지 관련
+    ('image', *_compile_question_type_rule(
+        ['이미지', 'image', '사진', 'photo', '그림', 'picture', '시각', 'visual', '화면'],
+        [
             r'이미지.*분석|분석.*이미지',
             r'사진.*설명|설명.*사진',
             r'그림.*뭐|뭐.*그림',
             r'이미지.*뭐|뭐.*이미지'
         ]
-        if any(re.search(pattern, content_lower) for pattern in image_patterns):
-            return 'image'
-    
-    # 문서 관련 질문 감지
-    if any(keyword in content_lower for keyword in document_keywords):
-        document_patterns = [
+    )),
+    # 문서 관련
+    ('document', *_compile_question_type_rule(
+        ['문서', 'document', 'pdf', '파일', 'file', '요약', 'summary', '내용', 'content'],
+        [
             r'문서.*분석|분석.*문서',
             r'파일.*내용|내용.*파일',
             r'pdf.*요약|요약.*pdf',
             r'문서.*요약|요약.*문서'
         ]
-        if any(re.search(pattern, content_lower) for pattern in document_patterns):
-            return 'document'
-    
-    # 창작/글쓰기 관련 질문 감지
-    if any(keyword in content_lower for keyword in creative_keywords):
-        creative_patterns = [
+    )),
+    # 창작/글쓰기 관련
+    ('creative', *_compile_question_type_rule(
+        ['글쓰기', 'writing', '창작', 'creative', '소설', 'novel', '시', 'poem', '에세이', 'essay',
+         '이야기', 'story', '내용 작성', 'write content', '문장', 'sentence'],
+        [
             r'글.*쓰|쓰.*글',
             r'소설.*작성|작성.*소설',
             r'시.*작성|작성.*시',
@@ -83,20 +113,129 @@ def detect_question_type_from_content(content):
             r'창작.*해|해.*창작',
             r'에세이.*작성|작성.*에세이'
         ]
-        if any(re.search(pattern, content_lower) for pattern in creative_patterns):
-            return 'creative'
+    )),
+]
+
+
+def _build_question_type_automaton():
+    """모든 유형의 키워드를 Aho-Corasick 오토마톤 하나로 묶음 (키워드 -> 해당 유형 집합)"""
+    keyword_types = defaultdict(set)
+    for question_type, keywords, _, _ in QUESTION_TYPE_RULES:
+        for keyword in keywords:
+            keyword_types[keyword].add(question_type)
+    automaton = ahocorasick.Automaton()
+    for keyword, question_types in keyword_types.items():
+        automaton.add_word(keyword, frozenset(question_types))
+    automaton.make_automaton()
+    return automaton
+
+
+# pyahocorasick이 있으면 키워드 검사를 유형별 정규식 대신 한 번의 스캔으로 처리
+_QUESTION_TYPE_AUTOMATON = _build_question_type_automaton() if AHOCORASICK_AVAILABLE else None
+
+# 오토마톤이 없을 때: 어떤 유형의 키워드도 없으면 유형별 검사 없이 바로 'general'
+_ANY_QUESTION_TYPE_KEYWORD_RE = re.compile("|".join(
+    keyword_re.pattern for _, _, keyword_re, _ in QUESTION_TYPE_RULES
+))
+
+
+@lru_cache(maxsize=512)
+def detect_question_type_from_content(content):
+    """질문 내용에서 실제 질문 유형 감지: code, image, document, creative, general"""
+    
+    content_lower = content.lower()
+    
+    if _QUESTION_TYPE_AUTOMATON is not None:
+        keyword_hits = set()
+        for _, question_types in _QUESTION_TYPE_AUTOMATON.iter(content_lower):
+            keyword_hits.update(question_types)
+        # 키워드가 나온 유형만 우선순위 순으로 질문 패턴 확인
+        for question_type, _, _, pattern_re in QUESTION_TYPE_RULES:
+            if question_type in keyword_hits and pattern_re.search(content_lower):
+                return question_type
+        return 'general'
+    
+    if not _ANY_QUESTION_TYPE_KEYWORD_RE.search(content_lower):
+        return 'general'
+    
+    for question_type, _, keyword_re, pattern_re in QUESTION_TYPE_RULES:
+        if keyword_re.search(content_lower) and pattern_re.search(content_lower):
+            return question_type
     
     # 기본값: 일반 질문
     return 'general'
 
 
+# 명백한 의견/추천 질문 패턴 (LLM 분류 없이 'opinion'으로 처리)
+_OPINION_QUESTION_RE = re.compile(r'추천\s*(?:해|좀|할\s*만한|부탁)|맛집|어떻게\s*생각')
+
+
+def _cheap_classify(question):
+    """키워드/패턴만으로 확실히 분류되는 질문은 로컬에서 분류 (불확실하면 None)
+
+    사실 질문은 검증 키워드 추출이 필요하므로 항상 LLM 분류로 넘긴다
+    """
+    if detect_question_type_from_content(question) == 'code':
+        return {'type': 'code', 'keywords': [], 'confidence': 0.9, 'reason': '코드 키워드/패턴 일치'}
+    if _OPINION_QUESTION_RE.search(question):
+        return {'type': 'opinion', 'keywords': [], 'confidence': 0.8, 'reason': '추천/의견 표현 포함'}
+    return None
+
+
+# 질문 분류 결과 캐시: 프로세스 내 LRU + (워커 간 공유용) Django cache
+QUESTION_TYPE_MEMO_SIZE = 4096
+QUESTION_TYPE_CACHE_TIMEOUT = 86400
+_question_type_memo = OrderedDict()
+_question_type_memo_lock = threading.Lock()
+
+
 def classify_question_type(question):
-    """질문 유형 자동 분류 및 검증 키워드 추출: 사실(Factual) vs 의견(Opinion)"""
-    try:
-        
-        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    """질문 유형 자동 분류 및 검증 키워드 추출: 사실(Factual) vs 의견(Opinion)
+
+    로컬 규칙으로 확실히 분류되거나 공백만 다른 같은 질문이 이미 분류됐으면 gpt-4o-mini 호출을 생략한다
+    """
+    normalized_question = normalize_cache_text(question)
+    cheap_result = _cheap_classify(normalized_question)
+    if cheap_result is not None:
+        return cheap_result
+    
+    digest = hashlib.blake2b(normalized_question.encode('utf-8'), digest_size=16).hexdigest()
+    
+    with _question_type_memo_lock:
+        result = _question_type_memo.get(digest)
+        if result is not None:
+            _question_type_memo.move_to_end(digest)
+    
+    if result is None:
+        cache_key = f"qtype:{digest}"
+        result = cache.get(cache_key)
+        if result is None:
+            try:
+                result = _request_question_classification(normalized_question)
+            except Exception as e:
+                logger.warning("⚠️ 질문 분류 실패: %s, 기본값 'factual' 사용", e)
+                return {
+                    'type': 'factual',
+                    'keywords': [],
+                    'confidence': 0.5,
+                    'reason': '분류 실패로 인한 기본값'
+                }
+            cache.set(cache_key, result, QUESTION_TYPE_CACHE_TIMEOUT)
         
-        classification_prompt = f"""
+        with _question_type_memo_lock:
+            _question_type_memo[digest] = result
+            while len(_question_type_memo) > QUESTION_TYPE_MEMO_SIZE:
+                _question_type_memo.popitem(last=False)
+    
+    # 호출자가 결과를 수정해도 캐시된 값은 그대로 유지
+    return {**result, 'keywords': list(result.get('keywords', []))}
+
+
+def _request_question_classification(question):
+    """gpt-4o-mini로 질문 유형 분류 (실패 시 예외)"""
+    client = _get_openai_client(os.getenv('OPENAI_API_KEY'))
+    
+    classification_prompt = f"""
 다음 질문을 분석하여 질문 유형을 분류하고, 사실적 질문인 경우 검증에 사용할 핵심 키워드를 추출하세요.
 
 질문: "{question}"
@@ -125,42 +264,33 @@ JSON 형식으로만 응답:
   "keywords": ["키워드1", "키워드2"] (사실적 질문인 경우만, 빈 배열 가능)
 }}
 """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 질문 유형 분류 및 키워드 추출 전문가입니다. JSON 형식으로만 응답하세요."},
-                {"role": "user", "content": classification_prompt}
-            ],
-            temperature=0.0,
-            response_format={"type": "json_object"}
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        question_type = result.get('type', 'factual')
-        keywords = result.get('keywords', [])
-        
-        print(f"📝 질문 유형: {question_type} (신뢰도: {result.get('confidence', 0):.2f})")
-        print(f"   이유: {result.get('reason', '')}")
-        if keywords:
-            print(f"   추출된 검증 키워드: {keywords}")
-        
-        # 결과를 딕셔너리로 반환 (하위 호환성을 위해)
-        return {
-            'type': question_type,
-            'keywords': keywords,
-            'confidence': result.get('confidence', 0.9),
-            'reason': result.get('reason', '')
-        }
-        
-    except Exception as e:
-        print(f"⚠️ 질문 분류 실패: {e}, 기본값 'factual' 사용")
-        return {
-            'type': 'factual',
-            'keywords': [],
-            'confidence': 0.5,
-            'reason': '분류 실패로 인한 기본값'
-        }
+    
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "당신은 질문 유형 분류 및 키워드 추출 전문가입니다. JSON 형식으로만 응답하세요."},
+            {"role": "user", "content": classification_prompt}
+        ],
+        temperature=0.0,
+        response_format={"type": "json_object"}
+    )
+    
+    result = _json_loads(response.choices[0].message.content)
+    question_type = result.get('type', 'factual')
+    keywords = result.get('keywords', [])
+    
+    logger.debug("📝 질문 유형: %s (신뢰도: %.2f)", question_type, result.get('confidence', 0))
+    logger.debug("   이유: %s", result.get('reason', ''))
+    if keywords:
+        logger.debug("   추출된 검증 키워드: %s", keywords)
+    
+    # 결과를 딕셔너리로 반환 (하위 호환성을 위해)
+    return {
+        'type': question_type,
+        'keywords': keywords,
+        'confidence': result.get('confidence', 0.9),
+        'reason': result.get('reason', '')
+    }
 
 
 def get_premium_models_to_call(currently_used_models):
@@ -188,12 +318,26 @@ def get_premium_models_to_call(currently_used_models):
         if normalize_model_name(premium) not in used_normalized:
             models_to_call.append(premium)
     
-    print(f"🎯 추가 호출할 프리미엄 모델: {models_to_call}")
+    logger.debug("🎯 추가 호출할 프리미엄 모델: %s", models_to_call)
     return models_to_call
 
 
+# 프리미엄 모델 추가 호출 제한 시간 (초)
+PREMIUM_CALL_TIMEOUT = 60
+
+
+def run_in_background_loop(coro, timeout=None):
+    """코루틴을 공용 이벤트 루프에서 실행하고 결과를 기다림 (timeout 초과 시 취소 후 TimeoutError)"""
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+
 async def call_additional_premium_models(user_message, premium_models, session_id=None):
-    """프리미엄 모델들을 비동기로 호출
+    """프리미엄 모델들을 프로세스 안에서 동시 호출 (localhost ChatView로 HTTP 왕복하지 않음)
     
     Args:
         user_message: 사용자 질문
@@ -203,80 +347,38 @@ async def call_additional_premium_models(user_message, premium_models, session_i
     Returns:
         {모델명: 응답} 딕셔너리
     """
+    from ..utils.chatbot import gather_chat_responses, get_session_chatbot, save_session_chatbot
+    
+    # 모델별 대화 이력은 ChatView와 같은 세션 전용 ChatBot을 사용
+    history_session = session_id or 'system'
+    named_bots = {}
+    for ai_name in premium_models:
+        bot_name = MODEL_DISPLAY_TO_BOT_NAME.get(ai_name)
+        if bot_name is None:
+            continue
+        try:
+            named_bots[ai_name] = get_session_chatbot(history_session, bot_name)
+        except KeyError:
+            logger.warning("⚠️ [추가] %s 모델을 사용할 수 없습니다 (API 키 또는 설정 누락)", ai_name)
     
-    # 엔드포인트 매핑
-    all_llm_endpoints = {
-        'GPT-5': 'http://localhost:8000/chat/gpt-5/',
-        'GPT-5-Mini': 'http://localhost:8000/chat/gpt-5-mini/',
-        'GPT-4.1': 'http://localhost:8000/chat/gpt-4.1/',
-        'GPT-4.1-Mini': 'http://localhost:8000/chat/gpt-4.1-mini/',
-        'GPT-4o': 'http://localhost:8000/chat/gpt-4o/',
-        'GPT-4o-Mini': 'http://localhost:8000/chat/gpt-4o-mini/',
-        'GPT-4-Turbo': 'http://localhost:8000/chat/gpt-4-turbo/',
-        'GPT-3.5-Turbo': 'http://localhost:8000/chat/gpt-3.5-turbo/',
-        'Gemini-2.5-Pro': 'http://localhost:8000/chat/gemini-2.5-pro/',
-        'Gemini-2.5-Flash': 'http://localhost:8000/chat/gemini-2.5-flash/',
-        'Gemini-2.0-Flash-Exp': 'http://localhost:8000/chat/gemini-2.0-flash-exp/',
-        'Gemini-2.0-Flash-Lite': 'http://localhost:8000/chat/gemini-2.0-flash-lite/',
-        'Claude-4-Opus': 'http://localhost:8000/chat/claude-4-opus/',
-        'Claude-3.7-Sonnet': 'http://localhost:8000/chat/claude-3.7-sonnet/',
-        'Claude-3.5-Sonnet': 'http://localhost:8000/chat/claude-3.5-sonnet/',
-        'Claude-3.5-Haiku': 'http://localhost:8000/chat/claude-3.5-haiku/',
-        'Claude-3-Opus': 'http://localhost:8000/chat/claude-3-opus/',
-        'HCX-003': 'http://localhost:8000/chat/clova-hcx-003/',
-        'HCX-DASH-001': 'http://localhost:8000/chat/clova-hcx-dash-001/',
-    }
-    
-    responses = {}
+    if not named_bots:
+        return {}
     
-    async def fetch_response(session, ai_name, endpoint):
-        try:
-            payload = {'message': user_message, 'user_id': session_id or 'system'}
-            async with session.post(endpoint, json=payload, timeout=60) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    response_content = result.get('response', '응답 없음')
-                    print(f"✅ [추가] {ai_name} 응답 수신: {len(str(response_content))}자")
-                    return ai_name, response_content
-                else:
-                    error_text = await response.text()
-                    friendly_msg = get_user_friendly_error_message(Exception(f"HTTP {response.status}"))
-                    return ai_name, friendly_msg
-        except Exception as e:
-            friendly_msg = get_user_friendly_error_message(e)
-            return ai_name, friendly_msg
-    
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for model in premium_models:
-            if model in all_llm_endpoints:
-                endpoint = all_llm_endpoints[model]
-                tasks.append(fetch_response(session, model, endpoint))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, tuple):
-                ai_name, response = result
-                responses[ai_name] = response
+    results = await gather_chat_responses(named_bots, user_message)
     
     # 에러 메시지 필터링
-    error_patterns = [
-        "네트워크 연결에 문제가", "요청 시간이 초과", "서버에 일시적인 문제",
-        "API 인증에 실패", "사용량 한도를 초과", "연결할 수 없습니다"
-    ]
-    
     valid_responses = {}
-    for ai_name, response in responses.items():
-        response_str = str(response)
-        is_error = any(pattern in response_str for pattern in error_patterns)
-        if len(response_str) < 50 and any(kw in response_str.lower() for kw in ["timeout", "error", "오류"]):
-            is_error = True
-        
-        if not is_error:
-            valid_responses[ai_name] = response
+    for ai_name, result in results.items():
+        if isinstance(result, Exception):
+            logger.warning("⚠️ [추가] %s 호출 실패: %s", ai_name, result)
+            continue
+        if is_error_response(result):
+            continue
+        save_session_chatbot(history_session, MODEL_DISPLAY_TO_BOT_NAME[ai_name], named_bots[ai_name])
+        logger.debug("✅ [추가] %s 응답 수신: %s자", ai_name, len(str(result)))
+        valid_responses[ai_name] = result
     
-    print(f"📊 [추가] 유효한 프리미엄 모델 응답: {len(valid_responses)}개")
+    logger.debug("📊 [추가] 유효한 프리미엄 모델 응답: %s개", len(valid_responses))
     return valid_responses
 
 
@@ -290,8 +392,8 @@ def apply_voting_system(all_responses, user_question):
     Returns:
         최적 답변 결과
     """
-    print(f"\n🗳️ 보팅 시스템 적용 시작")
-    print(f"   참여 모델: {list(all_responses.keys())}")
+    logger.debug("🗳️ 보팅 시스템 적용 시작")
+    logger.debug("   참여 모델: %s", list(all_responses.keys()))
     
     # 1. 각 응답의 핵심 내용 추출
     response_summaries = {}
@@ -302,7 +404,6 @@ def apply_voting_system(all_responses, user_question):
         response_summaries[model] = normalize_text(summary)
     
     # 2. 응답 간 유사도 계산 및 그룹화
-    from collections import defaultdict
     similarity_groups = defaultdict(list)
     processed = set()
     
@@ -333,12 +434,12 @@ def apply_voting_system(all_responses, user_question):
     largest_group = max(similarity_groups.values(), key=len)
     representative_model = largest_group[0]
     
-    print(f"\n📊 보팅 결과:")
+    logger.debug("📊 보팅 결과:")
     for leader, members in similarity_groups.items():
         if len(members) > 1:
-            print(f"   그룹 ({len(members)}개 모델): {members}")
+            logger.debug("   그룹 (%s개 모델): %s", len(members), members)
     
-    print(f"\n🏆 최다 득표 그룹: {largest_group} ({len(largest_group)}표)")
+    logger.debug("🏆 최다 득표 그룹: %s (%s표)", largest_group, len(largest_group))
     
     # 4. 결과 생성
     optimal_answer = all_responses[representative_model]
@@ -374,7 +475,100 @@ def apply_voting_system(all_responses, user_question):
     return result
 
 
-def collect_multi_llm_responses(user_message, judge_model="GPT-4o", selected_models=None, question_type=None, session_id=None, clear_history=False):
+# 최적 답변 모드에서 선택 가능한 모델 (표시명 -> chatbots 모델명)
+MODEL_DISPLAY_TO_BOT_NAME = {
+    'GPT-5': 'gpt-5', 'GPT-5-Mini': 'gpt-5-mini',
+    'GPT-4.1': 'gpt-4.1', 'GPT-4.1-Mini': 'gpt-4.1-mini',
+    'GPT-4o': 'gpt-4o', 'GPT-4o-Mini': 'gpt-4o-mini',
+    'GPT-4-Turbo': 'gpt-4-turbo', 'GPT-3.5-Turbo': 'gpt-3.5-turbo',
+    'Gemini-2.5-Pro': 'gemini-2.5-pro', 'Gemini-2.5-Flash': 'gemini-2.5-flash',
+    'Gemini-2.0-Flash-Exp': 'gemini-2.0-flash-exp', 'Gemini-2.0-Flash-Lite': 'gemini-2.0-flash-lite',
+    'Claude-4-Opus': 'claude-4-opus', 'Claude-3.7-Sonnet': 'claude-3.7-sonnet',
+    'Claude-3.5-Sonnet': 'claude-3.5-sonnet', 'Claude-3.5-Haiku': 'claude-3.5-haiku',
+    'Claude-3-Opus': 'claude-3-opus',
+    'HCX-003': 'clova-hcx-003', 'HCX-DASH-001': 'clova-hcx-dash-001',
+}
+# 프론트엔드가 보내는 모델 ID(소문자 ChatBot 이름) -> 표시 이름
+DISPLAY_NAME_BY_BOT_NAME = {bot_name: display_name for display_name, bot_name in MODEL_DISPLAY_TO_BOT_NAME.items()}
+
+# selected_models가 없을 때 사용할 기본 모델
+DEFAULT_LLM_MODELS = ('GPT-4o-Mini', 'Gemini-2.0-Flash-Lite', 'Claude-3.5-Haiku')
+
+
+# LLM 호출 실패 시 ChatBot이 돌려주는 사용자 친화적 오류 메시지 패턴
+ERROR_RESPONSE_PATTERNS = (
+    "네트워크 연결에 문제가", "요청 시간이 초과", "서버에 일시적인 문제",
+    "API 인증에 실패", "사용량 한도를 초과", "연결할 수 없습니다"
+)
+
+# 조기 채택용 경량 채점 모델
+EARLY_EXIT_SCORER_MODEL = 'gpt-4o-mini'
+_SCORE_RE = re.compile(r'\d+')
+
+
+def is_error_response(response):
+    """ChatBot 응답이 실제 답변이 아니라 오류 메시지인지 판단"""
+    response_str = str(response)
+    if any(pattern in response_str for pattern in ERROR_RESPONSE_PATTERNS):
+        return True
+    return len(response_str) < 50 and any(kw in response_str.lower() for kw in ["timeout", "error", "오류"])
+
+
+def score_response_quickly(user_question, response):
+    """경량 모델로 응답 품질을 0~10점으로 채점 (채점할 수 없으면 None)"""
+    openai_api_key = os.getenv('OPENAI_API_KEY')
+    if not openai_api_key:
+        return None
+    try:
+        client = _get_openai_client(openai_api_key)
+        completion = client.chat.completions.create(
+            model=EARLY_EXIT_SCORER_MODEL,
+            messages=[
+                {"role": "system", "content": "질문에 대한 답변의 정확성과 완성도를 0~10 정수 하나로만 평가하세요. 숫자 외에는 출력하지 마세요."},
+                {"role": "user", "content": f"질문: {user_question}\n\n답변: {response}"}
+            ],
+            temperature=0.0,
+            max_tokens=3
+        )
+        match = _SCORE_RE.search(completion.choices[0].message.content or '')
+        return min(int(match.group()), 10) if match else None
+    except Exception as e:
+        logger.warning("⚠️ 조기 채택 채점 실패: %s", e)
+        return None
+
+
+def create_early_exit_result(ai_name, response, score, llm_responses):
+    """조기 채택된 단일 응답을 심판 결과와 같은 형식으로 변환"""
+    confidence = str(score * 10)
+    return {
+        "최적의_답변": response,
+        "llm_검증_결과": {
+            ai_name: {
+                "정확성": "✅",
+                "오류": "없음",
+                "신뢰도": confidence,
+                "채택된_정보": extract_sentences_from_response(response)[:3],
+                "제외된_정보": []
+            }
+        },
+        "심판모델": EARLY_EXIT_SCORER_MODEL,
+        "상태": "조기 채택",
+        "신뢰도": confidence,
+        "상호모순": [],
+        "사실검증": {},
+        "분석_근거": f"{ai_name} 응답이 채점 {score}/10으로 기준을 넘어 나머지 모델을 기다리지 않고 채택했습니다.",
+        "검증_소스": {
+            "사용됨": False,
+            "소스": None,
+            "제목": None,
+            "내용": None,
+            "신뢰도": 0
+        },
+        "원본_응답": llm_responses
+    }
+
+
+def collect_multi_llm_responses(user_message, judge_model="GPT-4o", selected_models=None, question_type=None, session_id=None, clear_history=False, use_batch_api=False, early_exit_threshold=None):
     """1단계: 선택된 LLM들에게 병렬 질의 후 심판 모델로 검증
     
     Args:
@@ -384,150 +578,119 @@ def collect_multi_llm_responses(user_message, judge_model="GPT-4o", selected_mod
         question_type: 질문 유형
         session_id: 세션 ID (히스토리 관리용)
         clear_history: 히스토리 초기화 여부
+        use_batch_api: True면 OpenAI/Anthropic 모델은 배치 API로 호출 (비용 약 50% 절감, 응답이 수 분 이상 지연될 수 있어 HTTP 요청이 아닌 백그라운드 작업에서만 사용)
+        early_exit_threshold: 0~10 점수. 지정하면 먼저 도착한 응답부터 경량 모델로 채점해
+            이 점수 이상인 응답이 나오면 나머지 모델을 기다리지 않고 심판 없이 바로 반환
     """
-    import time
+    from ..utils.chatbot import (
+        chatbots,
+        batch_chat_responses,
+        chat_concurrently,
+        chat_until_accepted,
+        STRAGGLER_TIMEOUT,
+        clear_session_histories,
+        get_session_chatbot,
+        save_session_chatbot,
+    )
     
     responses = {}
     
     # 히스토리 초기화가 필요한 경우 각 모델의 히스토리 초기화
     if clear_history and selected_models:
-        from ..utils.chatbot import chatbots
-        model_name_mapping = {
-            'GPT-5': 'gpt-5', 'GPT-5-Mini': 'gpt-5-mini',
-            'GPT-4.1': 'gpt-4.1', 'GPT-4.1-Mini': 'gpt-4.1-mini',
-            'GPT-4o': 'gpt-4o', 'GPT-4o-Mini': 'gpt-4o-mini',
-            'GPT-4-Turbo': 'gpt-4-turbo', 'GPT-3.5-Turbo': 'gpt-3.5-turbo',
-            'Gemini-2.5-Pro': 'gemini-2.5-pro', 'Gemini-2.5-Flash': 'gemini-2.5-flash',
-            'Gemini-2.0-Flash-Exp': 'gemini-2.0-flash-exp', 'Gemini-2.0-Flash-Lite': 'gemini-2.0-flash-lite',
-            'Claude-4-Opus': 'claude-4-opus', 'Claude-3.7-Sonnet': 'claude-3.7-sonnet',
-            'Claude-3.5-Sonnet': 'claude-3.5-sonnet', 'Claude-3.5-Haiku': 'claude-3.5-haiku',
-            'Claude-3-Opus': 'claude-3-opus',
-            'HCX-003': 'clova-hcx-003', 'HCX-DASH-001': 'clova-hcx-dash-001',
-        }
+        cleared_bot_names = []
         for model_display_name in selected_models:
-            bot_name = model_name_mapping.get(model_display_name)
+            bot_name = MODEL_DISPLAY_TO_BOT_NAME.get(model_display_name)
             if bot_name and bot_name in chatbots:
                 chatbots[bot_name].conversation_history = []
-                print(f"   🔄 {model_display_name} ({bot_name}) 히스토리 초기화 (collect_multi_llm_responses)")
-    
-    # 사용 가능한 LLM 엔드포인트들
-    all_llm_endpoints = {
-        'GPT-5': 'http://localhost:8000/chat/gpt-5/',
-        'GPT-5-Mini': 'http://localhost:8000/chat/gpt-5-mini/',
-        'GPT-4.1': 'http://localhost:8000/chat/gpt-4.1/',
-        'GPT-4.1-Mini': 'http://localhost:8000/chat/gpt-4.1-mini/',
-        'GPT-4o': 'http://localhost:8000/chat/gpt-4o/',
-        'GPT-4o-Mini': 'http://localhost:8000/chat/gpt-4o-mini/',
-        'GPT-4-Turbo': 'http://localhost:8000/chat/gpt-4-turbo/',
-        'GPT-3.5-Turbo': 'http://localhost:8000/chat/gpt-3.5-turbo/',
-        'Gemini-2.5-Pro': 'http://localhost:8000/chat/gemini-2.5-pro/',
-        'Gemini-2.5-Flash': 'http://localhost:8000/chat/gemini-2.5-flash/',
-        'Gemini-2.0-Flash-Exp': 'http://localhost:8000/chat/gemini-2.0-flash-exp/',
-        'Gemini-2.0-Flash-Lite': 'http://localhost:8000/chat/gemini-2.0-flash-lite/',
-        'Claude-4-Opus': 'http://localhost:8000/chat/claude-4-opus/',
-        'Claude-3.7-Sonnet': 'http://localhost:8000/chat/claude-3.7-sonnet/',
-        'Claude-3.5-Sonnet': 'http://localhost:8000/chat/claude-3.5-sonnet/',
-        'Claude-3.5-Haiku': 'http://localhost:8000/chat/claude-3.5-haiku/',
-        'Claude-3-Opus': 'http://localhost:8000/chat/claude-3-opus/',
-        'HCX-003': 'http://localhost:8000/chat/clova-hcx-003/',
-        'HCX-DASH-001': 'http://localhost:8000/chat/clova-hcx-dash-001/',
-    }
+                cleared_bot_names.append(bot_name)
+                logger.debug("   🔄 %s (%s) 히스토리 초기화 (collect_multi_llm_responses)", model_display_name, bot_name)
+        # 모델별 호출은 세션 전용 ChatBot의 대화 이력을 쓰므로 함께 초기화
+        clear_session_histories(session_id or 'system', cleared_bot_names)
     
     # 모델 선택 로직
     if selected_models:
-        print(f"📋 selected_models 입력: {selected_models}")
-        model_mapping = {
-            'gpt-5': 'GPT-5', 'gpt-5-mini': 'GPT-5-Mini',
-            'gpt-4.1': 'GPT-4.1', 'gpt-4.1-mini': 'GPT-4.1-Mini',
-            'gpt-4o': 'GPT-4o', 'gpt-4o-mini': 'GPT-4o-Mini',
-            'gpt-4-turbo': 'GPT-4-Turbo', 'gpt-3.5-turbo': 'GPT-3.5-Turbo',
-            'gemini-2.5-pro': 'Gemini-2.5-Pro', 'gemini-2.5-flash': 'Gemini-2.5-Flash',
-            'gemini-2.0-flash-exp': 'Gemini-2.0-Flash-Exp', 'gemini-2.0-flash-lite': 'Gemini-2.0-Flash-Lite',
-            'claude-4-opus': 'Claude-4-Opus', 'claude-3.7-sonnet': 'Claude-3.7-Sonnet',
-            'claude-3.5-sonnet': 'Claude-3.5-Sonnet', 'claude-3.5-haiku': 'Claude-3.5-Haiku',
-            'claude-3-opus': 'Claude-3-Opus',
-            'clova-hcx-003': 'HCX-003', 'clova-hcx-dash-001': 'HCX-DASH-001',
+        logger.debug("📋 selected_models 입력: %s", selected_models)
+        selected_standard_models = {
+            DISPLAY_NAME_BY_BOT_NAME.get(str(model).lower()) for model in selected_models
         }
-        
-        selected_standard_models = []
-        for model in selected_models:
-            model_lower = model.lower() if isinstance(model, str) else str(model).lower()
-            if model_lower in model_mapping:
-                selected_standard_models.append(model_mapping[model_lower])
-        
-        llm_endpoints = {k: v for k, v in all_llm_endpoints.items() if k in selected_standard_models}
+        llm_models = [name for name in MODEL_DISPLAY_TO_BOT_NAME if name in selected_standard_models]
     else:
-        print(f"⚠️ selected_models가 없습니다. 기본 모델 3개 사용")
-        default_models = ['GPT-4o-Mini', 'Gemini-2.0-Flash-Lite', 'Claude-3.5-Haiku']
-        llm_endpoints = {k: v for k, v in all_llm_endpoints.items() if k in default_models}
+        logger.warning("⚠️ selected_models가 없습니다. 기본 모델 3개 사용")
+        llm_models = [name for name in MODEL_DISPLAY_TO_BOT_NAME if name in DEFAULT_LLM_MODELS]
     
-    if not llm_endpoints:
+    if not llm_models:
         raise ValueError("사용 가능한 LLM 모델이 없습니다.")
     
-    print(f"🎯 선택된 LLM 모델들: {list(llm_endpoints.keys())}")
+    logger.debug("🎯 선택된 LLM 모델들: %s", llm_models)
     
-    async def fetch_response(session, ai_name, endpoint):
+    # 선택된 모델을 프로세스 안에서 직접 동시 호출 (localhost ChatView로 HTTP 왕복하지 않음)
+    # 모델별 대화 이력은 ChatView와 같은 세션 전용 ChatBot을 사용
+    history_session = session_id or 'system'
+    named_bots = {}
+    for ai_name in llm_models:
         try:
-            payload = {'message': user_message, 'user_id': session_id or 'system'}
-            async with session.post(endpoint, json=payload, timeout=60) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    response_content = result.get('response', '응답 없음')
-                    print(f"✅ {ai_name} 응답 수신: {len(str(response_content))}자")
-                    return ai_name, response_content
-                else:
-                    error_text = await response.text()
-                    friendly_msg = get_user_friendly_error_message(Exception(f"HTTP {response.status}"))
-                    return ai_name, friendly_msg
-        except Exception as e:
-            friendly_msg = get_user_friendly_error_message(e)
-            return ai_name, friendly_msg
-    
-    async def collect_all_responses():
-        async with aiohttp.ClientSession() as session:
-            tasks = [fetch_response(session, ai_name, endpoint) for ai_name, endpoint in llm_endpoints.items()]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for result in results:
-                if isinstance(result, tuple):
-                    ai_name, response = result
-                    responses[ai_name] = response
+            named_bots[ai_name] = get_session_chatbot(history_session, MODEL_DISPLAY_TO_BOT_NAME[ai_name])
+        except KeyError:
+            logger.warning("⚠️ %s 모델을 사용할 수 없습니다 (API 키 또는 설정 누락)", ai_name)
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(collect_all_responses())
-        loop.close()
+        accepted = None
+        early_scores = {}
+        if use_batch_api:
+            results = batch_chat_responses(named_bots, user_message)
+        elif early_exit_threshold is not None and len(named_bots) > 1:
+            def accept(ai_name, response):
+                if is_error_response(response):
+                    return False
+                score = score_response_quickly(user_message, response)
+                logger.debug("⚡ %s 조기 채택 채점: %s", ai_name, score)
+                early_scores[ai_name] = score
+                return score is not None and score >= early_exit_threshold
+            
+            results, accepted = chat_until_accepted(named_bots, user_message, accept)
+        else:
+            results = chat_concurrently(named_bots, user_message, straggler_timeout=STRAGGLER_TIMEOUT)
+        for ai_name, result in results.items():
+            if isinstance(result, Exception):
+                responses[ai_name] = get_user_friendly_error_message(result)
+                continue
+            responses[ai_name] = result
+            save_session_chatbot(history_session, MODEL_DISPLAY_TO_BOT_NAME[ai_name], named_bots[ai_name])
+            logger.debug("✅ %s 응답 수신: %s자", ai_name, len(str(result)))
         
-        print(f"✅ {len(responses)}개 LLM 응답 수집 완료")
+        logger.debug("✅ %s개 LLM 응답 수집 완료", len(responses))
         
-        # 에러 메시지 필터링
-        error_patterns = [
-            "네트워크 연결에 문제가", "요청 시간이 초과", "서버에 일시적인 문제",
-            "API 인증에 실패", "사용량 한도를 초과", "연결할 수 없습니다"
-        ]
+        if accepted:
+            logger.debug("⚡ %s 응답 조기 채택 (나머지 %s개 모델 대기 생략)", accepted, len(named_bots) - len(responses))
+            return create_early_exit_result(accepted, responses[accepted], early_scores[accepted], responses)
         
-        valid_responses = {}
-        for ai_name, response in responses.items():
-            response_str = str(response)
-            is_error = any(pattern in response_str for pattern in error_patterns)
-            if len(response_str) < 50 and any(kw in response_str.lower() for kw in ["timeout", "error", "오류"]):
-                is_error = True
-            
-            if not is_error:
-                valid_responses[ai_name] = response
+        # 에러 메시지 필터링
+        valid_responses = {
+            ai_name: response for ai_name, response in responses.items()
+            if not is_error_response(response)
+        }
         
         if not valid_responses:
             raise ValueError("모든 LLM 요청이 실패했습니다.")
         
-        print(f"📊 유효한 응답: {len(valid_responses)}개")
+        logger.debug("📊 유효한 응답: %s개", len(valid_responses))
         final_result = judge_and_generate_optimal_response(valid_responses, user_message, judge_model, question_type, session_id)
         return final_result
         
     except Exception as e:
-        print(f"❌ LLM 응답 수집 실패: {e}")
+        logger.error("❌ LLM 응답 수집 실패: %s", e)
         raise
 
 
+# 상호모순 감지용 패턴
+_CONTEXT_TOKEN_RE = re.compile(r'[A-Za-z가-힣]{2,}')
+_NUMERIC_TOKEN_RE = re.compile(r'\d+(?:\.\d+)?')
+# 1000~2100년만 매치 (앞뒤가 숫자인 더 긴 수는 제외)
+_CONFLICT_YEAR_RE = re.compile(r'(?<!\d)(1\d{3}|20\d{2}|2100)(?!\d)(?:년)?')
+_CONFLICT_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?(?:명|개|월|일|억|만|천|대|년|세|%|cm|mm|kg|g)?')
+_CONFLICT_NAME_RE = re.compile(r'[가-힣]{2,4}(?:\([^)]+\))?')
+
+
 def detect_conflicts_in_responses(llm_responses):
     """LLM 응답에서 상호모순 감지 (정확도 향상 버전)"""
     
@@ -541,7 +704,7 @@ def detect_conflicts_in_responses(llm_responses):
     
     def extract_context_tokens(text, start, end):
         window = text[max(0, start - 25):min(len(text), end + 25)]
-        tokens = re.findall(r'[A-Za-z가-힣]{2,}', window)
+        tokens = _CONTEXT_TOKEN_RE.findall(window)
         keywords = set()
         for token in tokens:
             token_norm = token.lower()
@@ -551,7 +714,7 @@ def detect_conflicts_in_responses(llm_responses):
         return keywords
     
     def normalize_numeric_tokens(value):
-        numbers = re.findall(r'\d+(?:\.\d+)?', value)
+        numbers = _NUMERIC_TOKEN_RE.findall(value)
         normalized = []
         for num in numbers:
             if '.' in num:
@@ -595,24 +758,18 @@ def detect_conflicts_in_responses(llm_responses):
     }
     
     for model_name, response in llm_responses.items():
-        for match in re.finditer(r'(\d{4})(?:년)?', response):
-            year_str = match.group(1)
-            try:
-                year = int(year_str)
-                if 1000 <= year <= 2100:
-                    entry = conflicts["dates"][year_str]
-                    entry["models"].add(model_name)
-                    entry["keywords"].update(extract_context_tokens(response, match.start(), match.end()))
-            except ValueError:
-                continue
+        for match in _CONFLICT_YEAR_RE.finditer(response):
+            entry = conflicts["dates"][match.group(1)]
+            entry["models"].add(model_name)
+            entry["keywords"].update(extract_context_tokens(response, match.start(), match.end()))
         
-        for match in re.finditer(r'\d+(?:\.\d+)?(?:명|개|월|일|억|만|천|대|년|세|%|cm|mm|kg|g)?', response):
+        for match in _CONFLICT_NUMBER_RE.finditer(response):
             value = match.group(0)
             entry = conflicts["numbers"][value]
             entry["models"].add(model_name)
             entry["keywords"].update(extract_context_tokens(response, match.start(), match.end()))
         
-        for match in re.finditer(r'[가-힣]{2,4}(?:\([^)]+\))?', response):
+        for match in _CONFLICT_NAME_RE.finditer(response):
             name = match.group(0)
             name_clean = name.split('(')[0].strip()
             if len(name_clean) < 2:
@@ -654,19 +811,59 @@ def detect_conflicts_in_responses(llm_responses):
     return detected_conflicts
 
 
+# 응답 후처리용 패턴
+_CODE_BLOCK_RE = re.compile(r'(```[\s\S]*?```)')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_VERIFICATION_META_RE = re.compile(r'\s*\([^)]*(?:Wikipedia|불일치)[^)]*\)')
+_JSON_STRUCTURE_RE = re.compile(r'[{}"\\]')
+
+
+def _extract_json_object(text):
+    """첫 '{'부터 괄호 짝이 맞는 JSON 객체 문자열 추출 (문자열 안의 괄호/이스케이프는 무시, 없으면 None)
+
+    구조 문자({ } " \\)만 정규식으로 건너뛰며 보므로 역추적 없이 한 번만 스캔한다
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped_pos = -1  # 직전 백슬래시가 이스케이프하는 문자 위치
+    for match in _JSON_STRUCTURE_RE.finditer(text, start):
+        char, pos = match.group(), match.start()
+        if in_string:
+            if pos == escaped_pos:
+                escaped_pos = -1
+            elif char == '\\':
+                escaped_pos = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    return None
+
+
 def extract_sentences_from_response(response_text):
     """응답 텍스트에서 문장 단위로 추출"""
     
     sentences = []
     
-    # 1. 코드 블록 추출
-    code_blocks = re.findall(r'```[\s\S]*?```', response_text)
-    for code_block in code_blocks:
+    # 1. 코드 블록 추출 (split 한 번으로 코드 블록(홀수 위치)과 나머지 텍스트를 분리)
+    parts = _CODE_BLOCK_RE.split(response_text)
+    for code_block in parts[1::2]:
         sentences.append(code_block.strip())
     
     # 2. 코드 제외 후 문장 분리
-    text_without_code = re.sub(r'```[\s\S]*?```', '', response_text)
-    text_sentences = re.split(r'[.!?]\s+', text_without_code)
+    text_without_code = ''.join(parts[0::2])
+    text_sentences = _SENTENCE_SPLIT_RE.split(text_without_code)
     
     for sentence in text_sentences:
         sentence = sentence.strip()
@@ -681,12 +878,11 @@ def normalize_text(text):
     if not text:
         return ""
     # 공백 통일
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     # 따옴표 통일
     text = text.replace('"', '"').replace('"', '"').replace("'", "'").replace("'", "'")
-    # Wikipedia 메타 정보 제거
-    text = re.sub(r'\s*\([^)]*Wikipedia[^)]*\)', '', text)
-    text = re.sub(r'\s*\([^)]*불일치[^)]*\)', '', text)
+    # Wikipedia/불일치 메타 정보 제거 (한 번의 스캔)
+    text = _VERIFICATION_META_RE.sub('', text)
     return text.strip().lower()
 
 
@@ -695,6 +891,13 @@ def similarity_ratio(a, b):
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
+# 문장-원본 키워드 매칭에서 제외할 조사/어미
+_SENTENCE_MATCH_STOPWORDS = frozenset({
+    '은', '는', '이', '가', '을', '를', '의', '에', '와', '과', '도', '로', '으로',
+    '입니다', '습니다', '있습니다', '됩니다', '합니다'
+})
+
+
 def is_sentence_in_response(sentence, original_response, threshold=0.85):
     """문장이 원본 응답에 실제로 포함되어 있는지 엄격하게 검증"""
     if not sentence or not original_response:
@@ -732,9 +935,7 @@ def is_sentence_in_response(sentence, original_response, threshold=0.85):
         return True
     
     # 3차: 핵심 키워드 매칭
-    stopwords = {'은', '는', '이', '가', '을', '를', '의', '에', '와', '과', '도', '로', '으로',
-                 '입니다', '습니다', '있습니다', '됩니다', '합니다'}
-    key_words = [w for w in sentence_words if len(w) > 1 and w not in stopwords]
+    key_words = [w for w in sentence_words if len(w) > 1 and w not in _SENTENCE_MATCH_STOPWORDS]
     
     if not key_words:
         return False
@@ -745,21 +946,12 @@ def is_sentence_in_response(sentence, original_response, threshold=0.85):
     return match_ratio >= 0.8
 
 
-def _build_judge_prompt(user_question, llm_responses, llm_sentences, wikipedia_info):
-    """Judge 모델용 프롬프트 생성"""
-    model_sections = [f"[{name} 원본]\n{(r[:800] + '...' if len(r) > 800 else r)}" 
-                     for name, r in llm_responses.items()]
-    sentences_sections = [f"[{name} 문장 목록 - 이 문장만 사용 가능]\n" + 
-                         "\n".join([f"  {i+1}. {s}" for i, s in enumerate(sentences)])
-                         for name, sentences in llm_sentences.items()]
-    wikipedia_section = ""
-    if wikipedia_info:
-        source_name = wikipedia_info.get('source', '검증 소스')
-        wikipedia_section = f"""
+# Judge 프롬프트 템플릿 (정적 텍스트는 모듈 로드 시 한 번만 만들고 요청마다 변수 자리만 채움)
+_JUDGE_WIKIPEDIA_SECTION_TEMPLATE = """
 
 **🌐 {source_name} 검증 결과 (공식 정보):**
-제목: {wikipedia_info['title']}
-내용: {wikipedia_info['extract'][:500]}
+제목: {title}
+내용: {extract}
 
 **🚨 {source_name} 검증 기준:**
 - {source_name} 정보와 **일치하는 AI 답변만 채택**
@@ -768,11 +960,8 @@ def _build_judge_prompt(user_question, llm_responses, llm_sentences, wikipedia_i
 
 
 """
-    sentences_text = "\n\n".join(sentences_sections)
-    model_responses_text = "\n\n".join(model_sections)
-    wiki_used = True if wikipedia_info else False
-    
-    return f"""질문: {user_question}
+
+_JUDGE_PROMPT_TEMPLATE = """질문: {user_question}
 
 **🚨 핵심 규칙 (반드시 준수):**
 1. **아래 "문장 목록"에 있는 문장만 사용** - 새로운 문장 생성 절대 금지
@@ -824,6 +1013,90 @@ JSON 형식으로만 응답:
 }}"""
 
 
+# Judge 프롬프트의 문장 목록 토큰 예산 (넘으면 모델별 예산 안의 앞쪽 문장만 넣음)
+JUDGE_SENTENCES_MAX_TOKENS = 40000
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding():
+    """tiktoken 인코딩 (없거나 BPE 파일을 받을 수 없으면 None)"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("⚠️ tiktoken 인코딩 로드 실패, 글자 수로 토큰 추정: %s", e)
+        return None
+
+
+def _estimate_tokens(text):
+    """토큰 수 (tiktoken이 없으면 글자 수 / 4로 추정)"""
+    encoding = _get_token_encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+def _cap_judge_sentences(llm_sentences):
+    """문장 목록 전체가 토큰 예산을 넘으면 모델별로 예산을 나눠 앞쪽 문장부터 자름 (문장은 자르지 않음)"""
+    token_counts = {
+        name: [_estimate_tokens(sentence) for sentence in sentences]
+        for name, sentences in llm_sentences.items()
+    }
+    if sum(map(sum, token_counts.values())) <= JUDGE_SENTENCES_MAX_TOKENS:
+        return llm_sentences
+    
+    per_model_budget = JUDGE_SENTENCES_MAX_TOKENS // len(token_counts)
+    capped = {}
+    for name, sentences in llm_sentences.items():
+        used = 0
+        kept = len(sentences)
+        for i, count in enumerate(token_counts[name]):
+            used += count
+            if used > per_model_budget:
+                kept = i
+                break
+        capped[name] = sentences[:kept]
+    logger.warning("⚠️ Judge 문장 목록이 %s토큰을 넘어 모델별 %s토큰으로 제한", JUDGE_SENTENCES_MAX_TOKENS, per_model_budget)
+    return capped
+
+
+def _build_judge_prompt(user_question, llm_responses, llm_sentences, wikipedia_info):
+    """Judge 모델용 프롬프트 생성"""
+    llm_sentences = _cap_judge_sentences(llm_sentences)
+    # AI별 블록을 조각 리스트에 한 번씩만 넣고 마지막에 join (블록별 중간 문자열 생성/재복사 없음)
+    model_parts = []
+    for name, r in llm_responses.items():
+        if model_parts:
+            model_parts.append("\n\n")
+        model_parts += (f"[{name} 원본]\n", r[:800], "..." if len(r) > 800 else "")
+    sentence_parts = []
+    for name, sentences in llm_sentences.items():
+        if sentence_parts:
+            sentence_parts.append("\n\n")
+        sentence_parts.append(f"[{name} 문장 목록 - 이 문장만 사용 가능]\n")
+        sentence_parts.append("\n".join(f"  {i}. {s}" for i, s in enumerate(sentences, 1)))
+    wikipedia_section = ""
+    if wikipedia_info:
+        source_name = wikipedia_info.get('source', '검증 소스')
+        wikipedia_section = _JUDGE_WIKIPEDIA_SECTION_TEMPLATE.format_map({
+            'source_name': source_name,
+            'title': wikipedia_info['title'],
+            'extract': wikipedia_info['extract'][:500],
+        })
+    sentences_text = "".join(sentence_parts)
+    model_responses_text = "".join(model_parts)
+    wiki_used = True if wikipedia_info else False
+    
+    return _JUDGE_PROMPT_TEMPLATE.format_map({
+        'user_question': user_question,
+        'sentences_text': sentences_text,
+        'wikipedia_section': wikipedia_section,
+        'model_responses_text': model_responses_text,
+        'wiki_used': wiki_used,
+    })
+
+
 def extract_valid_sentences(sentence_list, original_response, ai_name):
     """문장 리스트에서 실제로 원본에 포함된 것만 추출"""
     if not sentence_list or not original_response:
@@ -844,122 +1117,132 @@ def extract_valid_sentences(sentence_list, original_response, ai_name):
             valid_sentences.append(item.strip())
         else:
             invalid_count += 1
-            print(f"❌ {ai_name} 환각 감지 및 제거: '{item[:60]}...'")
+            logger.warning("❌ %s 환각 감지 및 제거: '%s...'", ai_name, item[:60])
     
     if invalid_count > 0:
-        print(f"⚠️ {ai_name}: {invalid_count}개 환각 문장 제거됨")
+        logger.warning("⚠️ %s: %s개 환각 문장 제거됨", ai_name, invalid_count)
     
     return valid_sentences
 
 
+async def _classify_and_detect_conflicts(user_question, llm_responses):
+    """질문 분류와 상호모순 감지를 스레드에서 동시에 실행 (분류 RTT 동안 모순 감지를 끝냄)"""
+    conflicts, classification_result = await asyncio.gather(
+        asyncio.to_thread(detect_conflicts_in_responses, llm_responses),
+        asyncio.to_thread(classify_question_type, user_question)
+    )
+    return conflicts, classification_result
+
+
 def judge_and_generate_optimal_response(llm_responses, user_question, judge_model="GPT-5", question_type=None, session_id=None):
     """하이브리드 검증 시스템 (Wikipedia 검증 + 프리미엄 모델 보팅)"""
+    wikipedia_info = None
     try:
-        print(f"\n🔍 하이브리드 검증 시작: {user_question}")
+        logger.debug("🔍 하이브리드 검증 시작: %s", user_question)
+        
+        # 질문 유형 분류(OpenAI 호출)가 필요하면 상호모순 감지(CPU)와 동시에 실행
+        needs_type = question_type in [None, "general"]
+        needs_keywords = needs_type or (
+            isinstance(question_type, str) and question_type not in ['image', 'document', 'code', 'creative']
+        )
+        if question_type is not None:
+            logger.debug("📝 전달받은 질문 유형: %s", question_type)
         
-        # 질문 유형 분류 및 검증 키워드 추출
         verification_keywords = []
-        if question_type is None:
-            classification_result = classify_question_type(user_question)
+        if needs_keywords:
+            try:
+                conflicts, classification_result = run_in_background_loop(
+                    _classify_and_detect_conflicts(user_question, llm_responses),
+                    timeout=PREMIUM_CALL_TIMEOUT
+                )
+            except FutureTimeoutError:
+                logger.warning("⚠️ 질문 분류 시간 초과 - 기본 유형으로 진행")
+                classification_result = {'type': 'factual', 'keywords': []}
+                conflicts = detect_conflicts_in_responses(llm_responses)
             if isinstance(classification_result, dict):
-                question_type = classification_result.get('type', 'factual')
                 verification_keywords = classification_result.get('keywords', [])
-            else:
+                if needs_type:
+                    question_type = classification_result.get('type', 'factual')
+            elif needs_type:
                 # 하위 호환성: 문자열로 반환된 경우
                 question_type = classification_result
-                verification_keywords = []
+            if needs_type:
+                logger.debug("📝 분류 결과: %s", question_type)
         else:
-            print(f"📝 전달받은 질문 유형: {question_type}")
-            # 전달받은 question_type이 문자열인 경우, 키워드 추출을 위해 재분류
-            if isinstance(question_type, str) and question_type not in ['image', 'document', 'code', 'creative']:
-                classification_result = classify_question_type(user_question)
-                if isinstance(classification_result, dict):
-                    verification_keywords = classification_result.get('keywords', [])
-        
-        # question_type이 "general"이거나 None이면 다시 분류
-        if question_type in [None, "general"]:
-            print(f"🔄 질문 유형 재분류 중...")
-            classification_result = classify_question_type(user_question)
-            if isinstance(classification_result, dict):
-                question_type = classification_result.get('type', 'factual')
-                verification_keywords = classification_result.get('keywords', [])
-            else:
-                question_type = classification_result
-                verification_keywords = []
-            print(f"📝 재분류 결과: {question_type}")
+            conflicts = detect_conflicts_in_responses(llm_responses)
         
         # 문장 단위 분할
-        print(f"\n📝 각 AI 응답을 문장 단위로 분할...")
+        logger.debug("📝 각 AI 응답을 문장 단위로 분할...")
         llm_sentences = {}
         for model_name, response in llm_responses.items():
             sentences = extract_sentences_from_response(response)
             llm_sentences[model_name] = sentences
-            print(f"  - {model_name}: {len(sentences)}개 문장")
+            logger.debug("  - %s: %s개 문장", model_name, len(sentences))
         
-        # 상호모순 감지
-        conflicts = detect_conflicts_in_responses(llm_responses)
-        print(f"\n📊 상호모순 감지: {len(conflicts)}개 카테고리")
-        for category, items in conflicts.items():
-            print(f"  - {category}: {items}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 상호모순 감지: %s개 카테고리", len(conflicts))
+            for category, items in conflicts.items():
+                logger.debug("  - %s: %s", category, items)
         
         # 🚨 검증 소스 검색 (사실 질문일 때 항상 검색)
-        wikipedia_info = None
         use_voting = False
         
         if question_type == "factual":
             if len(conflicts) > 0:
-                print(f"\n🌐 상호모순 감지됨! 다중 검증 소스 검색 시작...")
+                logger.debug("🌐 상호모순 감지됨! 다중 검증 소스 검색 시작...")
             else:
-                print(f"\n🌐 사실 질문 감지! 다중 검증 소스 검색 시작...")
+                logger.debug("🌐 사실 질문 감지! 다중 검증 소스 검색 시작...")
             
             # 검증 키워드 사용 (LLM이 추출한 키워드 우선, 없으면 원본 질문 사용)
             if verification_keywords:
                 search_query = ' '.join(verification_keywords)
-                print(f"🔍 LLM 추출 검증 키워드 사용: {verification_keywords} -> '{search_query}'")
+                logger.debug("🔍 LLM 추출 검증 키워드 사용: %s -> '%s'", verification_keywords, search_query)
             else:
                 search_query = user_question
-                print(f"🔍 원본 질문 사용: '{search_query}'")
+                logger.debug("🔍 원본 질문 사용: '%s'", search_query)
             
             # Wikipedia, Wikidata, DBpedia, DuckDuckGo 중 가장 좋은 하나 선택
             wikipedia_info = get_best_verification_source(search_query)
             
             if wikipedia_info:
-                print(f"✅ 검증 완료: {wikipedia_info.get('source', 'Unknown')} - {wikipedia_info.get('title', 'No title')}")
-                print(f"   신뢰도: {wikipedia_info.get('confidence', 0):.2f}")
+                logger.debug("✅ 검증 완료: %s - %s", wikipedia_info.get('source', 'Unknown'), wikipedia_info.get('title', 'No title'))
+                logger.debug("   신뢰도: %.2f", wikipedia_info.get('confidence', 0))
                 # 상호모순이 없어도 검증 소스가 있으면 사용
             else:
-                print(f"⚠️ 모든 검증 소스 실패 - 검증 소스 검색 결과가 None입니다")
+                logger.warning("⚠️ 모든 검증 소스 실패 - 검증 소스 검색 결과가 None입니다")
                 # 상호모순이 있을 때만 보팅 시스템 사용
                 if len(conflicts) > 0:
-                    print(f"   상호모순이 있으므로 프리미엄 모델 보팅 시스템 활성화")
+                    logger.debug("   상호모순이 있으므로 프리미엄 모델 보팅 시스템 활성화")
                     use_voting = True
         else:
-            print(f"ℹ️ 질문 유형이 'factual'이 아니므로 검증 소스 검색을 건너뜁니다. (현재 유형: {question_type})")
+            logger.debug("ℹ️ 질문 유형이 'factual'이 아니므로 검증 소스 검색을 건너뜁니다. (현재 유형: %s)", question_type)
         
         # 🗳️ Wikipedia가 없으면 프리미엄 모델 추가 호출 및 보팅
         if use_voting:
-            print(f"\n🎯 프리미엄 모델 추가 호출 시작...")
+            logger.debug("🎯 프리미엄 모델 추가 호출 시작...")
             
             # 현재 사용 중인 모델 목록
             currently_used = list(llm_responses.keys())
-            print(f"   현재 사용 중인 모델: {currently_used}")
+            logger.debug("   현재 사용 중인 모델: %s", currently_used)
             
             # 추가 호출할 프리미엄 모델 결정
             premium_models_to_call = get_premium_models_to_call(currently_used)
             
             if premium_models_to_call:
-                print(f"   추가 호출할 모델: {premium_models_to_call}")
+                logger.debug("   추가 호출할 모델: %s", premium_models_to_call)
                 
-                # 프리미엄 모델 비동기 호출
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                premium_responses = loop.run_until_complete(
-                    call_additional_premium_models(user_question, premium_models_to_call, session_id)
-                )
-                loop.close()
+                # 프리미엄 모델 비동기 호출 (공용 이벤트 루프에서 실행)
+                try:
+                    premium_responses = run_in_background_loop(
+                        call_additional_premium_models(user_question, premium_models_to_call, session_id),
+                        timeout=PREMIUM_CALL_TIMEOUT + 5
+                    )
+                except FutureTimeoutError:
+                    logger.warning("⚠️ 프리미엄 모델 호출 시간 초과")
+                    premium_responses = {}
                 
                 if premium_responses:
-                    print(f"✅ {len(premium_responses)}개 프리미엄 모델 응답 수신")
+                    logger.debug("✅ %s개 프리미엄 모델 응답 수신", len(premium_responses))
                     
                     # 기존 응답과 프리미엄 응답 합치기
                     all_responses = {**llm_responses, **premium_responses}
@@ -992,29 +1275,27 @@ def judge_and_generate_optimal_response(llm_responses, user_question, judge_mode
                         )
                         voting_result["분석_근거"] = reason_text
                     
-                    print(f"\n🏆 보팅 완료: {voting_result['보팅_결과']['득표_모델']}")
+                    logger.debug("🏆 보팅 완료: %s", voting_result['보팅_결과']['득표_모델'])
                     
                     return voting_result
                 else:
-                    print(f"⚠️ 프리미엄 모델 응답 실패 - 기본 Judge 시스템 사용")
+                    logger.warning("⚠️ 프리미엄 모델 응답 실패 - 기본 Judge 시스템 사용")
             else:
-                print(f"⚠️ 추가 호출할 프리미엄 모델 없음 - 기본 Judge 시스템 사용")
+                logger.warning("⚠️ 추가 호출할 프리미엄 모델 없음 - 기본 Judge 시스템 사용")
         
         # Wikipedia 검증이 있거나 보팅이 불필요한 경우 기존 Judge 시스템 사용
         judge_prompt = _build_judge_prompt(user_question, llm_responses, llm_sentences, wikipedia_info)
         
-        print(f"\n📞 심판 모델({judge_model}) 호출...")
-        judge_response = call_judge_model(judge_model, judge_prompt)
+        logger.debug("📞 심판 모델(%s) 호출...", judge_model)
+        judge_response = run_in_background_loop(call_judge_model_hedged(judge_model, judge_prompt))
         
-        print(f"\n📝 응답 파싱 및 환각 검증...")
+        logger.debug("📝 응답 파싱 및 환각 검증...")
         parsed_result = parse_judge_response(judge_response, judge_model, llm_responses, llm_sentences, wikipedia_info)
         
         return parsed_result
         
     except Exception as e:
-        print(f"❌ 검증 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ 검증 실패: %s", e)
         
         if llm_responses:
             longest_response = max(llm_responses.values(), key=len)
@@ -1035,7 +1316,7 @@ def judge_and_generate_optimal_response(llm_responses, user_question, judge_mode
                 "원본_응답": llm_responses
             }
             # 검증 소스 정보 추가 (wikipedia_info가 있는 경우)
-            # wikipedia_info는 함수 시작 부분에서 None으로 초기화되므로 항상 접근 가능
+            # wikipedia_info는 try 이전에 None으로 초기화됨
             if wikipedia_info:
                 result["검증_소스"] = {
                     "사용됨": True,
@@ -1055,32 +1336,24 @@ def judge_and_generate_optimal_response(llm_responses, user_question, judge_mode
             return result
 
 
-def call_judge_model(model_name, prompt):
-    """심판 모델 호출"""
-    try:
-        if model_name in ['GPT-5', 'GPT-4', 'GPT-4o', 'GPT-4o-mini', 'GPT-3.5-turbo']:
-            openai_api_key = os.getenv('OPENAI_API_KEY')
-            if not openai_api_key:
-                raise ValueError("OpenAI API 키 미설정")
-            
-            client = openai.OpenAI(api_key=openai_api_key)
-            
-            # 모델명 변환
-            model_map = {
-                'GPT-5': 'gpt-5',
-                'GPT-4': 'gpt-4',
-                'GPT-4o': 'gpt-4o',
-                'GPT-4o-mini': 'gpt-4o-mini',
-                'GPT-3.5-turbo': 'gpt-3.5-turbo'
-            }
-            openai_model = model_map.get(model_name, 'gpt-4o')
-            
-            is_latest = 'gpt-5' in openai_model or 'o1' in openai_model or 'o3' in openai_model
-            
-            api_params = {
-                "model": openai_model,
-                "messages": [
-                    {"role": "system", "content": """당신은 텍스트 분석 전문가입니다.
+# 심판 모델 헤징: 주 모델이 이 시간(초) 안에 답하지 않거나 실패하면 백업 모델을 함께 호출
+JUDGE_BACKUP_MODEL = 'GPT-4o-mini'
+JUDGE_HEDGE_DELAY = float(os.getenv('JUDGE_HEDGE_DELAY', '15'))
+# 심판 모델 표시 이름 -> OpenAI 모델명 (새 심판 모델은 여기에 한 줄 추가)
+_JUDGE_OPENAI_MODEL_MAP = {
+    'GPT-5': 'gpt-5',
+    'GPT-4': 'gpt-4',
+    'GPT-4o': 'gpt-4o',
+    'GPT-4o-mini': 'gpt-4o-mini',
+    'GPT-3.5-turbo': 'gpt-3.5-turbo'
+}
+# temperature/response_format 대신 max_completion_tokens를 쓰는 최신(추론) 모델
+_JUDGE_LATEST_MODELS = frozenset(
+    model for model in _JUDGE_OPENAI_MODEL_MAP.values()
+    if any(prefix in model for prefix in ('gpt-5', 'o1', 'o3'))
+)
+
+_JUDGE_SYSTEM_PROMPT = """당신은 텍스트 분석 전문가입니다.
 
 🚨 절대 규칙:
 1. **각 AI가 실제로 말한 문장만** adopted_info/rejected_info에 복사
@@ -1099,53 +1372,135 @@ def call_judge_model(model_name, prompt):
 - 다른 AI 문장을 해당 AI 채택/제외에 포함
 - AI가 말하지 않은 내용 만들어내기
 
-JSON 형식으로만 응답."""},
-                    {"role": "user", "content": prompt}
-                ]
-            }
-            
-            if not is_latest:
-                api_params["temperature"] = 0.0
-            
-            completion_limit = get_openai_completion_limit(openai_model)
-            if is_latest:
-                api_params["max_completion_tokens"] = completion_limit
-            else:
-                api_params["max_tokens"] = completion_limit
-                api_params["response_format"] = {"type": "json_object"}
-            
-            response = client.chat.completions.create(**api_params)
-            return response.choices[0].message.content.strip()
-        else:
-            return call_judge_model('GPT-4o', prompt)
-            
+JSON 형식으로만 응답."""
+
+
+def _build_judge_api_params(model_name, prompt):
+    """심판 모델 chat.completions 요청 파라미터 생성"""
+    openai_model = _JUDGE_OPENAI_MODEL_MAP.get(model_name, 'gpt-4o')
+    is_latest = openai_model in _JUDGE_LATEST_MODELS
+    
+    api_params = {
+        "model": openai_model,
+        "messages": [
+            {"role": "system", "content": _JUDGE_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    }
+    
+    if not is_latest:
+        api_params["temperature"] = 0.0
+    
+    completion_limit = get_openai_completion_limit(openai_model)
+    if is_latest:
+        api_params["max_completion_tokens"] = completion_limit
+    else:
+        api_params["max_tokens"] = completion_limit
+        api_params["response_format"] = {"type": "json_object"}
+    
+    return api_params
+
+
+def call_judge_model(model_name, prompt):
+    """심판 모델 동기 호출 (acall_judge_model을 공용 이벤트 루프에서 실행)"""
+    try:
+        return run_in_background_loop(acall_judge_model(model_name, prompt))
     except Exception as e:
-        print(f"❌ 심판 모델 호출 실패: {e}")
+        logger.error("❌ 심판 모델 호출 실패: %s", e)
         raise
 
 
+@lru_cache(maxsize=4)
+def _get_async_openai_client(api_key):
+    """API 키별 AsyncOpenAI 클라이언트 (공용 이벤트 루프에서만 사용하므로 루프에 묶인 커넥션 풀을 계속 재사용)"""
+    return openai.AsyncOpenAI(api_key=api_key)
+
+
+async def acall_judge_model(model_name, prompt):
+    """심판 모델 비동기 호출 (OpenAI 심판 모델이 아니면 GPT-4o 사용)"""
+    if model_name not in _JUDGE_OPENAI_MODEL_MAP:
+        model_name = 'GPT-4o'
+    openai_api_key = os.getenv('OPENAI_API_KEY')
+    if not openai_api_key:
+        raise ValueError("OpenAI API 키 미설정")
+    
+    client = _get_async_openai_client(openai_api_key)
+    response = await client.chat.completions.create(**_build_judge_api_params(model_name, prompt))
+    return response.choices[0].message.content.strip()
+
+
+async def call_judge_model_hedged(model_name, prompt, backup_model=JUDGE_BACKUP_MODEL, hedge_delay=JUDGE_HEDGE_DELAY):
+    """주 심판 모델이 hedge_delay초 안에 답하지 않거나 실패하면 백업 모델도 호출하고 먼저 성공한 응답을 반환
+
+    느린 꼬리 구간에서만 백업을 호출하므로 평소 비용은 그대로이고, 남은 호출은 취소한다
+    """
+    primary = asyncio.ensure_future(acall_judge_model(model_name, prompt))
+    tasks = {primary}
+    try:
+        await asyncio.wait(tasks, timeout=hedge_delay)
+        if primary.done() and primary.exception() is None:
+            return primary.result()
+        
+        last_error = primary.exception() if primary.done() else None
+        if backup_model and backup_model != model_name:
+            if last_error is not None:
+                logger.warning("⚠️ 심판 모델 %s 실패 (%s), 백업 %s 호출", model_name, last_error, backup_model)
+            else:
+                logger.warning("⏱️ 심판 모델 %s가 %s초 안에 응답하지 않아 백업 %s 동시 호출", model_name, hedge_delay, backup_model)
+            tasks.add(asyncio.ensure_future(acall_judge_model(backup_model, prompt)))
+        
+        pending = {task for task in tasks if not task.done()}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+        logger.error("❌ 심판 모델 호출 실패: %s", last_error)
+        raise last_error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _split_sentences_by_source(original_response, wiki_text):
+    """원본 앞 3문장을 검증 소스(소문자 본문)와의 유사도로 채택/제외 분류 (소스가 없으면 모두 채택)"""
+    sentences = extract_sentences_from_response(original_response)[:3]
+    if wiki_text is None or not sentences:
+        return sentences, []
+    
+    adopted_info = []
+    rejected_info = []
+    for sentence in sentences:
+        # 30% 이상 유사하면 채택
+        if similarity_ratio(sentence.lower(), wiki_text) > 0.3:
+            adopted_info.append(sentence)
+        else:
+            rejected_info.append(sentence)
+    return adopted_info, rejected_info
+
+
 def parse_judge_response(judge_response, judge_model, llm_responses=None, llm_sentences=None, wikipedia_info=None):
     """심판 모델 JSON 응답 파싱 및 엄격한 환각 검증"""
     try:
         
         # JSON 추출
-        json_match = re.search(r'\{.*\}', judge_response, re.DOTALL)
-        if not json_match:
+        json_str = _extract_json_object(judge_response)
+        if not json_str:
             return create_fallback_result(judge_model, llm_responses, wikipedia_info)
         
-        json_str = json_match.group()
         try:
-            parsed_data = json.loads(json_str)
-            print(f"✅ JSON 파싱 성공")
+            parsed_data = _json_loads(json_str)
+            logger.debug("✅ JSON 파싱 성공")
         except json.JSONDecodeError as e:
-            print(f"❌ JSON 파싱 실패: {e}")
+            logger.error("❌ JSON 파싱 실패: %s", e)
             return create_fallback_result(judge_model, llm_responses, wikipedia_info)
         
         optimal_answer = parsed_data.get("optimal_answer", "").strip()
         
         # optimal_answer가 비어있거나 의미 없는 경우, Wikipedia 정보나 AI 응답으로 대체
         if not optimal_answer or len(optimal_answer) < 10 or "없습니다" in optimal_answer or "없음" in optimal_answer:
-            print(f"⚠️ Judge가 제공한 optimal_answer가 비어있거나 부적절함: '{optimal_answer}'")
+            logger.warning("⚠️ Judge가 제공한 optimal_answer가 비어있거나 부적절함: '%s'", optimal_answer)
             
             # Wikipedia 정보가 있으면 Wikipedia 내용 기반으로 답변 생성
             if wikipedia_info:
@@ -1154,14 +1509,14 @@ def parse_judge_response(judge_response, judge_model, llm_responses=None, llm_se
                 if wiki_extract:
                     # Wikipedia 내용의 첫 부분을 최적 답변으로 사용
                     optimal_answer = f"{wiki_title}에 대한 정보:\n\n{wiki_extract[:500]}"
-                    print(f"✅ Wikipedia 정보로 최적 답변 생성: {len(optimal_answer)}자")
+                    logger.debug("✅ Wikipedia 정보로 최적 답변 생성: %s자", len(optimal_answer))
             
             # Wikipedia도 없으면 가장 긴 AI 응답 사용
             if (not optimal_answer or len(optimal_answer) < 10) and llm_responses:
                 longest_response = max(llm_responses.values(), key=len)
                 if longest_response and len(longest_response) > 10:
                     optimal_answer = longest_response[:1000]  # 최대 1000자
-                    print(f"✅ 가장 긴 AI 응답으로 최적 답변 생성: {len(optimal_answer)}자")
+                    logger.debug("✅ 가장 긴 AI 응답으로 최적 답변 생성: %s자", len(optimal_answer))
         
         result = {
             "최적의_답변": optimal_answer,
@@ -1178,17 +1533,15 @@ def parse_judge_response(judge_response, judge_model, llm_responses=None, llm_se
         
         # 검증 결과 파싱 및 엄격한 환각 검증
         verification_results = parsed_data.get("verification_results", {})
-        processed_models = set()
+        wiki_text = wikipedia_info['extract'].lower() if wikipedia_info else None
         
         for model_name, verification in verification_results.items():
-            processed_models.add(model_name)
-            
             adopted_raw = verification.get("adopted_info", [])
             rejected_raw = verification.get("rejected_info", [])
             
-            print(f"\n🔍 {model_name} 검증:")
-            print(f"   Judge 제공 adopted: {len(adopted_raw)}개")
-            print(f"   Judge 제공 rejected: {len(rejected_raw)}개")
+            logger.debug("🔍 %s 검증:", model_name)
+            logger.debug("   Judge 제공 adopted: %s개", len(adopted_raw))
+            logger.debug("   Judge 제공 rejected: %s개", len(rejected_raw))
             
             adopted_info = []
             rejected_info = []
@@ -1200,29 +1553,15 @@ def parse_judge_response(judge_response, judge_model, llm_responses=None, llm_se
                 adopted_info = extract_valid_sentences(adopted_raw, original_response, model_name)
                 rejected_info = extract_valid_sentences(rejected_raw, original_response, model_name)
                 
-                print(f"   검증 후 adopted: {len(adopted_info)}개")
-                print(f"   검증 후 rejected: {len(rejected_info)}개")
+                logger.debug("   검증 후 adopted: %s개", len(adopted_info))
+                logger.debug("   검증 후 rejected: %s개", len(rejected_info))
                 
                 # 둘 다 비어있으면 원본에서 추출
                 if not adopted_info and not rejected_info:
-                    print(f"⚠️ {model_name}: 모두 비어있음, 원본에서 추출")
-                    sentences = extract_sentences_from_response(original_response)
+                    logger.warning("⚠️ %s: 모두 비어있음, 원본에서 추출", model_name)
+                    adopted_info, rejected_info = _split_sentences_by_source(original_response, wiki_text)
                     
-                    # Wikipedia 정보가 있으면 Wikipedia 기준으로 분류
-                    if wikipedia_info and sentences:
-                        wiki_text = wikipedia_info['extract'].lower()
-                        for sentence in sentences[:3]:
-                            sentence_lower = sentence.lower()
-                            # Wikipedia 내용과 유사한지 확인
-                            similarity = similarity_ratio(sentence_lower, wiki_text)
-                            if similarity > 0.3:  # 30% 이상 유사하면 채택
-                                adopted_info.append(sentence)
-                            else:
-                                rejected_info.append(sentence)
-                    else:
-                        adopted_info = sentences[:3] if sentences else []
-                    
-                    print(f"   원본 추출 후 adopted: {len(adopted_info)}개, rejected: {len(rejected_info)}개")
+                    logger.debug("   원본 추출 후 adopted: %s개, rejected: %s개", len(adopted_info), len(rejected_info))
             
             result["llm_검증_결과"][model_name] = {
                 "정확성": verification.get("accuracy", "정확"),
@@ -1234,26 +1573,10 @@ def parse_judge_response(judge_response, judge_model, llm_responses=None, llm_se
         
         # Judge가 누락한 모델 처리
         if llm_responses:
-            for model_name in llm_responses.keys():
-                if model_name not in processed_models:
-                    print(f"\n⚠️ {model_name}: Judge 결과 누락, 기본 정보 생성")
-                    sentences = extract_sentences_from_response(llm_responses[model_name])
-                    
-                    adopted_info = []
-                    rejected_info = []
-                    
-                    # Wikipedia 정보가 있으면 Wikipedia 기준으로 분류
-                    if wikipedia_info and sentences:
-                        wiki_text = wikipedia_info['extract'].lower()
-                        for sentence in sentences[:3]:
-                            sentence_lower = sentence.lower()
-                            similarity = similarity_ratio(sentence_lower, wiki_text)
-                            if similarity > 0.3:
-                                adopted_info.append(sentence)
-                            else:
-                                rejected_info.append(sentence)
-                    else:
-                        adopted_info = sentences[:3] if sentences else []
+            for model_name, original_response in llm_responses.items():
+                if model_name not in verification_results:
+                    logger.warning("⚠️ %s: Judge 결과 누락, 기본 정보 생성", model_name)
+                    adopted_info, rejected_info = _split_sentences_by_source(original_response, wiki_text)
                     
                     result["llm_검증_결과"][model_name] = {
                         "정확성": "✅" if adopted_info else "❌",
@@ -1265,13 +1588,14 @@ def parse_judge_response(judge_response, judge_model, llm_responses=None, llm_se
             
             result["원본_응답"] = llm_responses
         
-        # 최종 통계
-        print(f"\n📊 최종 검증 통계:")
-        total_adopted = sum(len(v.get("채택된_정보", [])) for v in result["llm_검증_결과"].values())
-        total_rejected = sum(len(v.get("제외된_정보", [])) for v in result["llm_검증_결과"].values())
-        print(f"   전체 채택: {total_adopted}개")
-        print(f"   전체 제외: {total_rejected}개")
-        print(f"   처리 모델: {len(result['llm_검증_결과'])}개")
+        # 최종 통계 (DEBUG 로그가 꺼져 있으면 집계 생략)
+        if logger.isEnabledFor(logging.DEBUG):
+            total_adopted = sum(len(v.get("채택된_정보", [])) for v in result["llm_검증_결과"].values())
+            total_rejected = sum(len(v.get("제외된_정보", [])) for v in result["llm_검증_결과"].values())
+            logger.debug("📊 최종 검증 통계:")
+            logger.debug("   전체 채택: %s개", total_adopted)
+            logger.debug("   전체 제외: %s개", total_rejected)
+            logger.debug("   처리 모델: %s개", len(result['llm_검증_결과']))
         
         # 검증 소스 정보 추가 (없을 때도 명시적으로 표시)
         if wikipedia_info:
@@ -1282,7 +1606,7 @@ def parse_judge_response(judge_response, judge_model, llm_responses=None, llm_se
                 "내용": wikipedia_info.get("extract", "")[:200],
                 "신뢰도": wikipedia_info.get("confidence", 0)
             }
-            print(f"   검증 소스: ✅ {wikipedia_info.get('source', 'Unknown')} 사용됨")
+            logger.debug("   검증 소스: ✅ %s 사용됨", wikipedia_info.get('source', 'Unknown'))
         else:
             result["검증_소스"] = {
                 "사용됨": False,
@@ -1291,14 +1615,12 @@ def parse_judge_response(judge_response, judge_model, llm_responses=None, llm_se
                 "내용": None,
                 "신뢰도": 0
             }
-            print(f"   검증 소스: ❌ 사용되지 않음")
+            logger.debug("   검증 소스: ❌ 사용되지 않음")
         
         return result
         
     except Exception as e:
-        print(f"❌ 파싱 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ 파싱 실패: %s", e)
         return create_fallback_result(judge_model, llm_responses, wikipedia_info)
 
 
@@ -1360,7 +1682,7 @@ def format_optimal_response(final_result):
 {optimal_answer}
 """
     except Exception as e:
-        print(f"❌ 포맷팅 실패: {e}")
+        logger.error("❌ 포맷팅 실패: %s", e)
         return f"""**최적의 답변:**
 
 {final_result.get('최적의_답변', '답변 생성 실패')}
@@ -3,7 +3,19 @@
 Wikipedia, Wikidata, DBpedia, DuckDuckGo 검색 기능
 """
 import json
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# 검증 소스 호출용 공용 세션 (호스트별 keep-alive 커넥션 재사용, 429/5xx는 짧게 재시도)
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
 
 
 def quick_wikipedia_search(query, lang='ko'):
@@ -11,7 +23,7 @@ def quick_wikipedia_search(query, lang='ko'):
     try:
         search_query = query
         lang_name = "한국어" if lang == 'ko' else "영어"
-        print(f"🔍 Wikipedia ({lang_name}) 검색 시작: '{search_query}'")
+        logger.debug("🔍 Wikipedia (%s) 검색 시작: '%s'", lang_name, search_query)
         
         search_url = f"https://{lang}.wikipedia.org/w/api.php"
         search_params = {
@@ -23,19 +35,19 @@ def quick_wikipedia_search(query, lang='ko'):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
         
-        response = requests.get(search_url, params=search_params, headers=headers, timeout=10)
+        response = _HTTP.get(search_url, params=search_params, headers=headers, timeout=10)
         if response.status_code != 200:
-            print(f"⚠️ Wikipedia ({lang_name}) API 응답 오류: {response.status_code}")
+            logger.warning("⚠️ Wikipedia (%s) API 응답 오류: %s", lang_name, response.status_code)
             return None
         
         try:
             search_data = response.json()
         except json.JSONDecodeError as e:
-            print(f"⚠️ Wikipedia JSON 파싱 실패: {e}")
+            logger.warning("⚠️ Wikipedia JSON 파싱 실패: %s", e)
             return None
         
         if not search_data.get("query", {}).get("search"):
-            print(f"⚠️ Wikipedia 검색 결과 없음")
+            logger.warning("⚠️ Wikipedia 검색 결과 없음")
             return None
         
         search_results = search_data["query"]["search"]
@@ -65,21 +77,21 @@ def quick_wikipedia_search(query, lang='ko'):
                 best_result = result
         
         if not best_result or best_score < 10:
-            print(f"⚠️ 검색 결과의 관련성 점수가 낮음 (최고 점수: {best_score:.1f}점). 검색 실패로 처리")
+            logger.warning("⚠️ 검색 결과의 관련성 점수가 낮음 (최고 점수: %.1f점). 검색 실패로 처리", best_score)
             return None
         
         page_id = best_result["pageid"]
         page_title = best_result["title"]
-        print(f"📄 Wikipedia 페이지 발견: '{page_title}' (ID: {page_id}, 관련성 점수: {best_score:.1f})")
+        logger.debug("📄 Wikipedia 페이지 발견: '%s' (ID: %s, 관련성 점수: %.1f)", page_title, page_id, best_score)
         
         content_params = {
             "action": "query", "format": "json", "pageids": page_id,
             "prop": "extracts", "exintro": True, "explaintext": True, "exchars": 500
         }
-        content_response = requests.get(search_url, params=content_params, headers=headers, timeout=10)
+        content_response = _HTTP.get(search_url, params=content_params, headers=headers, timeout=10)
         
         if content_response.status_code != 200:
-            print(f"⚠️ Wikipedia ({lang_name}) 페이지 내용 가져오기 실패: {content_response.status_code}")
+            logger.warning("⚠️ Wikipedia (%s) 페이지 내용 가져오기 실패: %s", lang_name, content_response.status_code)
             return None
         
         try:
@@ -101,32 +113,32 @@ def quick_wikipedia_search(query, lang='ko'):
         if not extract:
             return None
         
-        print(f"✅ Wikipedia 페이지 찾음: '{title}'")
+        logger.debug("✅ Wikipedia 페이지 찾음: '%s'", title)
         return {
             "source": "Wikipedia", "title": title, "extract": extract,
             "verified": True, "confidence": 0.9
         }
         
     except requests.exceptions.Timeout:
-        print(f"❌ Wikipedia 검색 타임아웃")
+        logger.error("❌ Wikipedia 검색 타임아웃")
         return None
     except requests.exceptions.RequestException as e:
-        print(f"❌ Wikipedia 네트워크 오류: {e}")
+        logger.error("❌ Wikipedia 네트워크 오류: %s", e)
         return None
     except Exception as e:
-        print(f"❌ Wikipedia 검색 실패: {e}")
+        logger.error("❌ Wikipedia 검색 실패: %s", e)
         return None
 
 
 def search_duckduckgo_instant_answer(query):
     """DuckDuckGo Instant Answer API 검색"""
     try:
-        print(f"🔍 DuckDuckGo Instant Answer 검색 시작: '{query}'")
+        logger.debug("🔍 DuckDuckGo Instant Answer 검색 시작: '%s'", query)
         url = "https://api.duckduckgo.com/"
         params = {"q": query, "format": "json", "no_html": "1", "skip_disambig": "1"}
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = _HTTP.get(url, params=params, headers=headers, timeout=10)
         if response.status_code != 200:
             return None
         
@@ -136,7 +148,7 @@ def search_duckduckgo_instant_answer(query):
             return None
         
         if data.get("AbstractText"):
-            print(f"✅ DuckDuckGo Instant Answer 찾음")
+            logger.debug("✅ DuckDuckGo Instant Answer 찾음")
             return {
                 "source": "DuckDuckGo Instant Answer",
                 "title": data.get("Heading", query),
@@ -148,7 +160,7 @@ def search_duckduckgo_instant_answer(query):
         if data.get("RelatedTopics") and len(data["RelatedTopics"]) > 0:
             first_topic = data["RelatedTopics"][0]
             if isinstance(first_topic, dict) and first_topic.get("Text"):
-                print(f"✅ DuckDuckGo RelatedTopics 찾음")
+                logger.debug("✅ DuckDuckGo RelatedTopics 찾음")
                 return {
                     "source": "DuckDuckGo Instant Answer",
                     "title": first_topic.get("FirstURL", "").split("/")[-1] if first_topic.get("FirstURL") else query,
@@ -166,7 +178,7 @@ def search_wikidata(query, lang='ko'):
     """Wikidata SPARQL 검색 (한국어/영어 지원)"""
     try:
         lang_name = "한국어" if lang == 'ko' else "영어"
-        print(f"🔍 Wikidata ({lang_name}) 검색 시작: '{query}'")
+        logger.debug("🔍 Wikidata (%s) 검색 시작: '%s'", lang_name, query)
         
         sparql_url = "https://query.wikidata.org/sparql"
         search_query_escaped = query.replace('"', '\\"')
@@ -187,7 +199,7 @@ def search_wikidata(query, lang='ko'):
             "Accept": "application/sparql-results+json"
         }
         
-        response = requests.get(
+        response = _HTTP.get(
             sparql_url, params={"query": sparql_query, "format": "json"},
             headers=headers, timeout=5
         )
@@ -199,7 +211,7 @@ def search_wikidata(query, lang='ko'):
                 result = results[0]
                 item_label = result.get("itemLabel", {}).get("value", query)
                 item_desc = result.get("itemDescription", {}).get("value", "")
-                print(f"✅ Wikidata ({lang_name}) 항목 찾음: '{item_label}'")
+                logger.debug("✅ Wikidata (%s) 항목 찾음: '%s'", lang_name, item_label)
                 return {
                     "source": "Wikidata", "title": item_label, "extract": item_desc,
                     "item_id": result.get("item", {}).get("value", ""),
@@ -214,7 +226,7 @@ def search_dbpedia(query, lang='ko'):
     """DBpedia SPARQL 검색 (한국어/영어 지원)"""
     try:
         lang_name = "한국어" if lang == 'ko' else "영어"
-        print(f"🔍 DBpedia ({lang_name}) 검색 시작: '{query}'")
+        logger.debug("🔍 DBpedia (%s) 검색 시작: '%s'", lang_name, query)
         
         sparql_url = "https://dbpedia.org/sparql"
         search_query_escaped = query.replace('"', '\\"')
@@ -232,7 +244,7 @@ def search_dbpedia(query, lang='ko'):
         
         headers = {"Accept": "application/sparql-results+json", "User-Agent": "Mozilla/5.0"}
         
-        response = requests.get(
+        response = _HTTP.get(
             sparql_url, params={"query": sparql_query, "format": "json"},
             headers=headers, timeout=5
         )
@@ -246,7 +258,7 @@ def search_dbpedia(query, lang='ko'):
                 abstract = result.get("abstract", {}).get("value", "")
                 if not abstract:
                     abstract = f"{label}에 대한 정보입니다." if lang == 'ko' else f"Information about {label}."
-                print(f"✅ DBpedia ({lang_name}) 항목 찾음: '{label}'")
+                logger.debug("✅ DBpedia (%s) 항목 찾음: '%s'", lang_name, label)
                 return {
                     "source": "DBpedia", "title": label, "extract": abstract,
                     "resource": result.get("resource", {}).get("value", ""),
@@ -259,18 +271,18 @@ def search_dbpedia(query, lang='ko'):
 
 def get_best_verification_source(query):
     """여러 검증 소스 중 가장 좋은 하나 선택"""
-    print(f"\n🔍 다중 검증 소스 검색 시작: '{query}'")
+    logger.debug("🔍 다중 검증 소스 검색 시작: '%s'", query)
     
     wiki_result = quick_wikipedia_search(query, lang='ko')
     if not wiki_result:
-        print(f"   한국어 Wikipedia 실패, 영어 Wikipedia 시도...")
+        logger.debug("   한국어 Wikipedia 실패, 영어 Wikipedia 시도...")
         wiki_result = quick_wikipedia_search(query, lang='en')
     if wiki_result:
-        print(f"✅ Wikipedia 검색 성공! 다른 소스는 건너뜁니다.")
-        print(f"\n✅ 최적 검증 소스 선택: {wiki_result['source']} (신뢰도: {wiki_result.get('confidence', 0):.2f})")
+        logger.debug("✅ Wikipedia 검색 성공! 다른 소스는 건너뜁니다.")
+        logger.debug("✅ 최적 검증 소스 선택: %s (신뢰도: %.2f)", wiki_result['source'], wiki_result.get('confidence', 0))
         return wiki_result
     
-    print(f"⚠️ Wikipedia 검색 실패, 다른 검증 소스 시도...")
+    logger.warning("⚠️ Wikipedia 검색 실패, 다른 검증 소스 시도...")
     results = []
     
     try:
@@ -280,7 +292,7 @@ def get_best_verification_source(query):
         if wikidata_result:
             results.append(wikidata_result)
     except Exception as e:
-        print(f"⚠️ Wikidata 검색 중 오류 발생, 건너뜁니다: {e}")
+        logger.warning("⚠️ Wikidata 검색 중 오류 발생, 건너뜁니다: %s", e)
     
     try:
         dbpedia_result = search_dbpedia(query, lang='ko')
@@ -289,21 +301,21 @@ def get_best_verification_source(query):
         if dbpedia_result:
             results.append(dbpedia_result)
     except Exception as e:
-        print(f"⚠️ DBpedia 검색 중 오류 발생, 건너뜁니다: {e}")
+        logger.warning("⚠️ DBpedia 검색 중 오류 발생, 건너뜁니다: %s", e)
     
     try:
         ddg_result = search_duckduckgo_instant_answer(query)
         if ddg_result:
             results.append(ddg_result)
     except Exception as e:
-        print(f"⚠️ DuckDuckGo 검색 중 오류 발생, 건너뜁니다: {e}")
+        logger.warning("⚠️ DuckDuckGo 검색 중 오류 발생, 건너뜁니다: %s", e)
     
     if not results:
-        print(f"⚠️ 모든 검증 소스에서 결과 없음")
+        logger.warning("⚠️ 모든 검증 소스에서 결과 없음")
         return None
     
     results.sort(key=lambda x: x.get("confidence", 0), reverse=True)
     best_result = results[0]
-    print(f"\n✅ 최적 검증 소스 선택: {best_result['source']} (신뢰도: {best_result.get('confidence', 0):.2f})")
+    logger.debug("✅ 최적 검증 소스 선택: %s (신뢰도: %.2f)", best_result['source'], best_result.get('confidence', 0))
     return best_result
 
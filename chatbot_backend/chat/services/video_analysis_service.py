@@ -382,7 +382,7 @@ class VideoAnalysisService:
             # 이미지를 base64로 인코딩
             buffered = BytesIO()
             pil_image.save(buffered, format="JPEG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
+            img_str = base64.b64encode(buffered.getvalue()).decode('ascii')
             
             client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
             
@@ -3,8 +3,62 @@
 Wikipedia API를 통한 사실 검증
 """
 import re
+import hashlib
+import logging
+import functools
 import requests
-from collections import Counter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Wikipedia 조회 결과 캐시 (같은 키워드/페이지가 자주 반복되므로 왕복 2회를 생략)
+WIKI_CACHE_TIMEOUT = 86400           # 검증 성공 결과: 24시간
+WIKI_NEGATIVE_CACHE_TIMEOUT = 3600   # 페이지 없음 등 확정된 실패: 1시간
+WIKI_STALE_TIMEOUT = 7 * 86400       # 네트워크/API 오류 시 대신 돌려줄 이전 성공 결과 보관 기간
+# 일시적인 오류로 보고 캐시하지 않는 실패 메시지 접두사
+_WIKI_TRANSIENT_ERRORS = ("검색 실패", "API 오류", "본문 검색 오류")
+
+# Wikipedia 호출용 공용 세션 (호스트별 keep-alive 커넥션 재사용, 429/5xx는 짧게 재시도)
+_HTTP = requests.Session()
+_HTTP.headers.update({'User-Agent': 'AI_of_AI_ChatBot/1.0 (Educational Project)'})  # Wikipedia API 요구사항
+_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# 키워드/언어별 Wikipedia 검색을 병렬로 실행할 공용 스레드 풀 (키워드 3개 × 언어 2개)
+_WIKI_EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix="wikipedia")
+
+# 키워드 추출 패턴: 한글 명사 / 영어 고유명사 / 숫자 단어를 한 번의 스캔으로 분류
+_SEARCH_TERM_RE = re.compile(
+    r'(?P<korean>[가-힣]{2,})'                      # 한국어 명사 (2글자 이상)
+    r'|(?P<english>[A-Z][a-z]+(?:\s[A-Z][a-z]+)*)'  # 영어 대문자로 시작하는 단어들 (고유명사)
+    r'|(?P<number>\d{4}년?|\d+명?|\d+개?)'          # 숫자와 함께 나오는 단어들 (연도, 수치 등)
+)
+# 특수 패턴 (대학교, 대학, 회사, 정부, 사건, 전쟁, 혁명, 올림픽): 한글 구간 안에서만 나오므로 한글 명사에만 적용
+_SPECIAL_TERM_RE = re.compile(r'[가-힣]+(?:대학교?|대학?|회사?|정부?|사건?|전쟁?|혁명?|올림픽?)')
+# 검색어로 쓰기에 너무 일반적인 단어들
+_COMMON_QUESTION_WORDS = frozenset(['설명', '대해', '알려', '줘', '해줘', '어떤', '무엇', '언제', '어디', '왜', '어떻게'])
+
+# Wikipedia 본문 정보 추출 패턴
+# 1900~2024년만 매치 (앞뒤가 숫자인 더 긴 수는 제외)
+_VALID_YEAR_RE = re.compile(r'(?<!\d)(19\d{2}|20[01]\d|202[0-4])(?!\d)')
+# 설립/개교 연도 패턴 3개를 하나로 합침 (대안별 연도 그룹 y1/y2/y3)
+_FOUNDING_YEAR_RE = re.compile(
+    r'(?P<y1>\d{4})년[^\d]*(?:설립|창립|개교|대학.*설립|대학교.*설립|설립.*대학)'
+    r'|(?:설립|창립|개교)[^\d]*(?P<y2>\d{4})년'
+    r'|(?P<y3>\d{4})년.*(?:출범|탄생|생성)',
+    re.IGNORECASE
+)
+_LOCATION_RES = [re.compile(pattern) for pattern in (
+    r'([가-힣]+특별시|[가-힣]+광역시|[가-힣]+시)\s+([가-힣]+구|[가-힣]+군)',
+    r'([가-힣]+특별시|[가-힣]+광역시|[가-힣]+시)',
+    r'([가-힣]+도)\s+([가-힣]+시)',
+)]
 
 
 def quick_web_verify(conflict_type, conflict_values, question):
@@ -14,132 +68,246 @@ def quick_web_verify(conflict_type, conflict_values, question):
     import re
     
     try:
-        print(f"🌐 웹 검증 시작: '{question}'")
+        logger.debug("🌐 웹 검증 시작: '%s'", question)
         
         # 1차: Wikipedia API 검색 (질문 기반)
-        print("🔍 Wikipedia 검색 시도...")
+        logger.debug("🔍 Wikipedia 검색 시도...")
         wiki_result = search_wikipedia(question, [])
         if wiki_result.get("verified"):
-            print(f"✅ Wikipedia 검증 성공")
+            logger.debug("✅ Wikipedia 검증 성공")
             return wiki_result
         
         # 2차: Google Search (간단한 방법)
-        print("🔍 Google 검색 시도...")
+        logger.debug("🔍 Google 검색 시도...")
         google_result = search_google_simple(question, [])
         if google_result.get("verified"):
-            print(f"✅ Google 검증 성공")
+            logger.debug("✅ Google 검증 성공")
             return google_result
         
         # 모든 검색이 실패한 경우
-        print("⚠️ 모든 웹 검색 실패")
+        logger.warning("⚠️ 모든 웹 검색 실패")
         return {"verified": False, "error": "모든 검색 엔진 실패"}
                 
     except Exception as e:
-        print(f"⚠️ 웹 검증 실패: {e}")
+        logger.warning("⚠️ 웹 검증 실패: %s", e)
         return {"verified": False, "error": str(e)}
 
 
 
 def search_wikipedia(question, keywords):
     """Wikipedia API를 통한 자동 검증 (하드코딩 없음)"""
-    import requests
-    import re
-    
     try:
         # 1단계: 질문에서 핵심 키워드 추출
         search_terms = extract_search_terms_from_question(question)
         
         if not search_terms:
-            print("⚠️ 검색 키워드 추출 실패")
+            logger.warning("⚠️ 검색 키워드 추출 실패")
             return {"verified": False, "error": "검색 키워드 없음"}
         
-        print(f"🔍 Wikipedia 검색 키워드: {search_terms}")
+        logger.debug("🔍 Wikipedia 검색 키워드: %s", search_terms)
         
-        # 2단계: 각 검색어로 Wikipedia 검색 시도
-        for term in search_terms[:3]:  # 최대 3개 키워드 시도
-            # 한글 Wikipedia 검색
-            wiki_results = search_wikipedia_api(term, 'ko')
-            
+        # 2단계: 키워드를 문서 제목으로 보고 언어별 한 번의 요청으로 요약문 조회 (한글 먼저)
+        title_futures = [
+            _WIKI_EXECUTOR.submit(search_wikipedia_titles, '|'.join(search_terms[:3]), lang)
+            for lang in ('ko', 'en')
+        ]
+        for future in title_futures:
+            wiki_results = future.result()
             if wiki_results.get("verified"):
                 return wiki_results
-            
-            # 실패 시 영어 Wikipedia 검색
-            wiki_results_en = search_wikipedia_api(term, 'en')
-            
-            if wiki_results_en.get("verified"):
-                return wiki_results_en
         
-        print("⚠️ 모든 Wikipedia 검색 실패")
+        # 3단계: 제목이 일치하는 문서가 없으면 (최대 3개 키워드 × 한글/영어) 검색을 동시에 시작하고,
+        # 우선순위(키워드 순서, 한글 먼저) 순으로 결과를 확인해 처음 검증된 결과 반환
+        futures = [
+            _WIKI_EXECUTOR.submit(search_wikipedia_api, term, lang)
+            for term in search_terms[:3]
+            for lang in ('ko', 'en')
+        ]
+        try:
+            for future in futures:
+                wiki_results = future.result()
+                if wiki_results.get("verified"):
+                    return wiki_results
+        finally:
+            # 이미 답을 찾았으면 아직 시작하지 않은 검색은 취소
+            for future in futures:
+                future.cancel()
+        
+        logger.warning("⚠️ 모든 Wikipedia 검색 실패")
         return {"verified": False, "error": "Wikipedia 검색 실패"}
         
     except Exception as e:
-        print(f"⚠️ Wikipedia 검증 오류: {e}")
+        logger.warning("⚠️ Wikipedia 검증 오류: %s", e)
         return {"verified": False, "error": f"Wikipedia 오류: {e}"}
 
 
 
 def extract_search_terms_from_question(question):
     """질문에서 검색 키워드 자동 추출 (범용적)"""
-    import re
     
-    keywords = []
+    # 1. 일반적인 명사 패턴 (하드코딩 없이) - 한 번 스캔해 유형별로 모음
+    terms_by_kind = {'korean': [], 'english': [], 'number': []}
+    for match in _SEARCH_TERM_RE.finditer(question):
+        terms_by_kind[match.lastgroup].append(match.group())
+    
+    # 2. 특수 패턴들 (범용적)
+    special_terms = [
+        match.group()
+        for noun in terms_by_kind['korean']
+        for match in _SPECIAL_TERM_RE.finditer(noun)
+    ]
     
-    # 1. 일반적인 명사 패턴 (하드코딩 없이)
-    # 한국어 명사 패턴 (2글자 이상)
-    korean_nouns = re.findall(r'[가-힣]{2,}', question)
-    keywords.extend(korean_nouns)
+    # 중복 제거 및 정리 (한글 명사 → 영어 고유명사 → 숫자 → 특수 패턴 순, 상위 3개만)
+    unique_keywords = []
+    for kw in chain(terms_by_kind['korean'], terms_by_kind['english'], terms_by_kind['number'], special_terms):
+        kw = kw.strip()
+        if len(kw) > 1 and kw not in _COMMON_QUESTION_WORDS and kw not in unique_keywords:
+            unique_keywords.append(kw)
+            if len(unique_keywords) == 3:
+                # 상위 3개 키워드만 반환 (너무 많으면 검색이 비효율적)
+                break
     
-    # 영어 대문자로 시작하는 단어들 (고유명사)
-    english_proper_nouns = re.findall(r'[A-Z][a-z]+(?:\s[A-Z][a-z]+)*', question)
-    keywords.extend(english_proper_nouns)
+    logger.debug("🔍 추출된 키워드: %s", unique_keywords)
+    return unique_keywords
+
+
+
+def _extract_founding_year(text):
+    """본문에서 설립 연도 추출: 위치가 가장 앞선 (유효 범위의) 설립/개교 연도, 없으면 가장 자주 언급된 연도"""
+    for match in _FOUNDING_YEAR_RE.finditer(text):
+        year = match.group('y1') or match.group('y2') or match.group('y3')
+        if _VALID_YEAR_RE.fullmatch(year):
+            return year
     
-    # 숫자와 함께 나오는 단어들 (연도, 수치 등)
-    number_words = re.findall(r'\d{4}년?|\d+명?|\d+개?', question)
-    keywords.extend(number_words)
+    # 동률이면 먼저 나온 연도
+    year_counts = {}
+    for match in _VALID_YEAR_RE.finditer(text):
+        year_counts[match.group(1)] = year_counts.get(match.group(1), 0) + 1
+    if year_counts:
+        return max(year_counts, key=year_counts.get)
+    return None
+
+
+def _wikipedia_cached(kind):
+    """(kind, lang, 검색어/페이지 제목) 단위로 Wikipedia 조회 결과를 Django cache에 저장하는 데코레이터
+
+    일시적인 오류가 나면 캐시하지 않고, 남아 있는 이전 성공 결과(stale)가 있으면 그것을 반환한다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(term, lang='ko', *args, **kwargs):
+            digest = hashlib.md5(term.encode('utf-8')).hexdigest()
+            cache_key = f"wiki_{kind}_{lang}_{digest}"
+            result = cache.get(cache_key)
+            if result is not None:
+                return result
+            
+            result = func(term, lang, *args, **kwargs)
+            if result.get("verified"):
+                cache.set(cache_key, result, WIKI_CACHE_TIMEOUT)
+                cache.set(f"{cache_key}_stale", result, WIKI_STALE_TIMEOUT)
+            elif str(result.get("error", "")).startswith(_WIKI_TRANSIENT_ERRORS):
+                stale = cache.get(f"{cache_key}_stale")
+                if stale is not None:
+                    logger.info("♻️ Wikipedia 오류로 이전 결과 사용: %s (%s)", term, lang)
+                    return stale
+            else:
+                cache.set(cache_key, result, WIKI_NEGATIVE_CACHE_TIMEOUT)
+            return result
+        return wrapper
+    return decorator
+
+
+def _build_wikipedia_info(extract, page_title, lang):
+    """Wikipedia 요약문에서 검증 정보 추출 (연도, 위치, 국립/사립)"""
+    extracted_info = {
+        "verified": True,
+        "source": f"Wikipedia ({lang})",
+        "abstract": extract[:400] + "..." if len(extract) > 400 else extract,
+        "full_text": extract,  # 전체 텍스트 저장
+        "confidence": 0.95,
+        "page_title": page_title
+    }
     
-    # 특수 패턴들 (범용적)
-    special_patterns = [
-        r'([가-힣]+대학교?)',  # 대학교
-        r'([가-힣]+대학?)',    # 대학
-        r'([가-힣]+회사?)',    # 회사
-        r'([가-힣]+정부?)',    # 정부
-        r'([가-힣]+사건?)',    # 사건
-        r'([가-힣]+전쟁?)',    # 전쟁
-        r'([가-힣]+혁명?)',    # 혁명
-        r'([가-힣]+올림픽?)',  # 올림픽
-    ]
+    # 연도 패턴 추출 (설립, 창립, 개교 등)
+    most_common_year = _extract_founding_year(extract)
+    if most_common_year:
+        extracted_info["extracted_year"] = most_common_year
+        logger.debug("📅 추출된 연도: %s년", most_common_year)
     
-    for pattern in special_patterns:
-        matches = re.findall(pattern, question)
-        keywords.extend(matches)
+    # 위치 정보 추출 (시, 도, 구 등)
+    for pattern in _LOCATION_RES:
+        location_matches = pattern.findall(extract)
+        if location_matches:
+            if isinstance(location_matches[0], tuple):
+                location = ' '.join(location_matches[0])
+            else:
+                location = location_matches[0]
+            extracted_info["location"] = location
+            logger.debug("📍 추출된 위치: %s", location)
+            break
     
-    # 중복 제거 및 정리
-    unique_keywords = []
-    for kw in keywords:
-        if kw and kw not in unique_keywords and len(kw.strip()) > 1:
-            # 너무 일반적인 단어들 제외
-            common_words = ['설명', '대해', '알려', '줘', '해줘', '어떤', '무엇', '언제', '어디', '왜', '어떻게']
-            if kw.strip() not in common_words:
-                unique_keywords.append(kw.strip())
+    # 국립/사립/공립 정보 추출
+    if '국립' in extract:
+        extracted_info["type"] = "국립"
+        logger.debug("🏛️ 유형: 국립")
+    elif '사립' in extract:
+        extracted_info["type"] = "사립"
+        logger.debug("🏛️ 유형: 사립")
     
-    # 상위 3개 키워드만 반환 (너무 많으면 검색이 비효율적)
-    print(f"🔍 추출된 키워드: {unique_keywords[:3]}")
-    return unique_keywords[:3]
+    return extracted_info
+
+
+@_wikipedia_cached('titles')
+def search_wikipedia_titles(titles, lang='ko'):
+    """여러 검색어를 문서 제목으로 보고 한 번의 MediaWiki query 요청으로 요약문 조회
 
+    titles는 '|'로 이은 문자열 (캐시 키로 그대로 사용). 검색어 순서대로 처음 찾은 문서의 정보를 반환한다
+    """
+    try:
+        response = _HTTP.get(f"https://{lang}.wikipedia.org/w/api.php", params={
+            'action': 'query',
+            'prop': 'extracts|pageprops',
+            'ppprop': 'disambiguation',
+            'exintro': 1,
+            'explaintext': 1,
+            'redirects': 1,
+            'titles': titles,
+            'format': 'json',
+            'formatversion': 2
+        }, timeout=5)
+        
+        if response.status_code != 200:
+            return {"verified": False, "error": f"검색 실패: {response.status_code}"}
+        
+        query = response.json().get('query', {})
+        # 검색어 -> (정규화/넘겨주기 후) 실제 문서 제목
+        normalized = {item['from']: item['to'] for item in query.get('normalized', [])}
+        redirects = {item['from']: item['to'] for item in query.get('redirects', [])}
+        pages = {
+            page['title']: page for page in query.get('pages', [])
+            if not page.get('missing') and 'disambiguation' not in page.get('pageprops', {})
+        }
+        
+        for term in titles.split('|'):
+            page_title = normalized.get(term, term)
+            page_title = redirects.get(page_title, page_title)
+            extract = pages.get(page_title, {}).get('extract', '')
+            if extract and len(extract) > 20:
+                logger.debug("📄 Wikipedia 문서 제목 일치: %s -> %s", term, page_title)
+                return _build_wikipedia_info(extract, page_title, lang)
+        
+        return {"verified": False, "error": "페이지 없음"}
+        
+    except Exception as e:
+        return {"verified": False, "error": f"API 오류: {e}"}
 
 
+@_wikipedia_cached('search')
 def search_wikipedia_api(search_term, lang='ko'):
     """Wikipedia API 실제 검색"""
-    import requests
-    import re
-    from collections import Counter
     
     try:
-        # User-Agent 헤더 추가 (Wikipedia API 요구사항)
-        headers = {
-            'User-Agent': 'AI_of_AI_ChatBot/1.0 (Educational Project)'
-        }
-        
         # Wikipedia Search API로 페이지 찾기
         search_url = f"https://{lang}.wikipedia.org/w/api.php"
         search_params = {
@@ -150,7 +318,7 @@ def search_wikipedia_api(search_term, lang='ko'):
             'format': 'json'
         }
         
-        response = requests.get(search_url, params=search_params, headers=headers, timeout=5)
+        response = _HTTP.get(search_url, params=search_params, timeout=5)
         
         if response.status_code != 200:
             return {"verified": False, "error": f"검색 실패: {response.status_code}"}
@@ -158,100 +326,33 @@ def search_wikipedia_api(search_term, lang='ko'):
         search_results = response.json()
         
         if not search_results or len(search_results) < 2 or not search_results[1]:
-            print(f"⚠️ '{search_term}' Wikipedia 페이지 없음")
+            logger.debug("⚠️ '%s' Wikipedia 페이지 없음", search_term)
             return {"verified": False, "error": "페이지 없음"}
         
         page_title = search_results[1][0]
-        print(f"📄 Wikipedia 페이지 발견: {page_title}")
+        logger.debug("📄 Wikipedia 페이지 발견: %s", page_title)
         
         # 페이지 요약 가져오기
         summary_url = f"https://{lang}.wikipedia.org/api/rest_v1/page/summary/{page_title}"
-        summary_response = requests.get(summary_url, headers=headers, timeout=5)
+        summary_response = _HTTP.get(summary_url, timeout=5)
         
         if summary_response.status_code == 200:
             data = summary_response.json()
             extract = data.get('extract', '')
             
             if extract and len(extract) > 20:
-                print(f"✅ Wikipedia 요약: {extract[:100]}...")
+                logger.debug("✅ Wikipedia 요약: %s...", extract[:100])
                 
                 # 모든 정보 추출 (연도, 위치, 기타 정보)
-                extracted_info = {
-                    "verified": True,
-                    "source": f"Wikipedia ({lang})",
-                    "abstract": extract[:400] + "..." if len(extract) > 400 else extract,
-                    "full_text": extract,  # 전체 텍스트 저장
-                    "confidence": 0.95,
-                    "page_title": page_title
-                }
-                
-                # 연도 패턴 추출 (설립, 창립, 개교 등)
-                years = re.findall(r'(\d{4})', extract)
-                valid_years = [year for year in years if 1900 <= int(year) <= 2024]
-                
-                if valid_years:
-                    # 설립/개교 관련 연도 우선 추출
-                    founding_patterns = [
-                        r'(\d{4})년[^\d]*(?:설립|창립|개교|대학.*설립|대학교.*설립|설립.*대학)',
-                        r'(?:설립|창립|개교)[^\d]*(\d{4})년',
-                        r'(\d{4})년.*(?:출범|탄생|생성)'
-                    ]
-                    
-                    # 각 패턴에서 가장 먼저 매치되는 연도 찾기 (위치 기준)
-                    first_matches = []
-                    for pattern in founding_patterns:
-                        match = re.search(pattern, extract, re.IGNORECASE)
-                        if match:
-                            matched_year = match.group(1)
-                            if matched_year in valid_years:
-                                position = match.start()
-                                first_matches.append((position, matched_year))
-                    
-                    if first_matches:
-                        # 위치가 가장 앞선 연도 선택
-                        first_matches.sort()
-                        most_common_year = first_matches[0][1]
-                    else:
-                        # 설립 연도 패턴이 없으면 가장 자주 언급된 연도
-                        year_counts = Counter(valid_years)
-                        most_common_year = year_counts.most_common(1)[0][0]
-                    
-                    extracted_info["extracted_year"] = most_common_year
-                    print(f"📅 추출된 연도: {most_common_year}년")
-                
-                # 위치 정보 추출 (시, 도, 구 등)
-                location_patterns = [
-                    r'([가-힣]+특별시|[가-힣]+광역시|[가-힣]+시)\s+([가-힣]+구|[가-힣]+군)',
-                    r'([가-힣]+특별시|[가-힣]+광역시|[가-힣]+시)',
-                    r'([가-힣]+도)\s+([가-힣]+시)',
-                ]
-                
-                for pattern in location_patterns:
-                    location_matches = re.findall(pattern, extract)
-                    if location_matches:
-                        if isinstance(location_matches[0], tuple):
-                            location = ' '.join(location_matches[0])
-                        else:
-                            location = location_matches[0]
-                        extracted_info["location"] = location
-                        print(f"📍 추출된 위치: {location}")
-                        break
-                
-                # 국립/사립/공립 정보 추출
-                if '국립' in extract:
-                    extracted_info["type"] = "국립"
-                    print(f"🏛️ 유형: 국립")
-                elif '사립' in extract:
-                    extracted_info["type"] = "사립"
-                    print(f"🏛️ 유형: 사립")
+                extracted_info = _build_wikipedia_info(extract, page_title, lang)
                 
                 # 연도가 없으면 본문에서 추가 검색
                 if not extracted_info.get("extracted_year"):
-                    print("⚠️ 요약에 연도 없음, 본문 API로 fallback...")
-                    full_text_result = get_wikipedia_full_text(page_title, lang, headers)
+                    logger.debug("⚠️ 요약에 연도 없음, 본문 API로 fallback...")
+                    full_text_result = get_wikipedia_full_text(page_title, lang)
                     if full_text_result.get("verified") and full_text_result.get("extracted_year"):
                         extracted_info["extracted_year"] = full_text_result["extracted_year"]
-                        print(f"📅 본문에서 추출된 설립연도: {full_text_result['extracted_year']}년")
+                        logger.debug("📅 본문에서 추출된 설립연도: %s년", full_text_result['extracted_year'])
                 
                 return extracted_info
         
@@ -262,11 +363,9 @@ def search_wikipedia_api(search_term, lang='ko'):
 
 
 
-def get_wikipedia_full_text(page_title, lang, headers):
+@_wikipedia_cached('fulltext')
+def get_wikipedia_full_text(page_title, lang, headers=None):
     """Wikipedia 본문에서 연도 정보 추출"""
-    import requests
-    import re
-    from collections import Counter
     
     try:
         # Wikipedia Parse API로 본문 일부 가져오기
@@ -280,7 +379,7 @@ def get_wikipedia_full_text(page_title, lang, headers):
             'format': 'json'
         }
         
-        response = requests.get(parse_url, params=parse_params, headers=headers, timeout=5)
+        response = _HTTP.get(parse_url, params=parse_params, headers=headers, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -291,38 +390,11 @@ def get_wikipedia_full_text(page_title, lang, headers):
                 full_text = page.get('extract', '')
                 
                 if full_text and len(full_text) > 50:
-                    print(f"📄 Wikipedia 본문: {full_text[:150]}...")
-                    
-                    # 연도 패턴 추출 (설립/개교 관련 연도 우선)
-                    years = re.findall(r'(\d{4})', full_text)
-                    valid_years = [year for year in years if 1900 <= int(year) <= 2024]
+                    logger.debug("📄 Wikipedia 본문: %s...", full_text[:150])
                     
-                    if valid_years:
-                        # 설립/개교 키워드가 있는 문장에서 연도 우선 추출
-                        founding_patterns = [
-                            r'(\d{4})년[^\d]*(?:설립|창립|개교|대학.*설립|대학교.*설립|설립.*대학)',
-                            r'(?:설립|창립|개교)[^\d]*(\d{4})년',
-                            r'(\d{4})년.*(?:출범|탄생|생성)'
-                        ]
-                        # 각 패턴에서 가장 먼저 매치되는 연도 찾기 (위치 기준)
-                        first_matches = []
-                        for pattern in founding_patterns:
-                            match = re.search(pattern, full_text, re.IGNORECASE)
-                            if match:
-                                matched_year = match.group(1)
-                                if matched_year in valid_years:
-                                    position = match.start()
-                                    first_matches.append((position, matched_year))
-                        
-                        if first_matches:
-                            # 위치가 가장 앞선 연도 선택 (원래 설립 연도 우선)
-                            first_matches.sort()  # 위치 순으로 정렬
-                            most_common_year = first_matches[0][1]
-                        else:
-                            # 없으면 가장 자주 언급된 연도 선택
-                            year_counts = Counter(valid_years)
-                            most_common_year = year_counts.most_common(1)[0][0]
-                        
+                    # 설립/개교 관련 연도 우선 추출
+                    most_common_year = _extract_founding_year(full_text)
+                    if most_common_year:
                         return {
                             "verified": True,
                             "source": f"Wikipedia Full Text ({lang})",
@@ -0,0 +1,45 @@
+from unittest import SkipTest, skipUnless
+
+from django.test import SimpleTestCase
+
+from .llm_cache_manager import SENTENCE_TRANSFORMERS_AVAILABLE, SemanticResponseCache
+from .utils.error_handlers import get_user_friendly_error_message
+
+
+@skipUnless(SENTENCE_TRANSFORMERS_AVAILABLE, "sentence-transformers 미설치")
+class SemanticResponseCacheTests(SimpleTestCase):
+    """의미 캐시가 서로 다른 한국어 질문을 같은 질문으로 보지 않는지 확인"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.cache = SemanticResponseCache(enabled=True)
+        if not cls.cache.available or cls.cache._get_model() is None:
+            raise SkipTest("임베딩 모델을 불러올 수 없음")
+
+    def setUp(self):
+        self.cache.clear()
+
+    def test_different_korean_questions_do_not_collide(self):
+        self.cache.insert("test", "서울의 인구는 몇 명인가요?", "약 940만 명입니다.")
+        self.assertIsNone(self.cache.lookup("test", "부산의 면적은 얼마인가요?"))
+        self.assertIsNone(self.cache.lookup("test", "충북대학교는 언제 설립되었나요?"))
+
+    def test_same_question_hits(self):
+        self.cache.insert("test", "서울의 인구는 몇 명인가요?", "약 940만 명입니다.")
+        self.assertEqual(self.cache.lookup("test", "서울의  인구는 몇 명인가요? "), "약 940만 명입니다.")
+
+    def test_disabled_cache_is_unavailable(self):
+        self.assertFalse(SemanticResponseCache(enabled=False).available)
+
+
+class UserFriendlyErrorMessageTests(SimpleTestCase):
+    """JSON payload 형태의 오류 메시지 분류"""
+
+    def test_string_error_payload(self):
+        message = get_user_friendly_error_message(Exception('{"error": "quota"}'))
+        self.assertIn("사용량", message)
+
+    def test_non_dict_error_payload_falls_back(self):
+        message = get_user_friendly_error_message(Exception('{"error": 5}'))
+        self.assertEqual(message, "오류가 발생했습니다. 잠시 후 다시 시도해 주세요.")
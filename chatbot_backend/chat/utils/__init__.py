@@ -3,14 +3,20 @@ from .file_utils import (
     extract_text_from_pdf,
     extract_text_from_pdf_ocr,
     extract_text_from_image,
+    ocr_image,
     process_uploaded_file,
+    process_uploaded_files,
     summarize_content,
+    asummarize_content,
     analyze_image_with_ollama
 )
 from .ai_utils import (
     enforce_korean_instruction,
     get_openai_completion_limit,
+    ollama_chat_async,
+    ollama_chat_content,
     generate_optimal_response_with_ollama,
+    agenerate_optimal_response_with_ollama,
     generate_optimal_response
 )
 from .chatbot import ChatBot
@@ -21,14 +27,20 @@ __all__ = [
     'extract_text_from_pdf',
     'extract_text_from_pdf_ocr',
     'extract_text_from_image',
+    'ocr_image',
     'process_uploaded_file',
+    'process_uploaded_files',
     'summarize_content',
+    'asummarize_content',
     'analyze_image_with_ollama',
     
     # AI utils
     'enforce_korean_instruction',
     'get_openai_completion_limit',
+    'ollama_chat_async',
+    'ollama_chat_content',
     'generate_optimal_response_with_ollama',
+    'agenerate_optimal_response_with_ollama',
     'generate_optimal_response',
     
     # ChatBot
@@ -1,13 +1,28 @@
 """
 AI 관련 유틸리티 함수들
 """
+import atexit
+import asyncio
+import threading
 import openai
 import ollama
+from asgiref.sync import async_to_sync
 from ..config.ai_config import (
     KOREAN_LANGUAGE_INSTRUCTION,
     OPENAI_MODEL_COMPLETION_LIMITS,
-    DEFAULT_OPENAI_COMPLETION_LIMIT
+    DEFAULT_OPENAI_COMPLETION_LIMIT,
+    OLLAMA_NUM_PARALLEL
 )
+from ..llm_cache_manager import llm_cache_manager
+
+# 비동기 호출을 실행할 프로세스 공용 이벤트 루프 (데몬 스레드에서 계속 실행)
+# async_to_sync는 호출마다 루프를 새로 만들므로 루프에 묶이는 클라이언트/커넥션은 이 루프에서만 만들고 재사용
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+# Ollama AsyncClient와 동시 요청 제한 Semaphore (공용 백그라운드 루프에서만 생성/사용)
+_ollama_client = None
+_ollama_semaphore = None
 
 
 def enforce_korean_instruction(text: str) -> str:
@@ -30,20 +45,74 @@ def get_openai_completion_limit(model_name: str) -> int:
     return DEFAULT_OPENAI_COMPLETION_LIMIT
 
 
+def get_background_loop():
+    """프로세스 공용 이벤트 루프 반환 (처음 사용할 때 데몬 스레드에서 시작)"""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="ai-background-loop", daemon=True).start()
+                atexit.register(loop.call_soon_threadsafe, loop.stop)
+                _background_loop = loop
+    return _background_loop
+
+
+async def _ollama_chat_on_background_loop(**kwargs):
+    """공용 백그라운드 루프에서 하나의 AsyncClient로 요청 (동시 요청은 OLLAMA_NUM_PARALLEL개로 제한)"""
+    global _ollama_client, _ollama_semaphore
+    if _ollama_client is None:
+        _ollama_client = ollama.AsyncClient()
+        _ollama_semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+    async with _ollama_semaphore:
+        return await _ollama_client.chat(**kwargs)
+
+
+async def ollama_chat_async(**kwargs):
+    """ollama.chat의 비동기 버전
+
+    async_to_sync 호출마다 루프가 새로 만들어지므로 클라이언트를 루프마다 두면 연결이 닫히지 않고 쌓인다.
+    요청은 항상 공용 백그라운드 루프로 넘겨 클라이언트와 연결 풀을 하나만 유지한다.
+    """
+    background_loop = get_background_loop()
+    if asyncio.get_running_loop() is background_loop:
+        return await _ollama_chat_on_background_loop(**kwargs)
+    return await asyncio.wrap_future(
+        asyncio.run_coroutine_threadsafe(_ollama_chat_on_background_loop(**kwargs), background_loop)
+    )
+
+
+async def ollama_chat_content(model, messages, options=None):
+    """Ollama 응답 본문 반환 (완전히 같은 요청은 LLM 캐시에서 바로 반환)"""
+    cache_key = llm_cache_manager.get_generation_key(f"ollama:{model}", messages, options)
+    cached_content = await llm_cache_manager.aget_generation(cache_key)
+    if cached_content is not None:
+        return cached_content
+    
+    response = await ollama_chat_async(model=model, messages=messages, options=options)
+    content = response['message']['content']
+    await llm_cache_manager.astore_generation(cache_key, content)
+    return content
+
+
 def generate_optimal_response_with_ollama(ai_responses, user_question):
     """Ollama를 사용하여 최적의 답변 생성 (비용 절약 + 품질 향상)"""
+    return async_to_sync(agenerate_optimal_response_with_ollama)(ai_responses, user_question)
+
+
+async def agenerate_optimal_response_with_ollama(ai_responses, user_question):
+    """generate_optimal_response_with_ollama의 비동기 버전 (다른 Ollama 작업과 동시에 실행 가능)"""
     try:
-        # AI 응답들을 정리
-        responses_text = ""
-        model_names = []
-        for model_name, response in ai_responses.items():
-            responses_text += f"### {model_name.upper()}:\n{response}\n\n"
-            model_names.append(model_name.upper())
+        # AI 응답들을 정리 (긴 응답을 +=로 이어 붙이며 매번 복사하지 않도록 한 번에 join)
+        model_names = [model_name.upper() for model_name in ai_responses]
+        responses_text = "".join(
+            f"### {name}:\n{response}\n\n" for name, response in zip(model_names, ai_responses.values())
+        )
         
         # AI 분석 섹션 생성
-        analysis_sections = ""
-        for name in model_names:
-            analysis_sections += f"### {name}\n- 장점: [주요 장점]\n- 단점: [주요 단점]\n- 특징: [특별한 특징]\n"
+        analysis_sections = "".join(
+            f"### {name}\n- 장점: [주요 장점]\n- 단점: [주요 단점]\n- 특징: [특별한 특징]\n" for name in model_names
+        )
         
         # 비용 절약을 위한 간소화된 프롬프트
         prompt = f"""AI 응답을 분석하여 최적의 통합 답변을 제공해주세요.
@@ -69,8 +138,8 @@ AI 답변들:
 
 ⚠️ 지시사항: 질문 언어나 내용에 상관없이 최종 통합 답변과 모든 설명은 반드시 자연스럽고 유창한 한국어로 작성하세요."""
         
-        response = ollama.chat(
-                   model='llama3.2:latest',
+        return await ollama_chat_content(
+            model='llama3.2:latest',
             messages=[
                 {
                     'role': 'user',
@@ -82,8 +151,6 @@ AI 답변들:
                 'num_predict': 2500
             }
         )
-        
-        return response['message']['content']
     except Exception as e:
         return f"Ollama 최적 답변 생성 중 오류가 발생했습니다: {str(e)}"
 
@@ -98,21 +165,18 @@ def generate_optimal_response(ai_responses, user_question, api_key=None):
         client = openai.OpenAI(api_key=api_key)
         
         # AI 응답들을 정리
-        responses_text = ""
-        model_names = []
-        for model_name, response in ai_responses.items():
-            responses_text += f"### {model_name.upper()}:\n{response}\n\n"
-            model_names.append(model_name.upper())
+        model_names = [model_name.upper() for model_name in ai_responses]
+        responses_text = "".join(
+            f"### {name}:\n{response}\n\n" for name, response in zip(model_names, ai_responses.values())
+        )
         
         # 모델별 분석 섹션 동적 생성
-        analysis_sections = ""
-        for model_name in model_names:
-            analysis_sections += f"""
+        analysis_sections = "".join(f"""
 ### {model_name}
 - 장점: [주요 장점]
 - 단점: [주요 단점]
 - 특징: [특별한 특징]
-"""
+""" for model_name in model_names)
         
         system_prompt = f"""당신은 AI 응답 분석 및 최적화 전문가입니다. 여러 AI의 답변을 분석하여 가장 완전하고 정확한 통합 답변을 제공해야 합니다.
 
@@ -136,17 +200,27 @@ def generate_optimal_response(ai_responses, user_question, api_key=None):
 
         user_prompt = f"질문: {user_question}\n\n다음은 여러 AI의 답변입니다:\n\n{responses_text}\n위 답변들을 분석하여 최적의 통합 답변을 제공해주세요.\n\n⚠️ 지시사항: 질문 언어나 내용에 상관없이 반드시 자연스럽고 유창한 한국어로 작성하세요."
 
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        cache_key = llm_cache_manager.get_generation_key(
+            "openai:gpt-3.5-turbo", messages, {"temperature": 0.7, "max_tokens": 2500}
+        )
+        cached_content = llm_cache_manager.get_generation(cache_key)
+        if cached_content is not None:
+            return cached_content
+        
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+            messages=messages,
             temperature=0.7,
             max_tokens=2500
         )
         
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        llm_cache_manager.store_generation(cache_key, content)
+        return content
     except Exception as e:
         return f"최적화된 답변 생성 중 오류가 발생했습니다: {str(e)}"
 
@@ -2,22 +2,267 @@
 ChatBot 클래스 및 모델 초기화
 """
 import os
-import uuid
+import copy
+import json
+import secrets
+import atexit
+import logging
+import importlib.util
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
+import httpx
 import openai
 import anthropic
+import groq
 from groq import Groq
 import ollama
 import google.generativeai as genai
+from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # 로컬 import
 from ..utils.ai_utils import enforce_korean_instruction, get_openai_completion_limit
 from ..utils.error_handlers import get_user_friendly_error_message
+from ..utils.file_utils import summarize_conversation
 from ..services.optimal_response import detect_question_type_from_content
+from ..llm_cache_manager import llm_cache_manager, semantic_response_cache
+
+
+logger = logging.getLogger(__name__)
+
+# 제공자 SDK 클라이언트 공유 (API 유형, API 키) -> 클라이언트
+# 클라이언트마다 커넥션 풀/TLS 컨텍스트를 가지므로 모델별로 새로 만들지 않고 재사용
+_provider_clients = {}
+_provider_clients_lock = threading.Lock()
+_gemini_configured_key = None
+
+# HyperCLOVA X 호출용 공유 HTTP 클라이언트 (keep-alive 커넥션 재사용, h2 설치 시 HTTP/2 다중화)
+_clova_client = None
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 대화 이력 슬라이딩 윈도우: system prompt를 뺀 메시지가 HISTORY_MAX_MESSAGES를 넘거나
+# 추정 토큰 수(글자 수 // 4)가 HISTORY_MAX_TOKENS를 넘으면
+# 최근 HISTORY_KEEP_MESSAGES개만 남기고 나머지는 요약 메시지 하나로 압축
+# (짧은 잡담은 HISTORY_SUMMARY_MIN_TOKENS 이하면 메시지 수가 많아도 요약 호출을 하지 않음)
+HISTORY_MAX_MESSAGES = 12
+HISTORY_KEEP_MESSAGES = 6
+HISTORY_MAX_TOKENS = 6000
+HISTORY_SUMMARY_MIN_TOKENS = 800
+HISTORY_SUMMARY_PREFIX = "이전 대화 요약: "
+
+# 대화 이력 요약(LLM 호출)은 응답 경로 밖에서 실행하고 결과는 다음 턴 시작 시 반영
+_HISTORY_SUMMARY_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="history-summary")
+
+# 의미 캐시는 짧은 텍스트 질문에만 사용 (긴 문서 내용은 임베딩 앞부분만 비슷해도 히트할 수 있음)
+SEMANTIC_CACHE_MAX_QUESTION_CHARS = 500
+
+# 제공자별 샘플링 temperature (응답 캐시 키에도 포함)
+PROVIDER_TEMPERATURES = {
+    'openai': 0.7,
+    'anthropic': 0.7,
+    'groq': 0.7,
+    'gemini': 0.9,
+    'clova': 0.5,
+}
+
+# Gemini 안전 필터 완전 비활성화 (BLOCK_NONE) 및 생성 설정 (요청마다 새로 만들지 않음)
+_GEMINI_SAFETY_SETTINGS = [
+    {
+        "category": HarmCategory.HARM_CATEGORY_HARASSMENT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+        "threshold": HarmBlockThreshold.BLOCK_NONE
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE
+    }
+]
+_GEMINI_GEN_CONFIG = genai.types.GenerationConfig(
+    temperature=PROVIDER_TEMPERATURES['gemini'],
+    max_output_tokens=4096,
+    top_p=0.95,
+    top_k=40,
+)
+# 안전 필터로 막혔을 때 원본 질문으로 재시도할 때의 설정
+_GEMINI_RETRY_GEN_CONFIG = genai.types.GenerationConfig(
+    temperature=PROVIDER_TEMPERATURES['gemini'],
+    max_output_tokens=4096,
+)
+
+
+def _http2_client_kwargs(sdk):
+    """SDK 기본 설정(timeout, limits 등)을 유지한 HTTP/2 httpx 클라이언트 인자 (h2 미설치 시 빈 dict)"""
+    if not HTTP2_AVAILABLE:
+        return {}
+    return {'http_client': sdk.DefaultHttpxClient(http2=True)}
+
+
+def _get_provider_client(api_type, api_key):
+    """(API 유형, API 키)별로 한 번만 생성한 SDK 클라이언트 반환"""
+    global _gemini_configured_key
+    cache_key = (api_type, api_key)
+    client = _provider_clients.get(cache_key)
+    if client is not None:
+        return client
+    
+    with _provider_clients_lock:
+        client = _provider_clients.get(cache_key)
+        if client is None:
+            # h2가 있으면 같은 제공자의 동시 호출(최적 답변 모드의 여러 모델)이 커넥션 하나에 다중화되도록 HTTP/2 사용
+            if api_type == 'openai':
+                client = openai.OpenAI(api_key=api_key, **_http2_client_kwargs(openai))
+            elif api_type == 'anthropic':
+                client = anthropic.Client(api_key=api_key, **_http2_client_kwargs(anthropic))
+            elif api_type == 'groq':
+                client = Groq(api_key=api_key, **_http2_client_kwargs(groq))
+            elif api_type == 'gemini':
+                # genai는 전역 설정이므로 키가 바뀔 때만 다시 configure
+                if _gemini_configured_key != api_key:
+                    genai.configure(api_key=api_key)
+                    _gemini_configured_key = api_key
+                client = genai
+            else:
+                return None
+            _provider_clients[cache_key] = client
+    return client
+
+
+def _get_clova_client():
+    """HyperCLOVA X용 httpx.Client (프로세스당 하나, 종료 시 커넥션 정리)"""
+    global _clova_client
+    if _clova_client is None:
+        with _provider_clients_lock:
+            if _clova_client is None:
+                client = httpx.Client(
+                    http2=HTTP2_AVAILABLE,
+                    timeout=30,
+                    limits=httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=60),
+                )
+                atexit.register(client.close)
+                _clova_client = client
+    return _clova_client
+
+
+def _clova_dumps(payload):
+    """HyperCLOVA X 요청 본문 직렬화 (orjson이 있으면 bytes로 바로 인코딩)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def _clova_loads(data):
+    """HyperCLOVA X 응답 본문/SSE data 파싱"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# === 질문 유형 + API 유형별 system prompt ===
+# 첫 메시지마다 if/elif로 문자열을 만들지 않도록 import 시점에 한 번만 조립
+
+_PERSONA_NAMES = {
+    'openai': 'GPT',
+    'anthropic': 'Claude',
+    'gemini': 'Gemini',
+    'groq': 'Mixtral',
+}
+
+# GPT 응답은 프론트엔드에서 마크다운으로 렌더링하므로 코드 블록 형식 지시를 덧붙임
+_CODE_BLOCK_FORMAT_NOTE = """
+
+IMPORTANT: When providing code examples, ALWAYS format them using markdown code blocks:
+- Python code: Use ```python ... ```
+- JavaScript code: Use ```javascript ... ```
+- Other code: Use ```language ... ```
+- Inline code: Use `code`
+
+Always wrap code in proper markdown code blocks so it can be properly rendered."""
+
+_PERSONA_PROMPT_TEMPLATES = {
+    'code': "You are {name}, a programming assistant that helps with code in Korean. Provide complete, working code examples when the user asks for code. Only provide code when explicitly requested.",
+    'image': "You are {name}, an AI assistant that can analyze images and respond in Korean. When you receive image analysis results from other AI systems (like Ollama), you should treat them as if you analyzed the image yourself and provide detailed, natural descriptions in Korean. Make the descriptions rich, engaging, and easy to understand while maintaining the accuracy of the original analysis.",
+    'document': "You are {name}, an AI assistant that analyzes documents and responds in Korean. Provide accurate summaries and analysis of document content. Only analyze documents when the user explicitly asks for document analysis.",
+    'creative': "You are {name}, a creative writing assistant that helps with writing in Korean. Provide creative, engaging, and well-written content when the user asks for creative writing. Only provide creative writing when explicitly requested.",
+    'general': "You are {name}, an AI assistant that responds in Korean. Provide helpful, accurate, and detailed responses to user questions. Do not provide code unless explicitly asked.",
+}
+
+# GPT 코드 질문은 전용 문구 사용 (형식 지시 뒤에 코드 제공 조건 추가)
+_OPENAI_CODE_PROMPT = (
+    "You are GPT, a programming assistant that helps with code in Korean. When the user asks for code, provide complete, working code examples with proper formatting."
+    + _CODE_BLOCK_FORMAT_NOTE
+    + "\nOnly provide code when the user explicitly asks for code or programming help."
+)
+
+_CLOVA_PROMPTS = {
+    'code': "당신은 Clova X, 프로그래밍 도우미입니다. 사용자가 코드를 요청할 때만 코드를 제공하고, 코드가 아닌 일반 질문에는 코드 없이 답변해주세요.",
+    'image': "당신은 Clova X, 한국어에 특화된 AI 어시스턴트입니다. 다른 AI 시스템(Ollama 등)의 이미지 분석 결과를 받으면 직접 분석한 것처럼 자연스럽고 상세하게 한국어로 설명해주세요.",
+    'document': "당신은 Clova X, 문서 분석 어시스턴트입니다. 사용자가 문서 분석을 요청할 때만 문서를 분석하고, 일반 질문에는 일반적인 답변을 제공해주세요.",
+    'creative': "당신은 Clova X, 창작 도우미입니다. 사용자가 글쓰기나 창작을 요청할 때만 창작 내용을 제공하고, 일반 질문에는 일반적인 답변을 제공해주세요.",
+    'general': "당신은 Clova X, 한국어에 특화된 AI 어시스턴트입니다. 사용자의 질문에 정확하고 상세하게 한국어로 답변해주세요. 코드는 요청받을 때만 제공해주세요.",
+}
+
+# 알 수 없는 API 유형용 기본 프롬프트
+_DEFAULT_PROMPTS = {
+    'code': "You are a programming assistant that helps with code in Korean. Only provide code when the user explicitly asks for code.",
+    'image': "You are an AI assistant that can analyze images and respond in Korean. When you receive image analysis results from other AI systems (like Ollama), you should treat them as if you analyzed the image yourself and provide detailed, natural descriptions in Korean.",
+    'document': "You are an AI assistant that analyzes documents and responds in Korean. Only analyze documents when the user explicitly asks for document analysis.",
+    'creative': "You are a creative writing assistant that helps with writing in Korean. Only provide creative writing when the user explicitly asks for it.",
+    'general': "You are an AI assistant that responds in Korean. Provide helpful, accurate, and detailed responses to user questions. Do not provide code unless explicitly asked.",
+}
+
+
+def _build_system_prompts():
+    """(질문 유형, API 유형) -> 한국어 응답 지시가 포함된 system prompt 표 생성"""
+    prompts = {}
+    for prompt_type, template in _PERSONA_PROMPT_TEMPLATES.items():
+        for api_type, name in _PERSONA_NAMES.items():
+            content = template.format(name=name)
+            if api_type == 'openai':
+                content = _OPENAI_CODE_PROMPT if prompt_type == 'code' else content + _CODE_BLOCK_FORMAT_NOTE
+            prompts[(prompt_type, api_type)] = enforce_korean_instruction(content)
+        prompts[(prompt_type, 'clova')] = enforce_korean_instruction(_CLOVA_PROMPTS[prompt_type])
+        prompts[(prompt_type, None)] = enforce_korean_instruction(_DEFAULT_PROMPTS[prompt_type])
+    return prompts
+
+
+SYSTEM_PROMPTS = _build_system_prompts()
+
+
+def get_system_prompt(question_type, api_type, has_image=False):
+    """질문 유형/API 유형에 맞는 system prompt (코드 질문 > 이미지 > 문서 > 창작 > 일반 순)"""
+    if question_type == 'code':
+        prompt_type = 'code'
+    elif question_type == 'image' or has_image:
+        prompt_type = 'image'
+    elif question_type in ('document', 'creative'):
+        prompt_type = question_type
+    else:
+        prompt_type = 'general'
+    return SYSTEM_PROMPTS.get((prompt_type, api_type)) or SYSTEM_PROMPTS[(prompt_type, None)]
 
 
 class ChatBot:
     def __init__(self, api_key, model, api_type):
         self.conversation_history = []
+        self._pending_summary = None  # (요약 Future, 요약 대상 줄 목록)
         self.model = model
         self.api_type = api_type
         self.api_key = api_key  # api_key 속성 추가
@@ -26,238 +271,105 @@ class ChatBot:
         if not api_key:
             raise ValueError(f"{api_type.upper()} API 키가 설정되지 않았습니다.")
         
-        if api_type == 'openai':
-            self.client = openai.OpenAI(api_key=api_key)
-        elif api_type == 'anthropic':
-            self.client = anthropic.Client(api_key=api_key)
-        elif api_type == 'groq':
-            self.client = Groq(api_key=api_key)
+        if api_type in ('openai', 'anthropic', 'groq'):
+            self.client = _get_provider_client(api_type, api_key)
         elif api_type == 'gemini':
-            genai.configure(api_key=api_key)
+            _get_provider_client(api_type, api_key)
             self.client = genai.GenerativeModel(model)
         elif api_type == 'clova':
             # HyperCLOVA X Studio API 방식
-            self.client = None  # HTTP 요청으로 처리
+            self.client = None  # HTTP 요청으로 처리 (공유 세션 사용)
             self.hyperclova_api_key = os.getenv('HYPERCLOVA_API_KEY', '')
             self.hyperclova_apigw_key = os.getenv('HYPERCLOVA_APIGW_KEY', '')  # 선택사항
     
-    def chat(self, user_input, has_image=False, question_type=None):
+    async def achat(self, user_input, has_image=False, question_type=None, cacheable=False):
+        """chat()의 비동기 버전 (블로킹 SDK 호출을 워커 스레드에서 실행해 여러 모델 호출이 겹치도록 함)"""
+        return await asyncio.to_thread(self.chat, user_input, has_image, question_type, cacheable)
+    
+    def chat(self, user_input, has_image=False, question_type=None, cacheable=False):
+        """사용자 입력에 대한 응답 생성
+
+        cacheable=True이거나 temperature가 0 이하이면 (API 유형, 모델, 대화 이력, temperature)가
+        완전히 같은 이전 응답을 캐시에서 재사용한다
+        """
         try:
-            # 질문 유형 자동 감지 (지정되지 않은 경우)
-            if question_type is None:
-                question_type = detect_question_type_from_content(user_input)
+            self._start_turn(user_input, has_image, question_type)
             
-            # 대화 시작 시 시스템 메시지 추가 (질문 내용에 따라 적절한 프롬프트 사용)
-            if not self.conversation_history:
-                # 질문 유형에 따라 적절한 system message 생성
-                if question_type == 'code':
-                    # 코드 작성 질문인 경우에만 코드 작성 관련 프롬프트
-                    if self.api_type == 'openai':
-                        system_content = """You are GPT, a programming assistant that helps with code in Korean. When the user asks for code, provide complete, working code examples with proper formatting.
-
-IMPORTANT: When providing code examples, ALWAYS format them using markdown code blocks:
-- Python code: Use ```python ... ```
-- JavaScript code: Use ```javascript ... ```
-- Other code: Use ```language ... ```
-- Inline code: Use `code`
-
-Always wrap code in proper markdown code blocks so it can be properly rendered.
-Only provide code when the user explicitly asks for code or programming help."""
-                    elif self.api_type == 'anthropic':
-                        system_content = "You are Claude, a programming assistant that helps with code in Korean. Provide complete, working code examples when the user asks for code. Only provide code when explicitly requested."
-                    elif self.api_type == 'gemini':
-                        system_content = "You are Gemini, a programming assistant that helps with code in Korean. Provide complete, working code examples when the user asks for code. Only provide code when explicitly requested."
-                    elif self.api_type == 'groq':
-                        system_content = "You are Mixtral, a programming assistant that helps with code in Korean. Provide complete, working code examples when the user asks for code. Only provide code when explicitly requested."
-                    elif self.api_type == 'clova':
-                        system_content = "당신은 Clova X, 프로그래밍 도우미입니다. 사용자가 코드를 요청할 때만 코드를 제공하고, 코드가 아닌 일반 질문에는 코드 없이 답변해주세요."
-                    else:
-                        system_content = "You are a programming assistant that helps with code in Korean. Only provide code when the user explicitly asks for code."
-                elif question_type == 'image' or has_image:
-                    # 이미지 분석 질문인 경우
-                    if self.api_type == 'anthropic':
-                        system_content = "You are Claude, an AI assistant that can analyze images and respond in Korean. When you receive image analysis results from other AI systems (like Ollama), you should treat them as if you analyzed the image yourself and provide detailed, natural descriptions in Korean. Make the descriptions rich, engaging, and easy to understand while maintaining the accuracy of the original analysis."
-                    elif self.api_type == 'openai':
-                        system_content = """You are GPT, an AI assistant that can analyze images and respond in Korean. When you receive image analysis results from other AI systems (like Ollama), you should treat them as if you analyzed the image yourself and provide detailed, natural descriptions in Korean. Make the descriptions rich, engaging, and easy to understand while maintaining the accuracy of the original analysis.
-
-IMPORTANT: When providing code examples, ALWAYS format them using markdown code blocks:
-- Python code: Use ```python ... ```
-- JavaScript code: Use ```javascript ... ```
-- Other code: Use ```language ... ```
-- Inline code: Use `code`
-
-Always wrap code in proper markdown code blocks so it can be properly rendered."""
-                    elif self.api_type == 'groq':
-                        system_content = "You are Mixtral, an AI assistant that can analyze images and respond in Korean. When you receive image analysis results from other AI systems (like Ollama), you should treat them as if you analyzed the image yourself and provide detailed, natural descriptions in Korean. Make the descriptions rich, engaging, and easy to understand while maintaining the accuracy of the original analysis."
-                    elif self.api_type == 'gemini':
-                        system_content = "You are Gemini, an AI assistant that can analyze images and respond in Korean. When you receive image analysis results from other AI systems (like Ollama), you should treat them as if you analyzed the image yourself and provide detailed, natural descriptions in Korean. Make the descriptions rich, engaging, and easy to understand while maintaining the accuracy of the original analysis."
-                    elif self.api_type == 'clova':
-                        system_content = "당신은 Clova X, 한국어에 특화된 AI 어시스턴트입니다. 다른 AI 시스템(Ollama 등)의 이미지 분석 결과를 받으면 직접 분석한 것처럼 자연스럽고 상세하게 한국어로 설명해주세요."
-                    else:
-                        system_content = "You are an AI assistant that can analyze images and respond in Korean. When you receive image analysis results from other AI systems (like Ollama), you should treat them as if you analyzed the image yourself and provide detailed, natural descriptions in Korean."
-                elif question_type == 'document':
-                    # 문서 분석 질문인 경우
-                    if self.api_type == 'anthropic':
-                        system_content = "You are Claude, an AI assistant that analyzes documents and responds in Korean. Provide accurate summaries and analysis of document content. Only analyze documents when the user explicitly asks for document analysis."
-                    elif self.api_type == 'openai':
-                        system_content = """You are GPT, an AI assistant that analyzes documents and responds in Korean. Provide accurate summaries and analysis of document content. Only analyze documents when the user explicitly asks for document analysis.
-
-IMPORTANT: When providing code examples, ALWAYS format them using markdown code blocks:
-- Python code: Use ```python ... ```
-- JavaScript code: Use ```javascript ... ```
-- Other code: Use ```language ... ```
-- Inline code: Use `code`
-
-Always wrap code in proper markdown code blocks so it can be properly rendered."""
-                    elif self.api_type == 'gemini':
-                        system_content = "You are Gemini, an AI assistant that analyzes documents and responds in Korean. Provide accurate summaries and analysis of document content. Only analyze documents when the user explicitly asks for document analysis."
-                    elif self.api_type == 'groq':
-                        system_content = "You are Mixtral, an AI assistant that analyzes documents and responds in Korean. Provide accurate summaries and analysis of document content. Only analyze documents when the user explicitly asks for document analysis."
-                    elif self.api_type == 'clova':
-                        system_content = "당신은 Clova X, 문서 분석 어시스턴트입니다. 사용자가 문서 분석을 요청할 때만 문서를 분석하고, 일반 질문에는 일반적인 답변을 제공해주세요."
-                    else:
-                        system_content = "You are an AI assistant that analyzes documents and responds in Korean. Only analyze documents when the user explicitly asks for document analysis."
-                elif question_type == 'creative':
-                    # 창작/글쓰기 질문인 경우
-                    if self.api_type == 'anthropic':
-                        system_content = "You are Claude, a creative writing assistant that helps with writing in Korean. Provide creative, engaging, and well-written content when the user asks for creative writing. Only provide creative writing when explicitly requested."
-                    elif self.api_type == 'openai':
-                        system_content = """You are GPT, a creative writing assistant that helps with writing in Korean. Provide creative, engaging, and well-written content when the user asks for creative writing. Only provide creative writing when explicitly requested.
-
-IMPORTANT: When providing code examples, ALWAYS format them using markdown code blocks:
-- Python code: Use ```python ... ```
-- JavaScript code: Use ```javascript ... ```
-- Other code: Use ```language ... ```
-- Inline code: Use `code`
-
-Always wrap code in proper markdown code blocks so it can be properly rendered."""
-                    elif self.api_type == 'gemini':
-                        system_content = "You are Gemini, a creative writing assistant that helps with writing in Korean. Provide creative, engaging, and well-written content when the user asks for creative writing. Only provide creative writing when explicitly requested."
-                    elif self.api_type == 'groq':
-                        system_content = "You are Mixtral, a creative writing assistant that helps with writing in Korean. Provide creative, engaging, and well-written content when the user asks for creative writing. Only provide creative writing when explicitly requested."
-                    elif self.api_type == 'clova':
-                        system_content = "당신은 Clova X, 창작 도우미입니다. 사용자가 글쓰기나 창작을 요청할 때만 창작 내용을 제공하고, 일반 질문에는 일반적인 답변을 제공해주세요."
-                    else:
-                        system_content = "You are a creative writing assistant that helps with writing in Korean. Only provide creative writing when the user explicitly asks for it."
-                else:
-                    # 일반 질문 (기본값)
-                    if self.api_type == 'anthropic':
-                        system_content = "You are Claude, an AI assistant that responds in Korean. Provide helpful, accurate, and detailed responses to user questions. Do not provide code unless explicitly asked."
-                    elif self.api_type == 'openai':
-                        system_content = """You are GPT, an AI assistant that responds in Korean. Provide helpful, accurate, and detailed responses to user questions. Do not provide code unless explicitly asked.
-
-IMPORTANT: When providing code examples, ALWAYS format them using markdown code blocks:
-- Python code: Use ```python ... ```
-- JavaScript code: Use ```javascript ... ```
-- Other code: Use ```language ... ```
-- Inline code: Use `code`
-
-Always wrap code in proper markdown code blocks so it can be properly rendered."""
-                    elif self.api_type == 'groq':
-                        system_content = "You are Mixtral, an AI assistant that responds in Korean. Provide helpful, accurate, and detailed responses to user questions. Do not provide code unless explicitly asked."
-                    elif self.api_type == 'gemini':
-                        system_content = "You are Gemini, an AI assistant that responds in Korean. Provide helpful, accurate, and detailed responses to user questions. Do not provide code unless explicitly asked."
-                    elif self.api_type == 'clova':
-                        system_content = "당신은 Clova X, 한국어에 특화된 AI 어시스턴트입니다. 사용자의 질문에 정확하고 상세하게 한국어로 답변해주세요. 코드는 요청받을 때만 제공해주세요."
-                    else:
-                        system_content = "You are an AI assistant that responds in Korean. Provide helpful, accurate, and detailed responses to user questions. Do not provide code unless explicitly asked."
-                
-                system_content = enforce_korean_instruction(system_content)
-
-                self.conversation_history.append({
-                    "role": "system",
-                    "content": system_content
-                })
-
-                # 사용자 입력 출력 (인코딩 안전하게 처리)
-                try:
-                    safe_input = user_input.encode('ascii', 'ignore').decode('ascii')
-                    print(f"User input: {safe_input}")
-                except:
-                    print("User input received")
+            # 결정적인 요청(또는 명시적으로 허용된 요청)만 정확히 같은 요청의 이전 응답 재사용
+            temperature = PROVIDER_TEMPERATURES.get(self.api_type, 0.7)
+            generation_key = None
+            if cacheable or temperature <= 0:
+                generation_key = llm_cache_manager.get_generation_key(
+                    f"{self.api_type}:{self.model}",
+                    self.conversation_history,
+                    {'temperature': temperature}
+                )
+                cached_response = llm_cache_manager.get_generation(generation_key)
+                if cached_response is not None:
+                    logger.debug("⚡ %s 응답 캐시 히트", self.model)
+                    self.conversation_history.append({"role": "assistant", "content": cached_response})
+                    self._compact_history()
+                    return cached_response
             
-            self.conversation_history.append({"role": "user", "content": user_input})
+            # 대화의 첫 질문은 표현만 다른 같은 질문에 대한 이전 응답도 재사용 (모델별로 분리)
+            semantic_namespace = None
+            if (len(self.conversation_history) == 2 and not has_image
+                    and len(user_input) <= SEMANTIC_CACHE_MAX_QUESTION_CHARS
+                    and semantic_response_cache.available):
+                semantic_namespace = f"{self.api_type}:{self.model}"
+                cached_response = semantic_response_cache.lookup(semantic_namespace, user_input)
+                if cached_response is not None:
+                    self.conversation_history.append({"role": "assistant", "content": cached_response})
+                    return cached_response
             
             # 인코딩 안전한 응답 변수 초기화
             assistant_response = ""
+            # 정상 응답만 캐시에 저장 (오류 안내 메시지는 저장하지 않음)
+            succeeded = False
             
             if self.api_type == 'openai':
                 # OpenAI 방식 처리
-                # 최신 OpenAI 모델(o1, o3, gpt-5 등)은 max_completion_tokens 사용 및 temperature 미지원
-                is_latest_model = any(model in self.model.lower() for model in ['o1', 'o3', 'gpt-5'])
-                
-                api_params = {
-                    "model": self.model,
-                    "messages": self.conversation_history,
-                }
-                
-                # 최신 모델은 temperature를 지원하지 않음
-                if not is_latest_model:
-                    api_params["temperature"] = 0.7
-                
-                completion_limit = get_openai_completion_limit(self.model)
-                if is_latest_model:
-                    api_params["max_completion_tokens"] = completion_limit
-                else:
-                    api_params["max_tokens"] = completion_limit
+                api_params = self._build_openai_params(temperature)
                 
                 try:
                     response = self.client.chat.completions.create(**api_params)
                     assistant_response = response.choices[0].message.content
+                    succeeded = True
                     
                     # 응답이 잘렸는지 확인
                     if response.choices[0].finish_reason == 'length':
-                        print(f"⚠️ {self.model} 응답이 토큰 제한으로 잘렸습니다 (finish_reason: length)")
+                        logger.warning("⚠️ %s 응답이 토큰 제한으로 잘렸습니다 (finish_reason: length)", self.model)
                         assistant_response += "\n\n[응답이 토큰 제한으로 인해 잘렸습니다. 더 긴 답변이 필요하시면 질문을 나누어 주세요.]"
                     elif response.choices[0].finish_reason:
-                        print(f"📝 {self.model} 응답 완료 (finish_reason: {response.choices[0].finish_reason})")
+                        logger.debug("📝 %s 응답 완료 (finish_reason: %s)", self.model, response.choices[0].finish_reason)
                     
-                    print(f"📏 {self.model} 응답 길이: {len(assistant_response) if assistant_response else 0}자")
+                    logger.debug("📏 %s 응답 길이: %d자", self.model, len(assistant_response) if assistant_response else 0)
                 except Exception as openai_error:
-                    print(f"❌ {self.model} API error: {str(openai_error)}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("❌ %s API error: %s", self.model, openai_error)
                     # 사용자 친화적인 오류 메시지 반환
                     assistant_response = get_user_friendly_error_message(openai_error)
             
             elif self.api_type == 'anthropic':
                 # Anthropic Messages API 방식 처리
                 try:
-                    client = anthropic.Client(api_key=self.api_key)
-                    
-                    # 대화 히스토리를 포함한 메시지 생성
-                    messages = []
-                    system_prompt = None
-                    for msg in self.conversation_history:
-                        if msg['role'] == 'system':
-                            if system_prompt is None:
-                                system_prompt = msg['content']
-                            continue
-                        messages.append({
-                            "role": msg['role'],
-                            "content": msg['content']
-                        })
-                    system_prompt = enforce_korean_instruction(system_prompt or "")
-                    
-                    message = client.messages.create(
+                    system_blocks, messages = self._build_anthropic_request()
+                    message = self.client.messages.create(
                         model="claude-3-5-haiku-20241022",
                         max_tokens=4096,
-                        temperature=0.7,
-                        system=system_prompt,
+                        temperature=temperature,
+                        system=system_blocks,
                         messages=messages
                     )
                     
                     # 응답 추출
                     raw_response = message.content[0].text
                     assistant_response = raw_response
+                    succeeded = True
                     
-                    print("Claude response processed successfully")
+                    logger.debug("Claude response processed successfully")
                     
                 except Exception as claude_error:
-                    print(f"Claude API error: {str(claude_error)}")
-                    print(f"API Key: {self.api_key[:20] if self.api_key else 'None'}...")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Claude API error: %s", claude_error)
                     # 사용자 친화적인 오류 메시지 반환
                     assistant_response = get_user_friendly_error_message(claude_error)
 
@@ -268,36 +380,15 @@ Always wrap code in proper markdown code blocks so it can be properly rendered."
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=self.conversation_history,
-                    temperature=0.7,
+                    temperature=temperature,
                     max_tokens=1024
                 )
                 assistant_response = response.choices[0].message.content
+                succeeded = True
             
             elif self.api_type == 'gemini':
                 # Gemini 방식 처리
                 try:
-                    from google.generativeai.types import HarmCategory, HarmBlockThreshold
-                    
-                    # 안전 필터 완전 비활성화 (BLOCK_NONE)
-                    safety_settings = [
-                        {
-                            "category": HarmCategory.HARM_CATEGORY_HARASSMENT,
-                            "threshold": HarmBlockThreshold.BLOCK_NONE
-                        },
-                        {
-                            "category": HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                            "threshold": HarmBlockThreshold.BLOCK_NONE
-                        },
-                        {
-                            "category": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                            "threshold": HarmBlockThreshold.BLOCK_NONE
-                        },
-                        {
-                            "category": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                            "threshold": HarmBlockThreshold.BLOCK_NONE
-                        }
-                    ]
-                    
                     # 안전 필터 우회를 위해 영어 컨텍스트로 감싸기
                     english_wrapper = f"""You are a helpful AI assistant. Answer the user's question directly and completely in Korean.
 
@@ -320,13 +411,8 @@ Response:"""
                     # 메시지 전송 (안전 필터 완전 비활성화)
                     response = chat.send_message(
                         english_wrapper,
-                        safety_settings=safety_settings,
-                        generation_config=genai.types.GenerationConfig(
-                            temperature=0.9,
-                            max_output_tokens=4096,
-                            top_p=0.95,
-                            top_k=40,
-                        )
+                        safety_settings=_GEMINI_SAFETY_SETTINGS,
+                        generation_config=_GEMINI_GEN_CONFIG
                     )
                     
                     # 안전한 응답 추출
@@ -335,129 +421,76 @@ Response:"""
                         
                         # finish_reason 확인
                         finish_reason = getattr(candidate, 'finish_reason', None)
-                        print(f"📝 Gemini finish_reason: {finish_reason}")
+                        logger.debug("📝 Gemini finish_reason: %s", finish_reason)
                         
                         # Safety ratings 확인
                         if hasattr(candidate, 'safety_ratings'):
                             safety_ratings = candidate.safety_ratings
-                            print(f"📊 Gemini safety_ratings: {safety_ratings}")
+                            logger.debug("📊 Gemini safety_ratings: %s", safety_ratings)
                             # 안전 필터가 걸렸는지 확인
                             for rating in safety_ratings:
                                 if hasattr(rating, 'category') and hasattr(rating, 'probability'):
                                     if rating.probability >= 0.5:  # HIGH 또는 MEDIUM
-                                        print(f"⚠️ 안전 필터 감지: {rating.category} - {rating.probability}")
+                                        logger.debug("⚠️ 안전 필터 감지: %s - %s", rating.category, rating.probability)
                         
                         # 응답 추출 시도
                         if candidate.content and candidate.content.parts:
                             assistant_response = candidate.content.parts[0].text
-                            print("✅ Gemini response processed successfully")
+                            succeeded = True
+                            logger.debug("✅ Gemini response processed successfully")
                         elif finish_reason == 2:  # SAFETY
                             # 안전 필터가 걸렸지만 재시도 (원본 질문 사용)
-                            print("⚠️ Gemini 안전 필터 감지 - 재시도 중...")
+                            logger.info("⚠️ Gemini 안전 필터 감지 - 재시도 중...")
                             try:
                                 # 원본 질문으로 직접 재시도
                                 retry_response = chat.send_message(
                                     user_input,  # 영어 래퍼 없이 원본 질문
-                                    safety_settings=safety_settings,
-                                    generation_config=genai.types.GenerationConfig(
-                                        temperature=0.9,
-                                        max_output_tokens=4096,
-                                    )
+                                    safety_settings=_GEMINI_SAFETY_SETTINGS,
+                                    generation_config=_GEMINI_RETRY_GEN_CONFIG
                                 )
                                 if retry_response.candidates and retry_response.candidates[0].content:
                                     assistant_response = retry_response.candidates[0].content.parts[0].text
-                                    print("✅ Gemini 재시도 성공")
+                                    succeeded = True
+                                    logger.debug("✅ Gemini 재시도 성공")
                                 else:
                                     assistant_response = user_input  # 원본 질문을 그대로 반환 (안전 필터 오류 메시지 없음)
-                                    print("⚠️ Gemini 재시도 실패 - 원본 질문 반환")
+                                    logger.warning("⚠️ Gemini 재시도 실패 - 원본 질문 반환")
                             except Exception as retry_error:
-                                print(f"⚠️ Gemini 재시도 오류: {retry_error}")
+                                logger.warning("⚠️ Gemini 재시도 오류: %s", retry_error)
                                 assistant_response = user_input  # 원본 질문을 그대로 반환
                         elif finish_reason == 3:  # RECITATION
                             assistant_response = "이 응답은 저작권 문제로 제공할 수 없습니다."
                         else:
-                            print(f"⚠️ Gemini finish_reason: {finish_reason}")
+                            logger.warning("⚠️ Gemini finish_reason: %s", finish_reason)
                             assistant_response = user_input  # 원본 질문을 그대로 반환 (오류 메시지 없음)
                     else:
-                        print("⚠️ Gemini 응답에 candidates가 없음 - 원본 질문 반환")
+                        logger.warning("⚠️ Gemini 응답에 candidates가 없음 - 원본 질문 반환")
                         assistant_response = user_input  # 원본 질문을 그대로 반환
                     
                 except Exception as gemini_error:
-                    print(f"❌ Gemini API error: {str(gemini_error)}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("❌ Gemini API error: %s", gemini_error)
                     # 사용자 친화적인 오류 메시지 반환
                     assistant_response = get_user_friendly_error_message(gemini_error)
             
             elif self.api_type == 'clova':
                 # HyperCLOVA X Studio API 방식 처리 (자유 대화 가능)
                 try:
-                    import requests
-                    import json
-                    
-                    print(f"🔍 HyperCLOVA X 요청 시작...")
-                    print(f"   - 모델: {self.model}")
-                    print(f"   - 메시지: {user_input}")
+                    logger.debug("🔍 HyperCLOVA X 요청 시작 (모델: %s)", self.model)
                     
                     if not self.hyperclova_api_key:
-                        print("❌ HyperCLOVA X API 키가 없습니다!")
+                        logger.error("❌ HyperCLOVA X API 키가 없습니다!")
                         assistant_response = "HyperCLOVA X API가 설정되지 않았습니다."
                     else:
-                        # HyperCLOVA X API 엔드포인트 (v3 사용)
-                        clova_api_url = f"https://clovastudio.stream.ntruss.com/v3/chat-completions/{self.model}"
-                        
-                        # 헤더 설정 (Bearer 토큰 방식)
-                        headers = {
-                            "Authorization": f"Bearer {self.hyperclova_api_key}",
-                            "X-NCP-CLOVASTUDIO-REQUEST-ID": str(uuid.uuid4()).replace('-', ''),
-                            "Content-Type": "application/json",
-                            "Accept": "application/json"
-                        }
-                        
-                        # API Gateway 키가 있으면 추가
-                        if self.hyperclova_apigw_key:
-                            headers["X-NCP-APIGW-API-KEY"] = self.hyperclova_apigw_key
-                        
-                        # 대화 히스토리를 HyperCLOVA X v3 형식으로 변환
-                        clova_messages = []
-                        
-                        # 시스템 메시지 추가 (한국어 응답 강제)
-                        clova_system_prompt = "당신은 HyperCLOVA X 기반 AI 어시스턴트입니다. 친절하고 자세하게 답변하세요."
-                        clova_messages.append({
-                            "role": "system",
-                            "content": enforce_korean_instruction(clova_system_prompt)
-                        })
-                        
-                        # 사용자 메시지 추가 (content는 문자열)
-                        for msg in self.conversation_history:
-                            if msg['role'] != 'system':
-                                clova_messages.append({
-                                    "role": msg['role'],
-                                    "content": msg['content']
-                                })
-                        
-                        # HyperCLOVA X Chat Completions API v3 형식
-                        payload = {
-                            "messages": clova_messages,
-                            "topP": 0.8,
-                            "topK": 0,
-                            "maxTokens": HYPERCLOVA_MAX_TOKENS,
-                            "temperature": 0.5,
-                            "repetitionPenalty": 1.1,
-                            "stop": [],
-                            "seed": 0,
-                            "includeAiFilters": False
-                        }
+                        clova_api_url, headers, payload = self._build_clova_request(temperature)
                         
-                        print(f"   - API URL: {clova_api_url}")
-                        print(f"   - Messages: {len(clova_messages)}개")
+                        logger.debug("   - API URL: %s, Messages: %d개", clova_api_url, len(payload["messages"]))
                         
-                        response = requests.post(clova_api_url, headers=headers, json=payload, timeout=30)
+                        response = _get_clova_client().post(clova_api_url, headers=headers, content=_clova_dumps(payload))
                         
-                        print(f"   - 응답 코드: {response.status_code}")
+                        logger.debug("   - 응답 코드: %s", response.status_code)
                         
                         if response.status_code == 200:
-                            result = response.json()
+                            result = _clova_loads(response.content)
                             
                             # status 확인
                             status_code = result.get('status', {}).get('code', '')
@@ -476,37 +509,550 @@ Response:"""
                                 
                                 if content:
                                     assistant_response = content
-                                    print(f"✅ HyperCLOVA X 응답 성공: {len(assistant_response)}자")
+                                    succeeded = True
+                                    logger.debug("✅ HyperCLOVA X 응답 성공: %d자", len(assistant_response))
                                     if stop_reason and str(stop_reason).lower() in {"length", "max_tokens"}:
                                         assistant_response += "\n\n[응답이 토큰 제한으로 잘렸습니다. 필요하면 질문을 나누어 다시 요청해 주세요.]"
-                                        print(f"⚠️ HyperCLOVA X stop_reason: {stop_reason}")
+                                        logger.warning("⚠️ HyperCLOVA X stop_reason: %s", stop_reason)
                                 else:
-                                    print(f"⚠️ content가 비어있음")
+                                    logger.warning("⚠️ HyperCLOVA X content가 비어있음")
                                     assistant_response = '응답을 받을 수 없습니다.'
                             else:
-                                print(f"⚠️ Status code: {status_code}, Message: {result.get('status', {}).get('message', '')}")
+                                logger.warning("⚠️ Status code: %s, Message: %s", status_code, result.get('status', {}).get('message', ''))
                                 assistant_response = '응답을 받을 수 없습니다.'
                         else:
-                            print(f"⚠️ HyperCLOVA X API error: {response.status_code}")
-                            print(f"⚠️ Response: {response.text}")
+                            logger.warning("⚠️ HyperCLOVA X API error: %s, Response: %s", response.status_code, response.text)
                             # HTTP 상태 코드를 Exception으로 변환하여 친화적 메시지 생성
                             error_msg = Exception(f"HTTP {response.status_code}: {response.text}")
                             assistant_response = get_user_friendly_error_message(error_msg)
                     
                 except Exception as clova_error:
-                    print(f"❌ HyperCLOVA X API error: {str(clova_error)}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("❌ HyperCLOVA X API error: %s", clova_error)
                     # 사용자 친화적인 오류 메시지 반환
                     assistant_response = get_user_friendly_error_message(clova_error)
             
+            if generation_key and succeeded:
+                llm_cache_manager.store_generation(generation_key, assistant_response)
+            if semantic_namespace and succeeded:
+                semantic_response_cache.insert(semantic_namespace, user_input, assistant_response)
+            
             # 대화 이력에 추가
             self.conversation_history.append({"role": "assistant", "content": assistant_response})
+            self._compact_history()
             return assistant_response
         except Exception as e:
             user_friendly_message = get_user_friendly_error_message(e)
-            print(f"Error handled: {user_friendly_message}")
+            logger.warning("Error handled: %s", user_friendly_message)
             return user_friendly_message
+    
+    def _start_turn(self, user_input, has_image, question_type):
+        """새 턴 시작: 첫 턴이면 system prompt를 넣고 사용자 입력을 대화 이력에 추가"""
+        # 질문 유형 자동 감지 (지정되지 않은 경우)
+        if question_type is None:
+            question_type = detect_question_type_from_content(user_input)
+        
+        # 대화 시작 시 시스템 메시지 추가 (질문 내용에 따라 적절한 프롬프트 사용)
+        if not self.conversation_history:
+            # 새 대화에는 이전 대화의 요약을 반영하지 않음
+            self._pending_summary = None
+            # 질문 유형 + API 유형별 system message (import 시 미리 만든 표에서 조회)
+            system_content = get_system_prompt(question_type, self.api_type, has_image)
+
+            self.conversation_history.append({
+                "role": "system",
+                "content": system_content
+            })
+
+            # 사용자 입력 로그 (DEBUG일 때만 포맷팅)
+            logger.debug("User input: %s", user_input)
+        else:
+            self._apply_pending_summary()
+        
+        self.conversation_history.append({"role": "user", "content": user_input})
+    
+    def _build_openai_params(self, temperature):
+        """OpenAI chat.completions 요청 파라미터"""
+        # 최신 OpenAI 모델(o1, o3, gpt-5 등)은 max_completion_tokens 사용 및 temperature 미지원
+        is_latest_model = any(model in self.model.lower() for model in ['o1', 'o3', 'gpt-5'])
+        
+        # system prompt가 항상 messages[0]에 그대로 있어야 OpenAI 자동 prompt caching이 적용됨
+        api_params = {
+            "model": self.model,
+            "messages": self.conversation_history,
+        }
+        
+        # 최신 모델은 temperature를 지원하지 않음
+        if not is_latest_model:
+            api_params["temperature"] = temperature
+        
+        completion_limit = get_openai_completion_limit(self.model)
+        if is_latest_model:
+            api_params["max_completion_tokens"] = completion_limit
+        else:
+            api_params["max_tokens"] = completion_limit
+        return api_params
+    
+    def _build_anthropic_request(self):
+        """대화 이력을 Anthropic Messages API 형식 (system 블록, messages)으로 변환"""
+        # 대화 히스토리를 포함한 메시지 생성
+        messages = []
+        system_prompt = None
+        extra_system = []
+        for msg in self.conversation_history:
+            if msg['role'] == 'system':
+                if system_prompt is None:
+                    system_prompt = msg['content']
+                else:
+                    extra_system.append(msg['content'])  # 이전 대화 요약
+                continue
+            messages.append({
+                "role": msg['role'],
+                "content": msg['content']
+            })
+        system_prompt = enforce_korean_instruction(system_prompt or "")
+        
+        # system prompt는 대화 내내 같으므로 서버 측 prompt cache 대상으로 지정
+        system_blocks = [{
+            "type": "text",
+            "text": system_prompt,
+            "cache_control": {"type": "ephemeral"}
+        }]
+        system_blocks.extend({"type": "text", "text": text} for text in extra_system)
+        
+        # 이전 턴이 있으면 마지막 user 메시지까지를 캐시 지점으로 지정
+        # (다음 요청은 이 지점까지의 대화를 캐시에서 읽고 새 턴만 처리)
+        if len(messages) >= 2:
+            messages[-1] = {
+                "role": messages[-1]['role'],
+                "content": [{
+                    "type": "text",
+                    "text": messages[-1]['content'],
+                    "cache_control": {"type": "ephemeral"}
+                }]
+            }
+        return system_blocks, messages
+    
+    def _build_clova_request(self, temperature):
+        """HyperCLOVA X v3 요청 (URL, 헤더, payload)"""
+        # HyperCLOVA X API 엔드포인트 (v3 사용)
+        clova_api_url = f"https://clovastudio.stream.ntruss.com/v3/chat-completions/{self.model}"
+        
+        # 헤더 설정 (Bearer 토큰 방식)
+        headers = {
+            "Authorization": f"Bearer {self.hyperclova_api_key}",
+            "X-NCP-CLOVASTUDIO-REQUEST-ID": secrets.token_hex(16),
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        
+        # API Gateway 키가 있으면 추가
+        if self.hyperclova_apigw_key:
+            headers["X-NCP-APIGW-API-KEY"] = self.hyperclova_apigw_key
+        
+        # HyperCLOVA X 전용 system 메시지 + 첫 system prompt를 뺀 대화 이력
+        # (이력 항목은 이미 {"role", "content"} 형식이라 복사 없이 그대로 사용, 이전 대화 요약은 system으로 유지)
+        clova_messages = [_CLOVA_SYSTEM_MESSAGE, *self.conversation_history[1:]]
+        
+        # HyperCLOVA X Chat Completions API v3 형식 (고정 파라미터는 모듈 상수 재사용)
+        payload = {"messages": clova_messages, **_CLOVA_PAYLOAD_BASE, "temperature": temperature}
+        return clova_api_url, headers, payload
+    
+    def chat_stream(self, user_input, has_image=False, question_type=None):
+        """chat()의 스트리밍 버전: 응답 조각(str)을 생성되는 대로 yield
+
+        스트림이 끝나면(클라이언트가 중간에 끊어도) 받은 응답을 대화 이력에 추가한다.
+        Gemini는 안전 필터 재시도 로직이 있어 chat()으로 받은 전체 응답을 한 조각으로 돌려준다.
+        """
+        if self.api_type not in ('openai', 'groq', 'anthropic', 'clova'):
+            yield self.chat(user_input, has_image, question_type)
+            return
+        
+        self._start_turn(user_input, has_image, question_type)
+        temperature = PROVIDER_TEMPERATURES.get(self.api_type, 0.7)
+        parts = []
+        try:
+            if self.api_type in ('openai', 'groq'):
+                if self.api_type == 'openai':
+                    api_params = self._build_openai_params(temperature)
+                else:
+                    api_params = {
+                        "model": self.model,
+                        "messages": self.conversation_history,
+                        "temperature": temperature,
+                        "max_tokens": 1024,
+                    }
+                stream = self.client.chat.completions.create(**api_params, stream=True)
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        piece = chunk.choices[0].delta.content
+                        parts.append(piece)
+                        yield piece
+            
+            elif self.api_type == 'anthropic':
+                system_blocks, messages = self._build_anthropic_request()
+                with self.client.messages.stream(
+                    model="claude-3-5-haiku-20241022",
+                    max_tokens=4096,
+                    temperature=temperature,
+                    system=system_blocks,
+                    messages=messages
+                ) as stream:
+                    for piece in stream.text_stream:
+                        parts.append(piece)
+                        yield piece
+            
+            elif self.api_type == 'clova':
+                if not self.hyperclova_api_key:
+                    piece = "HyperCLOVA X API가 설정되지 않았습니다."
+                    parts.append(piece)
+                    yield piece
+                    return
+                
+                # 같은 /chat-completions 엔드포인트에 Accept: text/event-stream으로 요청하면 SSE로 응답
+                clova_api_url, headers, payload = self._build_clova_request(temperature)
+                headers["Accept"] = "text/event-stream"
+                with _get_clova_client().stream("POST", clova_api_url, headers=headers, content=_clova_dumps(payload)) as response:
+                    if response.status_code != 200:
+                        response.read()
+                        raise Exception(f"HTTP {response.status_code}: {response.text}")
+                    event = None
+                    for line in response.iter_lines():
+                        if line.startswith("event:"):
+                            event = line[len("event:"):].strip()
+                        elif line.startswith("data:"):
+                            data = line[len("data:"):].strip()
+                            if event == "token":
+                                piece = _clova_loads(data).get('message', {}).get('content', '')
+                                if piece:
+                                    parts.append(piece)
+                                    yield piece
+                            elif event == "error":
+                                raise Exception(f"HyperCLOVA X stream error: {data}")
+        except Exception as e:
+            logger.exception("❌ %s 스트리밍 오류: %s", self.model, e)
+            piece = get_user_friendly_error_message(e)
+            parts.append(piece)
+            yield piece
+        finally:
+            self.conversation_history.append({"role": "assistant", "content": "".join(parts)})
+            self._compact_history()
+    
+    def _compact_history(self):
+        """대화 이력이 길어지면 오래된 턴을 요약 메시지 하나로 압축 (요청마다 보내는 토큰 수를 일정하게 유지)
+
+        오래된 턴은 바로 버리고, 요약은 백그라운드에서 만들어 다음 턴 시작 시 반영한다.
+        """
+        self._apply_pending_summary()
+        # [0]은 system prompt, 그 뒤에 (있다면) 이전 대화 요약, 나머지는 user/assistant 턴
+        turns = self.conversation_history[1:]
+        if len(turns) <= HISTORY_KEEP_MESSAGES:
+            return
+        estimated_tokens = sum(len(msg['content']) for msg in turns) // 4
+        if estimated_tokens <= HISTORY_SUMMARY_MIN_TOKENS:
+            return
+        if len(turns) <= HISTORY_MAX_MESSAGES and estimated_tokens <= HISTORY_MAX_TOKENS:
+            return
+        
+        # 남길 구간은 user 메시지로 시작해야 함 (Anthropic은 assistant로 시작하는 messages를 거부)
+        split = len(turns) - HISTORY_KEEP_MESSAGES
+        while split < len(turns) and turns[split]['role'] != 'user':
+            split += 1
+        older_turns, recent_turns = turns[:split], turns[split:]
+        if all(msg['role'] == 'system' for msg in older_turns):
+            # 최근 턴 자체가 긴 경우: 이미 요약된 부분만 남았으므로 다시 요약하지 않음
+            return
+        
+        # 아직 끝나지 않은 요약 작업이 있으면 그 입력(이전 요약 포함)에 이어서 다시 요약
+        if self._pending_summary is not None:
+            pending_future, lines = self._pending_summary
+            pending_future.cancel()
+            lines = list(lines)
+        else:
+            lines = []
+        summary_message = None
+        for msg in older_turns:
+            if msg['role'] == 'system':
+                summary_message = msg
+                if self._pending_summary is None:
+                    lines.append(msg['content'].removeprefix(HISTORY_SUMMARY_PREFIX))
+            else:
+                speaker = "사용자" if msg['role'] == 'user' else "AI"
+                lines.append(f"{speaker}: {msg['content']}")
+        
+        future = _HISTORY_SUMMARY_EXECUTOR.submit(summarize_conversation, "\n".join(lines))
+        self._pending_summary = (future, lines)
+        
+        # 요약이 준비될 때까지는 기존 요약(있다면)과 최근 턴만 유지
+        compacted = [self.conversation_history[0]]
+        if summary_message is not None:
+            compacted.append(summary_message)
+        compacted.extend(recent_turns)
+        self.conversation_history = compacted
+        logger.debug("🗂️ %s 대화 이력 압축: %d개 → %d개 메시지", self.model, len(turns) + 1, len(compacted))
+    
+    def _apply_pending_summary(self):
+        """백그라운드 요약이 끝났으면 대화 이력의 요약 메시지를 교체 (아직이면 다음에 다시 확인)"""
+        if self._pending_summary is None:
+            return
+        future, _ = self._pending_summary
+        if not future.done():
+            return
+        self._pending_summary = None
+        try:
+            summary = future.result()
+        except Exception as e:
+            logger.warning("대화 이력 요약 실패, 오래된 턴을 버립니다: %s", e)
+            return
+        if not summary or not self.conversation_history:
+            return
+        summary_message = {"role": "system", "content": HISTORY_SUMMARY_PREFIX + summary}
+        if len(self.conversation_history) > 1 and self.conversation_history[1]['role'] == 'system':
+            self.conversation_history[1] = summary_message
+        else:
+            self.conversation_history.insert(1, summary_message)
+
+# 느린 모델 컷오프: 첫 응답 후 이 시간(초)이 지나면 최소 응답 수를 채운 상태에서 남은 호출을 취소
+STRAGGLER_TIMEOUT = 8.0
+STRAGGLER_MIN_RESPONSES = 3
+
+
+async def gather_chat_responses(named_bots, user_input, straggler_timeout=None, **chat_kwargs):
+    """여러 ChatBot에 같은 질문을 동시에 보내고 {모델명: 응답 또는 예외}를 반환
+
+    별칭처럼 같은 인스턴스를 가리키는 모델은 한 번만 호출해 결과를 공유한다
+    (같은 대화 히스토리에 동시에 쓰지 않도록).
+    straggler_timeout을 주면 첫 응답 후 그 시간 안에 끝나지 않은 호출은 (최소 응답 수를 채운 뒤) 취소하고
+    해당 모델의 결과를 asyncio.TimeoutError로 채운다.
+    """
+    tasks = {}
+    for chatbot in named_bots.values():
+        if id(chatbot) not in tasks:
+            tasks[id(chatbot)] = asyncio.ensure_future(chatbot.achat(user_input, **chat_kwargs))
+    
+    if straggler_timeout is None:
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        result_by_bot = dict(zip(tasks, results))
+        return {name: result_by_bot[id(chatbot)] for name, chatbot in named_bots.items()}
+    
+    loop = asyncio.get_running_loop()
+    min_responses = min(STRAGGLER_MIN_RESPONSES, len(tasks))
+    pending = set(tasks.values())
+    completed = 0
+    deadline = None
+    try:
+        while pending:
+            timeout = None
+            if deadline is not None and completed >= min_responses:
+                timeout = max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            completed += len(done)
+            if deadline is None:
+                deadline = loop.time() + straggler_timeout
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    if pending:
+        logger.warning("⏱️ 첫 응답 후 %s초 안에 끝나지 않은 %d개 모델 호출 취소", straggler_timeout, len(pending))
+    result_by_bot = {
+        key: (task.exception() or task.result()) if task.done() and not task.cancelled()
+        else asyncio.TimeoutError("응답 대기 시간 초과")
+        for key, task in tasks.items()
+    }
+    return {name: result_by_bot[id(chatbot)] for name, chatbot in named_bots.items()}
+
+
+def chat_concurrently(named_bots, user_input, straggler_timeout=None, **chat_kwargs):
+    """동기 코드(뷰)에서 여러 모델을 병렬 호출 (전체 소요 시간 = 가장 느린 모델 기준, straggler_timeout으로 상한)"""
+    if not named_bots:
+        return {}
+    return async_to_sync(gather_chat_responses)(named_bots, user_input, straggler_timeout, **chat_kwargs)
+
+async def gather_chat_responses_until(named_bots, user_input, accept, **chat_kwargs):
+    """여러 ChatBot에 같은 질문을 동시에 보내고, 먼저 끝난 응답부터 accept(모델명, 응답)으로 확인
+
+    accept가 True를 반환하면 남은 호출은 기다리지 않고 ({모델명: 응답 또는 예외}, 채택된 모델명)을 반환한다
+    (끝까지 채택되지 않으면 채택 모델명은 None). accept는 블로킹 호출일 수 있어 워커 스레드에서 실행하며,
+    취소된 호출의 SDK 스레드는 끝까지 실행되지만 결과는 버려진다.
+    """
+    names_by_bot = {}
+    tasks = {}
+    for name, chatbot in named_bots.items():
+        names_by_bot.setdefault(id(chatbot), []).append(name)
+        if id(chatbot) not in tasks:
+            tasks[id(chatbot)] = asyncio.ensure_future(chatbot.achat(user_input, **chat_kwargs))
+    bot_by_task = {task: key for key, task in tasks.items()}
+    
+    results = {}
+    accepted = None
+    pending = set(tasks.values())
+    try:
+        while pending and accepted is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                names = names_by_bot[bot_by_task[task]]
+                result = task.exception() or task.result()
+                for name in names:
+                    results[name] = result
+                if (accepted is None and not isinstance(result, Exception)
+                        and await asyncio.to_thread(accept, names[0], result)):
+                    accepted = names[0]
+    finally:
+        for task in pending:
+            task.cancel()
+    return results, accepted
+
+
+def chat_until_accepted(named_bots, user_input, accept, **chat_kwargs):
+    """동기 코드에서 gather_chat_responses_until 호출 (전체 소요 시간 = 처음 채택된 모델 기준)"""
+    if not named_bots:
+        return {}, None
+    return async_to_sync(gather_chat_responses_until)(named_bots, user_input, accept, **chat_kwargs)
+
+# 배치 API 결과 대기 설정 (배치는 최대 24시간까지 걸릴 수 있으므로 기한 안에 못 받으면 일반 호출로 대체)
+BATCH_POLL_INTERVAL = 2
+BATCH_WAIT_TIMEOUT = 600
+
+
+def _submit_openai_batch(client, requests_by_name):
+    """같은 모델 요청들을 JSONL로 올리고 /v1/chat/completions 배치 생성"""
+    lines = [
+        json.dumps({"custom_id": name, "method": "POST", "url": "/v1/chat/completions", "body": body}, ensure_ascii=False)
+        for name, body in requests_by_name.items()
+    ]
+    batch_file = client.files.create(file=("batch.jsonl", "\n".join(lines).encode('utf-8')), purpose="batch")
+    return client.batches.create(input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+
+
+def _poll_openai_batch(client, batch):
+    """완료됐으면 {custom_id: 응답}, 아직이면 None (실패/만료 시 빈 dict)"""
+    batch = client.batches.retrieve(batch.id)
+    if batch.status in ('validating', 'in_progress', 'finalizing'):
+        return None
+    if batch.status != 'completed' or not batch.output_file_id:
+        logger.warning("⚠️ OpenAI 배치 %s 종료 상태: %s", batch.id, batch.status)
+        return {}
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        body = (item.get('response') or {}).get('body') or {}
+        choices = body.get('choices') or []
+        if choices:
+            results[item['custom_id']] = choices[0]['message']['content']
+    return results
+
+
+def _poll_anthropic_batch(client, batch):
+    """완료됐으면 {custom_id: 응답}, 아직이면 None"""
+    batch = client.messages.batches.retrieve(batch.id)
+    if batch.processing_status != 'ended':
+        return None
+    results = {}
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type == 'succeeded':
+            results[entry.custom_id] = entry.result.message.content[0].text
+    return results
+
+
+def batch_chat_responses(named_bots, user_input, timeout=BATCH_WAIT_TIMEOUT):
+    """OpenAI/Anthropic 모델은 제공자 배치 API로, 나머지는 일반 동시 호출로 응답 수집
+
+    배치 API는 비용이 약 절반이지만 결과가 늦게 나오므로 대화형 요청이 아닌 백그라운드 실행용이다.
+    timeout 안에 끝나지 않은 배치 요청은 취소하고 일반 호출로 다시 보낸다.
+    반환 형식은 chat_concurrently와 같다 ({모델명: 응답 또는 예외}).
+    """
+    openai_requests = {}  # (클라이언트 id, 모델) -> (클라이언트, {이름: body})
+    anthropic_requests = {}  # 클라이언트 id -> (클라이언트, [요청])
+    interactive_bots = {}
+    
+    for name, bot in named_bots.items():
+        if bot.api_type not in ('openai', 'anthropic'):
+            interactive_bots[name] = bot
+            continue
+        # 요청 본문만 만들고 대화 이력은 결과를 받은 뒤에 반영
+        # (_start_turn이 끝난 백그라운드 요약을 반영하면서 비우므로 함께 저장했다가 되돌림)
+        history = list(bot.conversation_history)
+        pending_summary = bot._pending_summary
+        bot._start_turn(user_input, False, None)
+        temperature = PROVIDER_TEMPERATURES[bot.api_type]
+        if bot.api_type == 'openai':
+            key = (id(bot.client), bot.model)
+            openai_requests.setdefault(key, (bot.client, {}))[1][name] = bot._build_openai_params(temperature)
+        else:
+            system_blocks, messages = bot._build_anthropic_request()
+            anthropic_requests.setdefault(id(bot.client), (bot.client, []))[1].append({
+                "custom_id": name,
+                "params": {
+                    "model": "claude-3-5-haiku-20241022",
+                    "max_tokens": 4096,
+                    "temperature": temperature,
+                    "system": system_blocks,
+                    "messages": messages,
+                },
+            })
+        bot.conversation_history = history
+        bot._pending_summary = pending_summary
+    
+    pending = []  # (클라이언트, 배치, 폴링 함수, 포함된 모델명)
+    for client, bodies in openai_requests.values():
+        try:
+            pending.append((client, _submit_openai_batch(client, bodies), _poll_openai_batch, list(bodies)))
+        except Exception as e:
+            logger.warning("⚠️ OpenAI 배치 생성 실패, 일반 호출로 대체: %s", e)
+            interactive_bots.update((name, named_bots[name]) for name in bodies)
+    for client, requests_ in anthropic_requests.values():
+        names = [request_['custom_id'] for request_ in requests_]
+        try:
+            pending.append((client, client.messages.batches.create(requests=requests_), _poll_anthropic_batch, names))
+        except Exception as e:
+            logger.warning("⚠️ Anthropic 배치 생성 실패, 일반 호출로 대체: %s", e)
+            interactive_bots.update((name, named_bots[name]) for name in names)
+    
+    # 배치를 기다리는 동안 배치를 지원하지 않는 모델은 바로 호출
+    results = chat_concurrently(interactive_bots, user_input)
+    
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        time.sleep(BATCH_POLL_INTERVAL)
+        still_pending = []
+        for client, batch, poll, names in pending:
+            try:
+                batch_results = poll(client, batch)
+            except Exception as e:
+                logger.warning("⚠️ 배치 %s 상태 조회 실패: %s", batch.id, e)
+                batch_results = None
+            if batch_results is None:
+                still_pending.append((client, batch, poll, names))
+                continue
+            for name in names:
+                if name in batch_results:
+                    bot = named_bots[name]
+                    bot._start_turn(user_input, False, None)
+                    bot.conversation_history.append({"role": "assistant", "content": batch_results[name]})
+                    bot._compact_history()
+                    results[name] = batch_results[name]
+        pending = still_pending
+    
+    # 기한 안에 끝나지 않은 배치는 취소
+    for client, batch, poll, names in pending:
+        try:
+            if poll is _poll_openai_batch:
+                client.batches.cancel(batch.id)
+            else:
+                client.messages.batches.cancel(batch.id)
+        except Exception as e:
+            logger.warning("⚠️ 배치 %s 취소 실패: %s", batch.id, e)
+    
+    # 배치에서 응답을 받지 못한 모델은 일반 호출로 다시 보냄
+    missing = {name: bot for name, bot in named_bots.items() if name not in results}
+    if missing:
+        logger.info("배치 응답이 없는 %d개 모델을 일반 호출로 대체합니다.", len(missing))
+        results.update(chat_concurrently(missing, user_input))
+    return results
 
 # API 키 및 설정
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
@@ -514,103 +1060,236 @@ ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
 HYPERCLOVA_MAX_TOKENS = 2048
+# 요청마다 같은 HyperCLOVA X 생성 파라미터 (messages/temperature만 요청별로 채움)
+_CLOVA_PAYLOAD_BASE = {
+    "topP": 0.8,
+    "topK": 0,
+    "maxTokens": HYPERCLOVA_MAX_TOKENS,
+    "repetitionPenalty": 1.1,
+    "stop": [],
+    "seed": 0,
+    "includeAiFilters": False
+}
+_CLOVA_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": enforce_korean_instruction("당신은 HyperCLOVA X 기반 AI 어시스턴트입니다. 친절하고 자세하게 답변하세요.")
+}
 HYPERCLOVA_API_KEY = os.getenv('HYPERCLOVA_API_KEY', '')
 HYPERCLOVA_APIGW_KEY = os.getenv('HYPERCLOVA_APIGW_KEY', '')
 
 
-# API 키가 있는 경우에만 ChatBot 인스턴스 생성
-chatbots = {}
+class LazyChatBotRegistry(Mapping):
+    """모델명 -> ChatBot 레지스트리 (첫 접근 시에만 ChatBot 생성)
+
+    import 시점에 20여 개의 ChatBot(및 SDK 클라이언트)을 모두 만들지 않고,
+    실제로 요청된 모델만 double-checked locking으로 한 번 생성해 재사용한다.
+    하위 호환용 별칭은 대상 모델과 같은 ChatBot 인스턴스를 공유한다.
+    """
+
+    def __init__(self, specs, aliases=None):
+        self._specs = specs
+        self._aliases = {
+            alias: target for alias, target in (aliases or {}).items()
+            if target in specs
+        }
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        canonical_name = self._aliases.get(name, name)
+        chatbot = self._instances.get(canonical_name)
+        if chatbot is not None:
+            return chatbot
+
+        with self._lock:
+            chatbot = self._instances.get(canonical_name)
+            if chatbot is None:
+                spec = self._specs[canonical_name]  # 등록되지 않은 모델이면 KeyError
+                try:
+                    chatbot = ChatBot(*spec)
+                except ValueError as e:
+                    # 생성에 실패한 모델만 제외 (같은 제공자의 다른 모델에는 영향 없음)
+                    logger.warning("⚠️ %s 모델 초기화 실패, 등록 해제: %s", canonical_name, e)
+                    self._specs.pop(canonical_name, None)
+                    raise KeyError(name) from e
+                self._instances[canonical_name] = chatbot
+        return chatbot
+
+    def __contains__(self, name):
+        return self._aliases.get(name, name) in self._specs
+
+    def __iter__(self):
+        yield from list(self._specs)
+        yield from [alias for alias, target in self._aliases.items() if target in self._specs]
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def loaded_items(self):
+        """이미 생성된 ChatBot만 반환 (대화 히스토리 초기화 등 생성이 불필요한 순회용)"""
+        with self._lock:
+            return list(self._instances.items())
+
+
+# ChatBot이 처리할 수 있는 API 유형
+SUPPORTED_API_TYPES = frozenset({'openai', 'anthropic', 'groq', 'gemini', 'clova'})
+
+# API 키가 있는 모델만 등록: 모델명 -> (API 키, 실제 모델 ID, API 유형)
+MODEL_SPECS = {}
 
 # === GPT 모델들 ===
-try:
-    if OPENAI_API_KEY:
+if OPENAI_API_KEY:
+    MODEL_SPECS.update({
         # GPT-5 시리즈 (최신)
-        chatbots['gpt-5'] = ChatBot(OPENAI_API_KEY, 'gpt-5', 'openai')
-        chatbots['gpt-5-mini'] = ChatBot(OPENAI_API_KEY, 'gpt-5-mini', 'openai')
+        'gpt-5': (OPENAI_API_KEY, 'gpt-5', 'openai'),
+        'gpt-5-mini': (OPENAI_API_KEY, 'gpt-5-mini', 'openai'),
         
         # GPT-4.1 시리즈
-        chatbots['gpt-4.1'] = ChatBot(OPENAI_API_KEY, 'gpt-4.1', 'openai')
-        chatbots['gpt-4.1-mini'] = ChatBot(OPENAI_API_KEY, 'gpt-4.1-mini', 'openai')
+        'gpt-4.1': (OPENAI_API_KEY, 'gpt-4.1', 'openai'),
+        'gpt-4.1-mini': (OPENAI_API_KEY, 'gpt-4.1-mini', 'openai'),
         
         # GPT-4o 시리즈
-        chatbots['gpt-4o'] = ChatBot(OPENAI_API_KEY, 'gpt-4o', 'openai')
-        chatbots['gpt-4o-mini'] = ChatBot(OPENAI_API_KEY, 'gpt-4o-mini', 'openai')
+        'gpt-4o': (OPENAI_API_KEY, 'gpt-4o', 'openai'),
+        'gpt-4o-mini': (OPENAI_API_KEY, 'gpt-4o-mini', 'openai'),
         
         # 기타
-        chatbots['gpt-4-turbo'] = ChatBot(OPENAI_API_KEY, 'gpt-4-turbo', 'openai')
-        chatbots['gpt-3.5-turbo'] = ChatBot(OPENAI_API_KEY, 'gpt-3.5-turbo', 'openai')
-        
-        # 하위 호환성
-        chatbots['gpt'] = ChatBot(OPENAI_API_KEY, 'gpt-4o', 'openai')
-        print(f"✅ GPT 모델 초기화 성공: GPT-5, GPT-5-Mini, GPT-4.1, GPT-4o, GPT-4o-mini")
-except ValueError as e:
-    print(f"❌ GPT 모델 초기화 실패: {e}")
+        'gpt-4-turbo': (OPENAI_API_KEY, 'gpt-4-turbo', 'openai'),
+        'gpt-3.5-turbo': (OPENAI_API_KEY, 'gpt-3.5-turbo', 'openai'),
+    })
+    logger.info("✅ GPT 모델 등록: GPT-5, GPT-5-Mini, GPT-4.1, GPT-4o, GPT-4o-mini")
 
 # === Claude 모델들 ===
-try:
-    if ANTHROPIC_API_KEY:
+if ANTHROPIC_API_KEY:
+    MODEL_SPECS.update({
         # Claude-4 시리즈 (최신)
-        chatbots['claude-4-opus'] = ChatBot(ANTHROPIC_API_KEY, 'claude-4-opus', 'anthropic')
+        'claude-4-opus': (ANTHROPIC_API_KEY, 'claude-4-opus', 'anthropic'),
         
         # Claude-3.7 시리즈
-        chatbots['claude-3.7-sonnet'] = ChatBot(ANTHROPIC_API_KEY, 'claude-3-7-sonnet', 'anthropic')
+        'claude-3.7-sonnet': (ANTHROPIC_API_KEY, 'claude-3-7-sonnet', 'anthropic'),
         
         # Claude-3.5 시리즈
-        chatbots['claude-3.5-sonnet'] = ChatBot(ANTHROPIC_API_KEY, 'claude-3-5-sonnet-20241022', 'anthropic')
-        chatbots['claude-3.5-haiku'] = ChatBot(ANTHROPIC_API_KEY, 'claude-3-5-haiku-20241022', 'anthropic')
+        'claude-3.5-sonnet': (ANTHROPIC_API_KEY, 'claude-3-5-sonnet-20241022', 'anthropic'),
+        'claude-3.5-haiku': (ANTHROPIC_API_KEY, 'claude-3-5-haiku-20241022', 'anthropic'),
         
         # Claude-3 시리즈 (하위 호환)
-        chatbots['claude-3-opus'] = ChatBot(ANTHROPIC_API_KEY, 'claude-3-opus-20240229', 'anthropic')
-        chatbots['claude-3-sonnet'] = ChatBot(ANTHROPIC_API_KEY, 'claude-3-5-sonnet-20241022', 'anthropic')
-        chatbots['claude-3-haiku'] = ChatBot(ANTHROPIC_API_KEY, 'claude-3-5-haiku-20241022', 'anthropic')
-        
-        # 하위 호환성
-        chatbots['claude'] = ChatBot(ANTHROPIC_API_KEY, 'claude-3-5-sonnet-20241022', 'anthropic')
-        print(f"✅ Claude 모델 초기화 성공: Claude-4, 3.7, 3.5, 3")
-except ValueError as e:
-    print(f"❌ Claude 모델 초기화 실패: {e}")
+        'claude-3-opus': (ANTHROPIC_API_KEY, 'claude-3-opus-20240229', 'anthropic'),
+    })
+    logger.info("✅ Claude 모델 등록: Claude-4, 3.7, 3.5, 3")
 
 # === Gemini 모델들 ===
-try:
-    if GEMINI_API_KEY:
-        genai.configure(api_key=GEMINI_API_KEY)
-        
+if GEMINI_API_KEY:
+    _get_provider_client('gemini', GEMINI_API_KEY)
+    MODEL_SPECS.update({
         # Gemini 2.5 시리즈
-        chatbots['gemini-2.5-pro'] = ChatBot(GEMINI_API_KEY, 'gemini-2.5-pro', 'gemini')
-        chatbots['gemini-2.5-flash'] = ChatBot(GEMINI_API_KEY, 'gemini-2.5-flash', 'gemini')
+        'gemini-2.5-pro': (GEMINI_API_KEY, 'gemini-2.5-pro', 'gemini'),
+        'gemini-2.5-flash': (GEMINI_API_KEY, 'gemini-2.5-flash', 'gemini'),
         
         # Gemini 2.0 시리즈
-        chatbots['gemini-2.0-flash-exp'] = ChatBot(GEMINI_API_KEY, 'gemini-2.0-flash-exp', 'gemini')
-        chatbots['gemini-2.0-flash-lite'] = ChatBot(GEMINI_API_KEY, 'gemini-2.0-flash-lite', 'gemini')
-        
-        # 하위 호환성 (기존 프론트엔드 호환)
-        chatbots['gemini-pro-1.5'] = ChatBot(GEMINI_API_KEY, 'gemini-2.0-flash-exp', 'gemini')
-        chatbots['gemini-pro-1.0'] = ChatBot(GEMINI_API_KEY, 'gemini-2.5-flash', 'gemini')
-        chatbots['gemini'] = ChatBot(GEMINI_API_KEY, 'gemini-2.5-flash', 'gemini')
-        
-        print(f"✅ Gemini 모델 초기화 성공: 2.5-Pro, 2.5-Flash, 2.0-Flash-Exp, 2.0-Flash-Lite")
-except ValueError as e:
-    print(f"❌ Gemini 모델 초기화 실패: {e}")
+        'gemini-2.0-flash-exp': (GEMINI_API_KEY, 'gemini-2.0-flash-exp', 'gemini'),
+        'gemini-2.0-flash-lite': (GEMINI_API_KEY, 'gemini-2.0-flash-lite', 'gemini'),
+    })
+    logger.info("✅ Gemini 모델 등록: 2.5-Pro, 2.5-Flash, 2.0-Flash-Exp, 2.0-Flash-Lite")
 
 # === HyperCLOVA X 모델들 (Naver Clova Studio) ===
-try:
-    if HYPERCLOVA_API_KEY:
-        # HyperCLOVA X Studio API로 자유 대화 가능
-        # HCX-003: 고성능 모델 (사용 가능 시)
-        # HCX-DASH-001: 빠른 모델 (사용 가능 시)
-        # HCX-005: 기본 모델 (권장)
-        chatbots['clova-hcx-003'] = ChatBot('dummy_key', 'HCX-005', 'clova')  # HCX-005 사용
-        chatbots['clova-hcx-dash-001'] = ChatBot('dummy_key', 'HCX-005', 'clova')  # HCX-005 사용
-        print(f"✅ HyperCLOVA X 모델 초기화 성공: HCX-005 (고성능), HCX-005 (빠름)")
-    else:
-        print(f"⚠️ HyperCLOVA X API 설정이 없습니다. HYPERCLOVA_API_KEY를 .env에 설정해주세요.")
-except ValueError as e:
-    print(f"❌ HyperCLOVA X 모델 초기화 실패: {e}")
+if HYPERCLOVA_API_KEY:
+    # HyperCLOVA X Studio API로 자유 대화 가능
+    # HCX-003: 고성능 모델 (사용 가능 시)
+    # HCX-DASH-001: 빠른 모델 (사용 가능 시)
+    # HCX-005: 기본 모델 (권장)
+    MODEL_SPECS.update({
+        'clova-hcx-003': ('dummy_key', 'HCX-005', 'clova'),  # HCX-005 사용
+        'clova-hcx-dash-001': ('dummy_key', 'HCX-005', 'clova'),  # HCX-005 사용
+    })
+    logger.info("✅ HyperCLOVA X 모델 등록: HCX-005 (고성능), HCX-005 (빠름)")
+else:
+    logger.warning("⚠️ HyperCLOVA X API 설정이 없습니다. HYPERCLOVA_API_KEY를 .env에 설정해주세요.")
 
 # === 기타 모델 (하위 호환성) ===
-try:
-    if GROQ_API_KEY:
-        chatbots['mixtral'] = ChatBot(GROQ_API_KEY, 'llama-3.1-8b-instant', 'groq')
-        chatbots['optimal'] = ChatBot(GROQ_API_KEY, 'llama-3.1-8b-instant', 'groq')
-except ValueError as e:
-    print(f"❌ Groq 모델 초기화 실패: {e}")
+if GROQ_API_KEY:
+    MODEL_SPECS.update({
+        'mixtral': (GROQ_API_KEY, 'llama-3.1-8b-instant', 'groq'),
+    })
+
+# 모델별로 스펙을 검증해 잘못된 항목 하나만 제외 (제공자 단위로 통째로 빠지지 않도록)
+for model_name, (api_key, model_id, api_type) in list(MODEL_SPECS.items()):
+    if not api_key or not model_id or api_type not in SUPPORTED_API_TYPES:
+        logger.warning("⚠️ %s 모델 스펙이 올바르지 않아 제외합니다: (%s, %s)", model_name, model_id, api_type)
+        del MODEL_SPECS[model_name]
+
+# 하위 호환용 별칭 -> 같은 모델을 쓰는 대표 모델명 (같은 ChatBot 인스턴스 공유)
+# clova-hcx-003 / clova-hcx-dash-001은 둘 다 HCX-005이지만 최적 답변 모드에서
+# 동시에 선택될 수 있으므로 대화 히스토리가 섞이지 않도록 별도 인스턴스로 유지
+MODEL_ALIASES = {
+    'gpt': 'gpt-4o',
+    'claude-3-sonnet': 'claude-3.5-sonnet',
+    'claude-3-haiku': 'claude-3.5-haiku',
+    'claude': 'claude-3.5-sonnet',
+    'gemini-pro-1.5': 'gemini-2.0-flash-exp',
+    'gemini-pro-1.0': 'gemini-2.5-flash',
+    'gemini': 'gemini-2.5-flash',
+    'optimal': 'mixtral',
+}
+
+chatbots = LazyChatBotRegistry(MODEL_SPECS, MODEL_ALIASES)
+
+# 세션별 ChatBot: 인스턴스는 프로세스 내 LRU에, 대화 이력은 Django cache에 보관
+# (공유 chatbots 인스턴스를 쓰면 모든 사용자의 대화 이력이 한 리스트에 섞임)
+SESSION_BOT_POOL_SIZE = 256
+SESSION_HISTORY_TIMEOUT = 3600  # 1시간
+_session_bots = OrderedDict()
+_session_bots_lock = threading.Lock()
+
+
+def _session_history_key(session_id, bot_name):
+    return f"chatbot_history_{session_id}_{bot_name}"
+
+
+def _canonical_bot_name(bot_name):
+    """별칭은 대상 모델명으로 변환 (별칭과 대상 모델이 같은 세션 이력을 사용)"""
+    return MODEL_ALIASES.get(bot_name, bot_name)
+
+
+def get_session_chatbot(session_id, bot_name):
+    """세션 전용 ChatBot 반환 (없는 모델이면 KeyError)
+
+    SDK 클라이언트는 공유 클라이언트를 재사용하므로 인스턴스 생성 비용이 작고,
+    대화 이력은 요청마다 cache에서 복원한다 (REDIS_URL로 공유 캐시를 설정해야 여러 워커 프로세스 사이에서도 이어짐).
+    같은 세션의 동시 요청이 서로의 대화 이력을 덮어쓰지 않도록 요청마다 복사본을 돌려준다.
+    """
+    bot_name = _canonical_bot_name(bot_name)
+    base_bot = chatbots[bot_name]
+    pool_key = (session_id, bot_name)
+    with _session_bots_lock:
+        bot = _session_bots.get(pool_key)
+        if bot is None:
+            bot = ChatBot(base_bot.api_key, base_bot.model, base_bot.api_type)
+            _session_bots[pool_key] = bot
+            while len(_session_bots) > SESSION_BOT_POOL_SIZE:
+                _session_bots.popitem(last=False)
+        else:
+            _session_bots.move_to_end(pool_key)
+        request_bot = copy.copy(bot)
+    request_bot.conversation_history = cache.get(_session_history_key(session_id, bot_name)) or []
+    return request_bot
+
+
+def save_session_chatbot(session_id, bot_name, bot):
+    """get_session_chatbot으로 받은 ChatBot의 대화 이력을 cache에 저장"""
+    bot_name = _canonical_bot_name(bot_name)
+    cache.set(_session_history_key(session_id, bot_name), bot.conversation_history, SESSION_HISTORY_TIMEOUT)
+    # 진행 중인 대화 이력 요약은 다음 요청의 복사본이 이어받도록 풀의 인스턴스에 반영
+    with _session_bots_lock:
+        pooled_bot = _session_bots.get((session_id, bot_name))
+        if pooled_bot is not None:
+            pooled_bot._pending_summary = bot._pending_summary
+
+
+def clear_session_histories(session_id, bot_names=None):
+    """세션의 대화 이력 초기화 (bot_names가 없으면 모든 모델)"""
+    if bot_names is None:
+        bot_names = list(chatbots)
+    bot_names = {_canonical_bot_name(name) for name in bot_names}
+    cache.delete_many([_session_history_key(session_id, name) for name in bot_names])
+    with _session_bots_lock:
+        for name in bot_names:
+            _session_bots.pop((session_id, name), None)
@@ -5,89 +5,157 @@ import re
 import json
 import ast
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-def get_user_friendly_error_message(error: Exception) -> str:
-    """API 예외를 사용자가 이해하기 쉬운 한국어 메시지로 변환"""
-    raw_message = str(error) if error else ""
-    lower_message = raw_message.lower()
-    error_payload = None
-
-    if raw_message:
-        json_like_match = re.search(r"\{.*\}", raw_message, re.DOTALL)
-        if json_like_match:
-            json_like_text = json_like_match.group(0)
-            try:
-                error_payload = ast.literal_eval(json_like_text)
-            except (ValueError, SyntaxError):
-                try:
-                    error_payload = json.loads(json_like_text)
-                except json.JSONDecodeError:
-                    error_payload = None
-
-    if isinstance(error_payload, dict):
-        payload_error = error_payload.get("error") or {}
-        payload_code = payload_error.get("code") or error_payload.get("code")
-        payload_message = payload_error.get("message") or error_payload.get("message") or ""
-    else:
-        payload_code = None
-        payload_message = ""
-
-    combined_message = f"{payload_code or ''} {payload_message}".lower()
 
-    # 429 오류 (Rate Limit)
-    if "429" in raw_message or any(keyword in (lower_message or "") for keyword in ["rate_limit_exceeded", "tokens per min", "requests per min", "tpm limit", "rate limit", "quota exceeded", "quota_exceeded"]) \
-            or any(keyword in combined_message for keyword in ["rate_limit_exceeded", "tokens per min", "requests per min", "tpm limit", "rate limit", "quota exceeded", "quota_exceeded"]):
-        return "모델 사용량이 초과되었습니다. 다른 모델을 사용해주세요."
+def _keyword_pattern(keywords):
+    """키워드 목록을 하나의 정규식(alternation)으로 컴파일"""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
 
-    # 401 오류 (인증 실패)
-    if "401" in raw_message or any(keyword in (lower_message or "") for keyword in ["invalid_api_key", "incorrect api key", "authentication error", "unauthorized", "invalid key"]) \
-            or any(keyword in combined_message for keyword in ["invalid_api_key", "incorrect api key", "authentication error", "unauthorized", "invalid key"]):
-        return "API 인증에 실패했습니다. API 키를 다시 확인해 주세요."
 
-    # 403 오류 (권한 없음)
-    if "403" in raw_message or any(keyword in (lower_message or "") for keyword in ["forbidden", "access denied", "permission denied"]) \
-            or any(keyword in combined_message for keyword in ["forbidden", "access denied", "permission denied"]):
-        return "접근 권한이 없습니다. API 키 권한을 확인해 주세요."
+def _status_code_pattern(codes):
+    """숫자 경계를 고려한 상태 코드 정규식 컴파일 (예: 14290 은 429로 인식하지 않음)"""
+    return re.compile(r"(?<!\d)(?:" + "|".join(codes) + r")(?!\d)")
 
-    # 400 오류 (잘못된 요청)
-    if "400" in raw_message or any(keyword in (lower_message or "") for keyword in ["bad request", "invalid request", "malformed request"]) \
-            or any(keyword in combined_message for keyword in ["bad request", "invalid request", "malformed request"]):
-        return "잘못된 요청입니다. 입력 내용을 확인해 주세요."
 
+# (상태 코드 패턴, 원본 메시지 키워드 패턴, payload 키워드 패턴, 사용자 메시지) - 우선순위 순서
+ERROR_CATEGORY_PATTERNS = [
+    # 429 오류 (Rate Limit)
+    (
+        _status_code_pattern(["429"]),
+        _keyword_pattern(["rate_limit_exceeded", "tokens per min", "requests per min", "tpm limit", "rate limit", "quota exceeded", "quota_exceeded"]),
+        None,
+        "모델 사용량이 초과되었습니다. 다른 모델을 사용해주세요.",
+    ),
+    # 401 오류 (인증 실패)
+    (
+        _status_code_pattern(["401"]),
+        _keyword_pattern(["invalid_api_key", "incorrect api key", "authentication error", "unauthorized", "invalid key"]),
+        None,
+        "API 인증에 실패했습니다. API 키를 다시 확인해 주세요.",
+    ),
+    # 403 오류 (권한 없음)
+    (
+        _status_code_pattern(["403"]),
+        _keyword_pattern(["forbidden", "access denied", "permission denied"]),
+        None,
+        "접근 권한이 없습니다. API 키 권한을 확인해 주세요.",
+    ),
+    # 400 오류 (잘못된 요청)
+    (
+        _status_code_pattern(["400"]),
+        _keyword_pattern(["bad request", "invalid request", "malformed request"]),
+        None,
+        "잘못된 요청입니다. 입력 내용을 확인해 주세요.",
+    ),
     # 404 오류 (리소스 없음)
-    if "404" in raw_message or any(keyword in (lower_message or "") for keyword in ["not found", "resource not found", "model not found"]) \
-            or any(keyword in combined_message for keyword in ["not found", "resource not found", "model not found"]):
-        return "요청한 리소스를 찾을 수 없습니다. 모델 이름을 확인해 주세요."
-
+    (
+        _status_code_pattern(["404"]),
+        _keyword_pattern(["not found", "resource not found", "model not found"]),
+        None,
+        "요청한 리소스를 찾을 수 없습니다. 모델 이름을 확인해 주세요.",
+    ),
     # 500/502/503 오류 (서버 오류)
-    if any(code in raw_message for code in ["500", "502", "503", "504"]) or any(keyword in (lower_message or "") for keyword in ["internal server error", "bad gateway", "service unavailable", "gateway timeout", "server error"]) \
-            or any(keyword in combined_message for keyword in ["internal server error", "bad gateway", "service unavailable", "gateway timeout", "server error"]):
-        return "서버에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해 주세요."
-
+    (
+        _status_code_pattern(["500", "502", "503", "504"]),
+        _keyword_pattern(["internal server error", "bad gateway", "service unavailable", "gateway timeout", "server error"]),
+        None,
+        "서버에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해 주세요.",
+    ),
     # 컨텍스트 길이 초과
-    if any(keyword in (lower_message or "") for keyword in ["context_length_exceeded", "maximum context length", "too many tokens", "context window", "token limit exceeded"]) \
-            or any(keyword in combined_message for keyword in ["context_length_exceeded", "maximum context length", "too many tokens", "context window", "token limit exceeded"]):
-        return "대화 길이가 너무 깁니다. 메시지를 줄이거나 새 대화를 시작해 주세요."
-
+    (
+        None,
+        _keyword_pattern(["context_length_exceeded", "maximum context length", "too many tokens", "context window", "token limit exceeded"]),
+        None,
+        "대화 길이가 너무 깁니다. 메시지를 줄이거나 새 대화를 시작해 주세요.",
+    ),
     # 네트워크 오류
-    if any(keyword in (lower_message or "") for keyword in ["connection", "network", "timeout", "connection error", "network error", "connection refused", "connection reset"]) \
-            or any(keyword in combined_message for keyword in ["connection", "network", "timeout", "connection error", "network error"]):
-        return "네트워크 연결에 문제가 발생했습니다. 인터넷 연결을 확인하고 잠시 후 다시 시도해 주세요."
-
+    (
+        None,
+        _keyword_pattern(["connection", "network", "timeout", "connection error", "network error", "connection refused", "connection reset"]),
+        _keyword_pattern(["connection", "network", "timeout", "connection error", "network error"]),
+        "네트워크 연결에 문제가 발생했습니다. 인터넷 연결을 확인하고 잠시 후 다시 시도해 주세요.",
+    ),
     # 안전 필터 (Gemini)
-    if any(keyword in (lower_message or "") for keyword in ["safety", "safety filter", "blocked", "content filter", "harmful content"]) \
-            or any(keyword in combined_message for keyword in ["safety", "safety filter", "blocked", "content filter"]):
-        return "콘텐츠 정책에 의해 차단되었습니다. 다른 질문을 시도해 주세요."
-
+    (
+        None,
+        _keyword_pattern(["safety", "safety filter", "blocked", "content filter", "harmful content"]),
+        _keyword_pattern(["safety", "safety filter", "blocked", "content filter"]),
+        "콘텐츠 정책에 의해 차단되었습니다. 다른 질문을 시도해 주세요.",
+    ),
     # 할당량 초과 (다양한 형태)
-    if any(keyword in (lower_message or "") for keyword in ["quota", "limit exceeded", "usage limit", "billing", "insufficient quota"]) \
-            or any(keyword in combined_message for keyword in ["quota", "limit exceeded", "usage limit", "billing", "insufficient quota"]):
-        return "사용량 한도를 초과했습니다. 다른 모델을 사용하거나 잠시 후 다시 시도해 주세요."
+    (
+        None,
+        _keyword_pattern(["quota", "limit exceeded", "usage limit", "billing", "insufficient quota"]),
+        None,
+        "사용량 한도를 초과했습니다. 다른 모델을 사용하거나 잠시 후 다시 시도해 주세요.",
+    ),
+]
+
+TIMEOUT_PATTERN = _keyword_pattern(["timeout", "timed out"])
+
+
+def _parse_error_payload(raw_message):
+    """오류 메시지에 포함된 JSON/dict 형태의 payload 추출 (첫 '{' ~ 마지막 '}')"""
+    start = raw_message.find("{")
+    end = raw_message.rfind("}")
+    if start < 0 or end <= start:
+        return None
+
+    candidate = raw_message[start:end + 1]
+    try:
+        # 대부분의 provider 오류는 JSON이므로 빠른 파서를 먼저 시도
+        if ORJSON_AVAILABLE:
+            return orjson.loads(candidate)
+        return json.loads(candidate)
+    except ValueError:
+        pass
+
+    # OpenAI SDK 등은 Python dict repr 형태로 payload를 포함함
+    try:
+        return ast.literal_eval(candidate)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return None
+
+
+def _build_combined_message(raw_message):
+    """payload의 code/message를 합친 소문자 문자열 (payload가 없으면 빈 문자열)"""
+    error_payload = _parse_error_payload(raw_message) if raw_message else None
+    if not isinstance(error_payload, dict):
+        return ""
+
+    payload_error = error_payload.get("error")
+    if not isinstance(payload_error, dict):
+        # {"error": "quota"}처럼 error가 문자열인 payload는 그 문자열을 message로 사용
+        payload_error = {"message": payload_error} if isinstance(payload_error, str) else {}
+    payload_code = payload_error.get("code") or error_payload.get("code")
+    payload_message = payload_error.get("message") or error_payload.get("message") or ""
+    return f"{payload_code or ''} {payload_message}".strip().lower()
+
+
+def get_user_friendly_error_message(error: Exception) -> str:
+    """API 예외를 사용자가 이해하기 쉬운 한국어 메시지로 변환"""
+    raw_message = str(error) if error else ""
+    lower_message = raw_message.lower()
+    combined_message = None  # 원본 메시지로 분류되지 않을 때만 payload 파싱
+
+    for status_pattern, keyword_pattern, payload_pattern, friendly_message in ERROR_CATEGORY_PATTERNS:
+        if status_pattern is not None and status_pattern.search(raw_message):
+            return friendly_message
+        if keyword_pattern.search(lower_message):
+            return friendly_message
+        if combined_message is None:
+            combined_message = _build_combined_message(raw_message)
+        if combined_message and (payload_pattern or keyword_pattern).search(combined_message):
+            return friendly_message
 
     # 타임아웃 오류 (명시적 처리)
-    if "timeout" in lower_message or "timed out" in lower_message:
+    if TIMEOUT_PATTERN.search(lower_message):
         return "요청 시간이 초과되었습니다. 서버 응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요."
 
     # 기본 오류 메시지 (원본 오류 코드 숨김)
     return "오류가 발생했습니다. 잠시 후 다시 시도해 주세요."
-
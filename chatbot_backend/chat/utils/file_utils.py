@@ -3,64 +3,271 @@
 """
 import io
 import os
+import importlib.util
+import asyncio
+import logging
 import PyPDF2
+import numpy as np
 from PIL import Image
 import pytesseract
 import hashlib
+import binascii
 import threading
 import openai
-import base64
 import time
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urljoin
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pdf2image import convert_from_bytes
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from asgiref.sync import async_to_sync
 
+from .ai_utils import ollama_chat_content
 
-# 이미지 분석 캐시 (중복 실행 방지)
-_image_analysis_cache = {}
-_image_analysis_locks = {}
-_cache_lock = threading.Lock()
+# BLAKE3 (선택) - 없으면 hashlib 스트리밍 해시 사용
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+
+# pybase64 (선택) - SIMD 가속 base64, 없으면 표준 base64 사용 (API 동일)
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+
+# PyMuPDF (선택) - MuPDF(C) 기반으로 PyPDF2보다 텍스트 추출이 훨씬 빠름, 없으면 PyPDF2 사용
+try:
+    import fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+
+# pypdfium2 (선택) - PDFium(C++) 바인딩, PyMuPDF가 없을 때 PyPDF2보다 먼저 사용
+try:
+    import pypdfium2 as pdfium
+    PYPDFIUM2_AVAILABLE = True
+except ImportError:
+    PYPDFIUM2_AVAILABLE = False
+
+
+# tesserocr (선택) - libtesseract를 직접 호출해 OCR마다 tesseract 프로세스를 띄우지 않음
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# PaddleOCR (선택) - CUDA GPU가 있으면 스캔 문서 OCR을 GPU에서 수행 (모델이 무거워 실제 로드는 첫 사용 시)
+PADDLEOCR_AVAILABLE = importlib.util.find_spec("paddleocr") is not None
+
+logger = logging.getLogger(__name__)
+
+OCR_LANG = 'kor+eng'
+
+# 스레드별로 한 번만 로드하는 tesserocr API (PyTessBaseAPI는 스레드 안전하지 않으므로 스레드마다 따로 보유)
+_tess_local = threading.local()
+
+# PDF OCR 병렬 스레드 수 상한
+OCR_MAX_WORKERS = 8
+
+# PDF 페이지 OCR용 공용 스레드 풀 (스레드가 유지되므로 스레드별 tesserocr 모델도 한 번만 로드됨)
+_OCR_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(OCR_MAX_WORKERS, os.cpu_count() or 1), thread_name_prefix="pdf-ocr"
+)
+
+# 프로세스당 한 번만 로드하는 GPU OCR 모델 (None: 미초기화, False: 사용 불가)
+_gpu_ocr = None
+_gpu_ocr_lock = threading.Lock()
+
+# 이미지 공개 URL 베이스 (설정 시 base64 대신 URL로 OpenAI에 전달, 예: https://cdn.example.com/media/)
+IMAGE_ANALYSIS_PUBLIC_BASE_URL = os.getenv('IMAGE_ANALYSIS_PUBLIC_BASE_URL', '')
+IMAGE_ANALYSIS_UPLOAD_DIR = 'image_analysis'
+
+# 파일 스트리밍 base64 인코딩 청크 크기 (3의 배수여야 청크 사이에 패딩이 생기지 않음)
+B64_CHUNK_SIZE = 57 * 1024
+
+# 이미지 분석 응답 토큰 상한 (실제 한도는 이미지 크기에 따라 조정)
+IMAGE_ANALYSIS_MAX_TOKENS = 500
+
+# OCR/Vision 모델에 넘기기 전 이미지 긴 변 최대 픽셀 (모델이 어차피 내부에서 줄이므로 미리 축소)
+IMAGE_MAX_SIDE = 1600
+# Vision API로 보낼 이미지를 JPEG로 다시 인코딩할 때의 품질
+IMAGE_JPEG_QUALITY = 85
+
+# 이미지 분석 캐시 (중복 실행 방지, LRU)
+IMAGE_ANALYSIS_CACHE_SIZE = 100
+_image_analysis_cache = OrderedDict()
+_image_analysis_inflight = {}  # 해시 -> 분석 중인 요청의 Future (진행 중인 동안만 유지)
+_fast_key_to_hash = OrderedDict()  # (실제 경로, 크기, mtime_ns) -> 내용 해시 (LRU)
+_cache_lock = threading.RLock()
+
+# 이 페이지 수만큼 읽었는데 텍스트가 전혀 없으면 스캔 PDF로 판단
+PDF_TEXT_PROBE_PAGES = 5
+
+# 여러 파일 동시 처리 시 스레드 수 상한과 파일당 최대 크기
+UPLOAD_MAX_WORKERS = 4
+MAX_UPLOAD_FILE_SIZE = 50 * 1024 * 1024
+
+# 전체 내용 모드 / 요약 모드에서 사용하는 최대 글자 수
+FULL_CONTENT_LIMIT = 50000
+SUMMARY_INPUT_LIMIT = 12000
+
+# 이 길이(약 300토큰) 미만의 텍스트는 요약하지 않고 그대로 사용
+SUMMARY_SHORT_INPUT_LIMIT = 1200
+# 긴 텍스트는 이 크기의 청크로 나눠 병렬 요약(map) 후 하나로 합침(reduce)
+SUMMARY_CHUNK_SIZE = 4000
+
+# 문서 요약 캐시 (동일 문서 재업로드 시 Ollama 재호출 방지, LRU)
+SUMMARY_CACHE_SIZE = 256
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def _iter_pdf_page_texts(file_content):
+    """PDF 페이지별 텍스트 (PyMuPDF > pypdfium2 > PyPDF2 순으로 사용 가능한 엔진 선택)"""
+    if PYMUPDF_AVAILABLE:
+        with fitz.open(stream=file_content, filetype='pdf') as doc:
+            for page in doc:
+                yield page.get_text("text") or ""
+        return
+    
+    if PYPDFIUM2_AVAILABLE:
+        # bytes를 그대로 넘기므로 BytesIO 복사가 없음
+        pdf = pdfium.PdfDocument(file_content)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range() or ""
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+        return
+    
+    pdf_buffer = io.BufferedReader(io.BytesIO(file_content), buffer_size=1024 * 1024)
+    pdf_reader = PyPDF2.PdfReader(pdf_buffer, strict=False)
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ""
 
 
 def extract_text_from_pdf(file_content):
     """PDF에서 텍스트 추출 (직접 추출 + OCR 백업)"""
     try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
+        page_texts = []
+        extracted_length = 0  # 공백 제외 누적 길이 (OCR 전환 판단용)
         
-        # 먼저 직접 텍스트 추출 시도
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            page_text = page.extract_text()
-            text += page_text + "\n"
+        # 먼저 직접 텍스트 추출 시도 (페이지별로 모아서 마지막에 한 번만 결합)
+        for page_text in _iter_pdf_page_texts(file_content):
+            page_texts.append(page_text)
+            extracted_length += len(page_text.strip())
+            
+            # 앞쪽 페이지에 텍스트 레이어가 전혀 없으면 스캔본으로 보고 나머지 페이지 파싱 없이 OCR로 전환
+            if len(page_texts) == PDF_TEXT_PROBE_PAGES and extracted_length == 0:
+                break
         
         # 추출된 텍스트가 충분하지 않으면 OCR 시도
-        if len(text.strip()) < 100:  # 텍스트가 너무 적으면 OCR 사용
-            print("PDF 직접 추출 텍스트가 부족하여 OCR을 사용합니다.")
+        if extracted_length < 100:  # 텍스트가 너무 적으면 OCR 사용
+            logger.info("PDF 직접 추출 텍스트가 부족하여 OCR을 사용합니다.")
             return extract_text_from_pdf_ocr(file_content)
         
-        return text.strip()
+        return "\n".join(page_texts).strip()
     except Exception as e:
-        print(f"PDF 직접 추출 실패, OCR을 사용합니다: {str(e)}")
+        logger.warning("PDF 직접 추출 실패, OCR을 사용합니다: %s", e)
         return extract_text_from_pdf_ocr(file_content)
 
 
+def _get_tess_api():
+    """현재 스레드의 tesserocr API 지연 초기화"""
+    api = getattr(_tess_local, 'api', None)
+    if api is None:
+        api = PyTessBaseAPI(lang=OCR_LANG, psm=PSM.AUTO)
+        _tess_local.api = api
+    return api
+
+
+def _get_gpu_ocr():
+    """GPU용 PaddleOCR 지연 초기화 (PaddleOCR 미설치 또는 CUDA GPU가 없으면 None)"""
+    global _gpu_ocr
+    if not PADDLEOCR_AVAILABLE:
+        return None
+    if _gpu_ocr is None:
+        with _gpu_ocr_lock:
+            if _gpu_ocr is None:
+                try:
+                    import paddle
+                    from paddleocr import PaddleOCR
+                    if paddle.device.is_compiled_with_cuda() and paddle.device.cuda.device_count() > 0:
+                        _gpu_ocr = PaddleOCR(lang='korean', use_angle_cls=False, use_gpu=True, show_log=False)
+                        logger.info("🚀 GPU OCR(PaddleOCR) 사용")
+                    else:
+                        _gpu_ocr = False
+                except Exception as e:
+                    logger.warning("GPU OCR 초기화 실패, tesseract를 사용합니다: %s", e)
+                    _gpu_ocr = False
+    return _gpu_ocr or None
+
+
+def _gpu_image_to_string(gpu_ocr, image):
+    """PaddleOCR로 OCR 수행 (모델 하나를 공유하므로 Lock으로 직렬화, GPU에서는 충분히 빠름)"""
+    with _gpu_ocr_lock:
+        result = gpu_ocr.ocr(np.asarray(image.convert('RGB')), cls=False)
+    lines = result[0] if result and result[0] else []
+    return "\n".join(line[1][0] for line in lines)
+
+
+def ocr_image(image):
+    """OCR 수행 (GPU OCR > tesserocr(미리 로드된 모델 재사용) > pytesseract 순)"""
+    gpu_ocr = _get_gpu_ocr()
+    if gpu_ocr is not None:
+        return _gpu_image_to_string(gpu_ocr, image)
+    if TESSEROCR_AVAILABLE:
+        api = _get_tess_api()
+        api.SetImage(image)
+        return api.GetUTF8Text()
+    return pytesseract.image_to_string(image, lang=OCR_LANG)
+
+
+def _ocr_page(image):
+    """PDF 한 페이지 이미지 OCR (스레드 풀 워커에서 실행)"""
+    # OCR 수행 (페이지는 Poppler에서 이미 그레이스케일로 렌더링됨)
+    return ocr_image(image)
+
+
 def extract_text_from_pdf_ocr(file_content):
-    """PDF를 이미지로 변환 후 OCR로 텍스트 추출"""
+    """PDF를 이미지로 변환 후 OCR로 텍스트 추출 (페이지별 병렬 처리)"""
     try:
-        # PDF를 이미지로 변환
-        images = convert_from_bytes(file_content, dpi=300)
-        all_text = ""
+        # PDF를 그레이스케일 이미지로 변환 (Poppler가 직접 L 모드로 렌더링)
+        images = convert_from_bytes(
+            file_content,
+            dpi=300,
+            grayscale=True,
+            thread_count=os.cpu_count() or 1
+        )
+        if not images:
+            return ""
         
-        for i, image in enumerate(images):
-            # 간단한 이미지 전처리 (NumPy 없이)
-            # 이미지를 그레이스케일로 변환
-            if image.mode != 'L':
-                image = image.convert('L')
-            
-            # OCR 수행 (전처리 없이)
-            page_text = pytesseract.image_to_string(image, lang='kor+eng')
-            all_text += f"\n--- 페이지 {i+1} ---\n{page_text}\n"
+        # 페이지가 여러 장이면 스레드로 병렬 OCR
+        # (tesseract/libtesseract는 인식 중 GIL을 놓으므로 프로세스 간 이미지 복사 없이 병렬화됨)
+        if len(images) == 1 or _get_gpu_ocr() is not None:
+            # GPU OCR은 모델 하나를 순서대로 사용하므로 스레드 풀 불필요
+            page_texts = [_ocr_page(image) for image in images]
+        else:
+            page_texts = list(_OCR_EXECUTOR.map(_ocr_page, images))
         
+        all_text = "".join(
+            f"\n--- 페이지 {i+1} ---\n{page_text}\n"
+            for i, page_text in enumerate(page_texts)
+        )
         return all_text.strip()
     except Exception as e:
         return f"PDF OCR 처리 중 오류 발생: {str(e)}"
@@ -72,12 +279,18 @@ def extract_text_from_image(file_content):
         # 이미지 열기
         image = Image.open(io.BytesIO(file_content))
         
+        # JPEG 등은 디코딩 단계에서 바로 그레이스케일로, 가능하면 축소된 크기로 읽기
+        image.draft('L', (IMAGE_MAX_SIDE, IMAGE_MAX_SIDE))
+        
+        # 큰 사진은 긴 변을 IMAGE_MAX_SIDE 이하로 축소 (OCR 시간은 픽셀 수에 비례)
+        image.thumbnail((IMAGE_MAX_SIDE, IMAGE_MAX_SIDE), Image.LANCZOS)
+        
         # 이미지 전처리 (간단한 방식)
         if image.mode != 'L':
             image = image.convert('L')  # 그레이스케일로 변환
         
         # OCR 수행 (한국어 + 영어)
-        text = pytesseract.image_to_string(image, lang='kor+eng')
+        text = ocr_image(image)
         
         return text.strip()
     except Exception as e:
@@ -93,16 +306,16 @@ def process_uploaded_file(file):
         file_content = file.read()
         
         if not file_content:
-            print(f"⚠️ 파일 내용이 비어있습니다: {file.name}")
+            logger.warning("⚠️ 파일 내용이 비어있습니다: %s", file.name)
             return "파일 내용을 읽을 수 없습니다."
         
         file_extension = file.name.split('.')[-1].lower()
         
         if file_extension == 'pdf':
             extracted_text = extract_text_from_pdf(file_content)
-            print(f"✅ PDF 텍스트 추출 완료: {len(extracted_text)}자")
+            logger.debug("✅ PDF 텍스트 추출 완료: %d자", len(extracted_text))
             if len(extracted_text.strip()) < 50:
-                print(f"⚠️ 추출된 텍스트가 매우 짧습니다. OCR을 시도할 수 있습니다.")
+                logger.debug("⚠️ 추출된 텍스트가 매우 짧습니다. OCR을 시도할 수 있습니다.")
             return extracted_text
         elif file_extension in ['jpg', 'jpeg', 'png', 'bmp', 'tiff']:
             # 이미지 파일의 경우 파일 경로를 반환 (Ollama가 직접 읽도록)
@@ -110,13 +323,136 @@ def process_uploaded_file(file):
         else:
             return "지원하지 않는 파일 형식입니다. PDF 또는 이미지 파일을 업로드해주세요."
     except Exception as e:
-        print(f"❌ 파일 처리 오류: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ 파일 처리 오류: %s", e)
         return f"파일 처리 중 오류가 발생했습니다: {str(e)}"
 
 
-def summarize_content(content, api_key=None, file_path=None, full_content=False):
+def process_uploaded_files(files):
+    """여러 업로드 파일을 스레드 풀에서 동시에 처리 (입력 순서대로 결과 반환)
+    
+    PDF 파싱과 OCR이 파일 간에 겹치도록 하되, 큰 PDF 여러 개로 메모리가 부족해지지 않게
+    동시 처리 수는 UPLOAD_MAX_WORKERS로, 파일 크기는 MAX_UPLOAD_FILE_SIZE로 제한한다.
+    """
+    files = list(files)
+    if not files:
+        return []
+    
+    results = [None] * len(files)
+    accepted = []
+    for index, file in enumerate(files):
+        file_size = getattr(file, 'size', None)
+        if file_size is not None and file_size > MAX_UPLOAD_FILE_SIZE:
+            logger.warning("⚠️ 파일이 너무 큽니다 (%d bytes): %s", file_size, file.name)
+            results[index] = f"파일이 너무 큽니다. {MAX_UPLOAD_FILE_SIZE // (1024 * 1024)}MB 이하의 파일을 업로드해주세요."
+        else:
+            accepted.append((index, file))
+    
+    if len(accepted) == 1:
+        index, file = accepted[0]
+        results[index] = process_uploaded_file(file)
+    elif accepted:
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_MAX_WORKERS, len(accepted))) as executor:
+            processed = executor.map(process_uploaded_file, [file for _, file in accepted])
+            for (index, _), result in zip(accepted, processed):
+                results[index] = result
+    return results
+
+
+# 요약 프롬프트
+_SUMMARY_PROMPT = """당신은 문서 내용을 요약하는 전문가입니다. 
+
+주어진 내용이 PDF에서 추출된 텍스트인 경우:
+- OCR 오류나 불완전한 텍스트가 있을 수 있음을 고려
+- 가능한 한 원문의 의도를 파악하여 요약
+- 중요한 정보는 보존하되 간결하게 정리
+
+요약 시 다음을 포함해주세요:
+1. 문서의 주요 주제/목적
+2. 핵심 내용과 중요한 포인트
+3. 결론이나 요약 (있는 경우)
+
+원문의 주요 내용을 보존하면서도 간결하게 작성해주세요.
+
+다음 내용을 요약해주세요:
+
+{content}"""
+
+# 청크별 부분 요약을 하나로 합치는 프롬프트
+_SUMMARY_REDUCE_PROMPT = """당신은 문서 내용을 요약하는 전문가입니다. 
+
+다음은 하나의 문서를 여러 부분으로 나눠 각각 요약한 결과입니다.
+중복되는 내용은 합치고, 부분 간의 흐름을 살려 하나의 요약으로 정리해주세요.
+
+요약 시 다음을 포함해주세요:
+1. 문서의 주요 주제/목적
+2. 핵심 내용과 중요한 포인트
+3. 결론이나 요약 (있는 경우)
+
+부분 요약:
+
+{content}"""
+
+# ChatBot 대화 이력 압축용 요약 프롬프트
+_CONVERSATION_SUMMARY_PROMPT = """당신은 대화 내용을 요약하는 전문가입니다. 
+
+다음은 사용자와 AI 어시스턴트가 나눈 이전 대화입니다.
+맨 앞에는 그보다 더 이전 대화의 요약이 있을 수 있습니다.
+이후 대화를 이어가는 데 필요한 맥락이 남도록 하나의 요약으로 정리해주세요.
+
+요약 시 다음을 포함해주세요:
+1. 사용자가 물어본 주제와 요청 사항
+2. AI가 답변한 핵심 내용과 정해진 사항
+3. 사용자가 밝힌 조건/선호와 아직 해결되지 않은 질문
+
+인사말이나 반복되는 내용은 생략하고, 최근 대화일수록 자세히 남겨주세요.
+
+대화:
+
+{content}"""
+
+
+def _split_summary_chunks(content, chunk_size=SUMMARY_CHUNK_SIZE):
+    """문단 경계를 기준으로 텍스트를 chunk_size 이하의 청크로 나눔 (문단 자체가 길면 잘라서 나눔)"""
+    if len(content) <= chunk_size:
+        return [content]
+    
+    chunks = []
+    current = []
+    current_len = 0
+    for paragraph in content.split('\n\n'):
+        pieces = [paragraph[i:i + chunk_size] for i in range(0, len(paragraph), chunk_size)] or ['']
+        for piece in pieces:
+            added_len = len(piece) + (2 if current else 0)
+            if current and current_len + added_len > chunk_size:
+                chunks.append('\n\n'.join(current))
+                current = []
+                current_len = 0
+                added_len = len(piece)
+            current.append(piece)
+            current_len += added_len
+    if current:
+        chunks.append('\n\n'.join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+async def _ollama_summarize(prompt, num_predict=1500):
+    """요약 프롬프트 하나를 Ollama로 실행 (같은 요청은 LLM 캐시 사용)"""
+    return await ollama_chat_content(
+        model='llama3.2:latest',  # 또는 사용 가능한 다른 모델
+        messages=[
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ],
+        options={
+            'temperature': 0.3,
+            'num_predict': num_predict
+        }
+    )
+
+
+def summarize_content(content, api_key=None, file_path=None, full_content=False, file_bytes=None):
     """내용을 요약하는 함수 (Ollama 사용)
     
     Args:
@@ -124,243 +460,369 @@ def summarize_content(content, api_key=None, file_path=None, full_content=False)
         api_key: API 키 (사용하지 않음)
         file_path: 이미지 파일 경로
         full_content: True면 전체 내용을 반환, False면 요약만 반환
+        file_bytes: 이미 읽어둔 이미지 바이트 (주어지면 임시 파일 없이 바로 분석)
     """
-    import ollama
-    
+    return async_to_sync(asummarize_content)(content, api_key, file_path, full_content, file_bytes)
+
+
+async def asummarize_content(content, api_key=None, file_path=None, full_content=False, file_bytes=None):
+    """summarize_content의 비동기 버전 (여러 파일 요약을 asyncio.gather로 동시에 처리 가능)"""
     try:
         # 이미지 파일인지 확인
         if content.startswith("IMAGE_FILE:"):
+            if file_bytes is not None:
+                image_name = file_path or content[len("IMAGE_FILE:"):]
+                return await asyncio.to_thread(analyze_image_with_ollama, image_name, file_bytes)
             if file_path and os.path.exists(file_path):
-                return analyze_image_with_ollama(file_path)
+                return await asyncio.to_thread(analyze_image_with_ollama, file_path)
             else:
                 return "이미지 파일을 찾을 수 없습니다."
         
         # 텍스트 내용인 경우
         if full_content:
             # 전체 내용을 반환하되, 너무 길면 일부만 (최대 50000자)
-            if len(content) > 50000:
-                print(f"⚠️ 텍스트가 너무 깁니다 ({len(content)}자). 처음 50000자만 사용합니다.")
-                return content[:50000] + "\n\n...(내용이 길어 일부만 표시됩니다)..."
+            if len(content) > FULL_CONTENT_LIMIT:
+                logger.debug("⚠️ 텍스트가 너무 깁니다 (%d자). 처음 %d자만 사용합니다.", len(content), FULL_CONTENT_LIMIT)
+                return content[:FULL_CONTENT_LIMIT] + "\n\n...(내용이 길어 일부만 표시됩니다)..."
+            return content
+        
+        # 짧은 내용은 Ollama를 거치지 않고 그대로 반환
+        if len(content) < SUMMARY_SHORT_INPUT_LIMIT:
             return content
         
         # 요약 모드: 내용이 너무 길면 자르기 (토큰 제한 고려)
-        if len(content) > 12000:
-            content = content[:12000] + "..."
+        if len(content) > SUMMARY_INPUT_LIMIT:
+            content = content[:SUMMARY_INPUT_LIMIT] + "..."
         
-        # 요약 프롬프트
-        prompt = f"""당신은 문서 내용을 요약하는 전문가입니다. 
-
-주어진 내용이 PDF에서 추출된 텍스트인 경우:
-- OCR 오류나 불완전한 텍스트가 있을 수 있음을 고려
-- 가능한 한 원문의 의도를 파악하여 요약
-- 중요한 정보는 보존하되 간결하게 정리
-
-요약 시 다음을 포함해주세요:
-1. 문서의 주요 주제/목적
-2. 핵심 내용과 중요한 포인트
-3. 결론이나 요약 (있는 경우)
-
-원문의 주요 내용을 보존하면서도 간결하게 작성해주세요.
-
-다음 내용을 요약해주세요:
-
-{content}"""
+        # 같은 내용을 이미 요약했다면 캐시된 결과 반환
+        summary_key = _hash_bytes(content.encode('utf-8'))
+        with _summary_cache_lock:
+            if summary_key in _summary_cache:
+                _summary_cache.move_to_end(summary_key)
+                logger.debug("⚡ 문서 요약 캐시 히트! (해시: %s...)", summary_key[:8])
+                return _summary_cache[summary_key]
         
-        # Ollama 클라이언트로 요약 수행
-        response = ollama.chat(
-                   model='llama3.2:latest',  # 또는 사용 가능한 다른 모델
-            messages=[
-                {
-                    'role': 'user',
-                    'content': prompt
-                }
-            ],
-            options={
-                'temperature': 0.3,
-                'num_predict': 1500
-            }
-        )
+        chunks = _split_summary_chunks(content)
+        if len(chunks) == 1:
+            summary = await _ollama_summarize(_SUMMARY_PROMPT.format(content=content))
+        else:
+            # map: 청크별 요약을 동시에 요청 (동시 요청 수는 OLLAMA_NUM_PARALLEL로 제한됨)
+            logger.debug("📚 긴 문서를 %d개 청크로 나눠 요약합니다.", len(chunks))
+            partial_summaries = await asyncio.gather(*[
+                _ollama_summarize(_SUMMARY_PROMPT.format(content=chunk), num_predict=500)
+                for chunk in chunks
+            ])
+            # reduce: 부분 요약을 하나의 요약으로 통합
+            combined = "\n\n".join(
+                f"[부분 {i}]\n{part}" for i, part in enumerate(partial_summaries, 1)
+            )
+            summary = await _ollama_summarize(_SUMMARY_REDUCE_PROMPT.format(content=combined))
         
-        return response['message']['content']
+        with _summary_cache_lock:
+            _summary_cache[summary_key] = summary
+            _summary_cache.move_to_end(summary_key)
+            while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+                _summary_cache.popitem(last=False)
+        return summary
     except Exception as e:
-        print(f"Ollama 요약 오류: {str(e)}")
+        logger.warning("Ollama 요약 오류: %s", e)
         # Ollama 실패 시 기본 요약
         if len(content) > 1000:
             return f"문서 요약 (Ollama 오류로 간단 요약): {content[:500]}..."
         return content
 
 
-def analyze_image_with_ollama(image_path):
-    """이미지 분석 (GPT-4o-mini 사용, 중복 실행 방지)"""
+def summarize_conversation(transcript):
+    """ChatBot 대화 이력 요약 (Ollama 사용, 실패하면 예외를 그대로 전달)
+    
+    입력이 SUMMARY_INPUT_LIMIT보다 길면 최근 대화가 남도록 앞부분을 잘라낸다.
+    """
+    return async_to_sync(asummarize_conversation)(transcript)
+
+
+async def asummarize_conversation(transcript):
+    """summarize_conversation의 비동기 버전"""
+    # 짧은 대화는 요약하지 않고 그대로 사용
+    if len(transcript) < SUMMARY_SHORT_INPUT_LIMIT:
+        return transcript
+    if len(transcript) > SUMMARY_INPUT_LIMIT:
+        transcript = "..." + transcript[-SUMMARY_INPUT_LIMIT:]
+    return await _ollama_summarize(_CONVERSATION_SUMMARY_PROMPT.format(content=transcript))
+
+
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key):
+    """API 키별 이미지 분석용 OpenAI 클라이언트 (연결 풀 재사용, 키가 바뀌면 새 클라이언트)"""
+    return openai.OpenAI(api_key=api_key)
+
+
+def _upload_and_cache(image_path, image_bytes, file_hash):
+    """이미지를 해시 기반 이름으로 미디어 저장소에 한 번만 올리고 공개 URL 반환
+    
+    IMAGE_ANALYSIS_PUBLIC_BASE_URL이 없거나 업로드에 실패하면 None (base64 전송으로 대체)
+    """
+    if not IMAGE_ANALYSIS_PUBLIC_BASE_URL or not file_hash:
+        return None
     try:
-        # 파일 해시 계산 (중복 실행 방지)
-        file_hash = None
-        if os.path.exists(image_path):
-            with open(image_path, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
-        
-        # 캐시 확인 및 동시 요청 제어
-        image_lock = None  # 함수 레벨 변수로 선언
-        if file_hash:
-            with _cache_lock:
-                if file_hash in _image_analysis_cache:
-                    cached_result = _image_analysis_cache[file_hash]
-                    print(f"⚡ 이미지 분석 캐시 히트! (해시: {file_hash[:8]}...)")
-                    return cached_result
-                
-                # 동일한 이미지에 대한 동시 요청이 있으면 Lock 생성
-                if file_hash not in _image_analysis_locks:
-                    _image_analysis_locks[file_hash] = threading.Lock()
-            
-            # 동일한 이미지에 대한 동시 요청 대기 (Lock 획득)
-            image_lock = _image_analysis_locks[file_hash]
-            acquired = image_lock.acquire(blocking=True, timeout=120)  # 최대 120초 대기 (분석 시간 고려)
-            if not acquired:
-                print(f"⚠️ 이미지 분석 Lock 획득 실패 (타임아웃 120초)")
-                # Lock이 해제되지 않은 경우 강제로 정리
-                with _cache_lock:
-                    if file_hash in _image_analysis_locks:
-                        try:
-                            if _image_analysis_locks[file_hash].locked():
-                                _image_analysis_locks[file_hash].release()
-                                print(f"🔓 타임아웃으로 인한 Lock 강제 해제")
-                        except:
-                            pass
-                return "이미지 분석 중 다른 요청이 처리 중입니다. 잠시 후 다시 시도해주세요."
+        extension = os.path.splitext(image_path)[1].lower() or '.jpg'
+        storage_name = f"{IMAGE_ANALYSIS_UPLOAD_DIR}/{file_hash}{extension}"
+        # 같은 해시의 이미지가 이미 있으면 다시 올리지 않음
+        if not default_storage.exists(storage_name):
+            storage_name = default_storage.save(storage_name, ContentFile(image_bytes))
+        # 베이스 URL이 '/'로 끝나지 않으면 urljoin이 마지막 경로 세그먼트를 버리므로 항상 '/'로 맞춤
+        return urljoin(IMAGE_ANALYSIS_PUBLIC_BASE_URL.rstrip('/') + '/', storage_name)
+    except Exception as upload_error:
+        logger.warning("⚠️ 이미지 업로드 실패, base64로 전송합니다: %s", upload_error)
+        return None
+
+
+def _b64_file(path):
+    """파일을 57KB(3의 배수) 청크로 읽으며 base64 인코딩 (최대 메모리 = 인코딩 결과 + 청크 하나)"""
+    encoded = bytearray()
+    with open(path, 'rb', buffering=B64_CHUNK_SIZE) as f:
+        while chunk := f.read(B64_CHUNK_SIZE):
+            encoded += binascii.b2a_base64(chunk, newline=False)
+    return encoded.decode('ascii')
+
+
+def _hash_bytes(data):
+    """캐시 키용 바이트 해시 계산 (BLAKE3 우선, 없으면 SHA-256)"""
+    if BLAKE3_AVAILABLE:
+        return blake3(data).hexdigest()[:32]
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _prepare_image_for_vision(image_bytes):
+    """Vision API 전송용으로 긴 변을 IMAGE_MAX_SIDE 이하로 줄이고 JPEG로 다시 인코딩
+    
+    결과가 원본보다 크거나 디코딩에 실패하면 원본 바이트를 그대로 반환
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image.draft('RGB', (IMAGE_MAX_SIDE, IMAGE_MAX_SIDE))
+            image.thumbnail((IMAGE_MAX_SIDE, IMAGE_MAX_SIDE), Image.LANCZOS)
+            if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+                # 투명 배경은 흰색으로 합성 (JPEG는 알파 채널 없음)
+                rgba = image.convert('RGBA')
+                background = Image.new('RGB', rgba.size, (255, 255, 255))
+                background.paste(rgba, mask=rgba.getchannel('A'))
+                image = background
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
             
-            try:
-                # Lock 획득 후 다시 캐시 확인 (다른 스레드가 이미 완료했을 수 있음)
-                with _cache_lock:
-                    if file_hash in _image_analysis_cache:
-                        print(f"⚡ 이미지 분석 캐시 히트! (대기 중 다른 요청이 완료함)")
-                        image_lock.release()
-                        return _image_analysis_cache[file_hash]
-                
-                # Lock을 획득했고 캐시에도 없으므로 실제 분석 수행
-                print(f"🖼️ 이미지 분석 시작: {image_path} (Lock 획득, 실제 분석 수행)")
-                if file_hash:
-                    print(f"🔑 파일 해시: {file_hash[:16]}...")
-                
-            except Exception as lock_error:
-                if image_lock and image_lock.locked():
-                    image_lock.release()
-                    print(f"🔓 Lock 해제 (예외 발생)")
-                raise
-        else:
-            print(f"🖼️ 이미지 분석 시작: {image_path} (해시 없음, 직접 분석)")
-        
-        print(f"📁 파일 존재 여부: {os.path.exists(image_path)}")
-        if os.path.exists(image_path):
-            file_size = os.path.getsize(image_path)
-            print(f"📏 파일 크기: {file_size} bytes")
-        
-        # GPT-4o-mini를 직접 사용
-        print(f"🚀 GPT-4o-mini로 이미지 분석 시작")
-        print(f"📁 이미지 경로: {image_path}")
+            buffer = io.BytesIO()
+            image.save(buffer, 'JPEG', quality=IMAGE_JPEG_QUALITY, optimize=True)
         
-        ollama_response = ""
-        ollama_success = False
+        prepared = buffer.getvalue()
+        if len(prepared) >= len(image_bytes):
+            return image_bytes
+        logger.debug("🗜️ 이미지 축소/재인코딩: %d → %d bytes", len(image_bytes), len(prepared))
+        return prepared
+    except Exception as resize_error:
+        logger.warning("⚠️ 이미지 축소 실패, 원본을 전송합니다: %s", resize_error)
+        return image_bytes
+
+
+def _image_analysis_max_tokens(file_size):
+    """이미지 크기에 비례한 응답 토큰 한도 (최소 128, 최대 500)"""
+    return min(IMAGE_ANALYSIS_MAX_TOKENS, 128 + int(file_size / 2048))
+
+
+def _run_image_analysis(image_path, image_bytes, file_hash):
+    """GPT-4o-mini Vision으로 실제 이미지 분석 수행 (캐시/중복 제어 없음)"""
+    logger.debug("📁 파일 존재 여부: %s", image_bytes is not None)
+    if image_bytes is not None:
+        logger.debug("📏 파일 크기: %d bytes", len(image_bytes))
+    
+    # GPT-4o-mini를 직접 사용
+    logger.debug("🚀 GPT-4o-mini로 이미지 분석 시작: %s", image_path)
+    
+    ollama_response = ""
+    ollama_success = False
+    
+    # GPT-4o-mini로 직접 분석
+    try:
+        openai_api_key = os.getenv('OPENAI_API_KEY')
         
-        # GPT-4o-mini로 직접 분석
-        try:
-            openai_api_key = os.getenv('OPENAI_API_KEY')
+        if not openai_api_key:
+            logger.error("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
+            ollama_response = "OpenAI API 키가 설정되지 않았습니다."
+        else:
+            logger.debug("🔄 GPT-4o-mini로 이미지 분석 시도 중...")
+            gpt_start_time = time.time()
             
-            if not openai_api_key:
-                print(f"❌ OPENAI_API_KEY가 설정되지 않았습니다.")
-                ollama_response = "OpenAI API 키가 설정되지 않았습니다."
+            if image_bytes is None:
+                # 해시 없이 바로 분석하는 경우: 원본 전체를 메모리에 올리지 않고 청크 단위로 인코딩
+                image_size = os.path.getsize(image_path)
+                image_url = f"data:image/jpeg;base64,{_b64_file(image_path)}"
             else:
-                print(f"🔄 GPT-4o-mini로 이미지 분석 시도 중...")
-                gpt_start_time = time.time()
-                
-                # 이미지를 base64로 인코딩
-                with open(image_path, "rb") as image_file:
-                    base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-                
-                # GPT-4o-mini Vision API 호출
-                client = openai.OpenAI(api_key=openai_api_key)
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": """Analyze this image in detail. Include:
+                image_size = len(image_bytes)
+                # 큰 이미지는 축소 후 JPEG로 전송 (업로드/base64 크기와 입력 토큰 감소)
+                send_bytes = _prepare_image_for_vision(image_bytes)
+                send_name = image_path if send_bytes is image_bytes else os.path.splitext(image_path)[0] + '.jpg'
+                # 공개 URL로 전달 가능하면 URL 사용, 아니면 base64로 인코딩 (해시 계산 시 읽은 바이트 재사용)
+                image_url = _upload_and_cache(send_name, send_bytes, file_hash)
+                if not image_url:
+                    base64_image = base64.b64encode(send_bytes).decode('ascii')
+                    image_url = f"data:image/jpeg;base64,{base64_image}"
+            
+            # 작은 이미지는 짧게, 큰 이미지는 최대 500 토큰까지 생성
+            max_tokens = _image_analysis_max_tokens(image_size)
+            
+            # GPT-4o-mini Vision API 호출 (스트리밍으로 응답 조각을 받으며 조립)
+            client = _get_openai_client(openai_api_key)
+            stream = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": """Analyze this image in detail. Include:
 1. All visible text (read exactly as shown, including any text in the image)
 2. Visual content (objects, colors, composition, style)
 3. Overall meaning or message
 
 Be thorough but concise. Make sure to read and include ALL text visible in the image."""
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=500,
-                    temperature=0.1
-                )
-                
-                gpt_elapsed = time.time() - gpt_start_time
-                ollama_response = response.choices[0].message.content
-                ollama_success = True
-                print(f"✅ GPT-4o-mini 분석 성공! (소요 시간: {gpt_elapsed:.2f}초)")
-                print(f"📄 GPT-4o-mini 분석 결과:\n{ollama_response}")
-                
-        except Exception as gpt_error:
-            print(f"❌ GPT-4o-mini 분석 실패: {str(gpt_error)}")
-            import traceback
-            traceback.print_exc()
-            ollama_response = "이미지 분석에 실패했습니다. OpenAI API를 확인해주세요."
-        
-        # GPT-4o-mini 분석 결과 반환
-        result = None
-        if ollama_response and len(ollama_response.strip()) > 0:
-            print(f"✅ GPT-4o-mini 이미지 분석 완료: 총 {len(ollama_response)}자")
-            result = f"[Image Analysis (English)]\n{ollama_response}"
+                            },
+                            {
+                                "type": "image_url",
+                                "image_url": {"url": image_url}
+                            }
+                        ]
+                    }
+                ],
+                max_tokens=max_tokens,
+                temperature=0.1,
+                stream=True
+            )
+            
+            parts = []
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.delta and choice.delta.content:
+                    parts.append(choice.delta.content)
+                if choice.finish_reason:
+                    break
+            
+            gpt_elapsed = time.time() - gpt_start_time
+            ollama_response = "".join(parts)
+            ollama_success = True
+            logger.info("✅ GPT-4o-mini 분석 성공! (소요 시간: %.2f초)", gpt_elapsed)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📄 GPT-4o-mini 분석 결과:\n%s", ollama_response)
+            
+    except Exception as gpt_error:
+        logger.exception("❌ GPT-4o-mini 분석 실패: %s", gpt_error)
+        ollama_response = "이미지 분석에 실패했습니다. OpenAI API를 확인해주세요."
+    
+    # GPT-4o-mini 분석 결과 반환
+    result = None
+    if ollama_response and len(ollama_response.strip()) > 0:
+        logger.debug("✅ GPT-4o-mini 이미지 분석 완료: 총 %d자", len(ollama_response))
+        result = f"[Image Analysis (English)]\n{ollama_response}"
+    else:
+        error_msg = "이미지 분석 중 오류가 발생했습니다. OpenAI API를 확인해주세요."
+        logger.error("❌ %s", error_msg)
+        result = error_msg
+    
+    return result
+
+
+def analyze_image_with_ollama(image_path, image_bytes=None):
+    """이미지 분석 (GPT-4o-mini 사용, 중복 실행 방지)
+    
+    image_bytes가 주어지면 디스크를 다시 읽지 않고 그 바이트를 해시/인코딩에 그대로 사용
+    """
+    try:
+        # 파일 해시 계산 (중복 실행 방지)
+        # 파일은 한 번만 읽어 해시 계산과 base64 인코딩에 함께 사용 (stat 키로 캐시 히트 시 읽지 않음)
+        file_hash = None
+        st = None
+        if image_bytes is not None:
+            file_hash = _hash_bytes(image_bytes)
         else:
-            error_msg = "이미지 분석 중 오류가 발생했습니다. OpenAI API를 확인해주세요."
-            print(f"❌ {error_msg}")
-            result = error_msg
+            try:
+                st = os.stat(image_path)
+            except OSError:
+                st = None
         
-        # 결과를 캐시에 저장 (성공한 경우만)
-        if file_hash and result and "오류" not in result and "실패" not in result:
+        if st is not None:
+            # 경로+크기+수정시각으로 이미 본 파일이면 파일을 읽지 않고 캐시 조회
+            fast_key = (os.path.realpath(image_path), st.st_size, st.st_mtime_ns)
             with _cache_lock:
-                _image_analysis_cache[file_hash] = result
-                # 캐시 크기 제한 (최대 100개)
-                if len(_image_analysis_cache) > 100:
-                    oldest_key = next(iter(_image_analysis_cache))
-                    del _image_analysis_cache[oldest_key]
-                    if oldest_key in _image_analysis_locks:
-                        del _image_analysis_locks[oldest_key]
-                print(f"💾 이미지 분석 결과 캐시에 저장됨 (해시: {file_hash[:8]}...)")
+                known_hash = _fast_key_to_hash.get(fast_key)
+                if known_hash is not None and known_hash in _image_analysis_cache:
+                    _fast_key_to_hash.move_to_end(fast_key)
+                    _image_analysis_cache.move_to_end(known_hash)
+                    logger.debug("⚡ 이미지 분석 캐시 히트 (stat)! (해시: %s...)", known_hash[:8])
+                    return _image_analysis_cache[known_hash]
+            
+            with open(image_path, 'rb') as f:
+                image_bytes = f.read()
+            file_hash = _hash_bytes(image_bytes)
+            
+            with _cache_lock:
+                _fast_key_to_hash[fast_key] = file_hash
+                _fast_key_to_hash.move_to_end(fast_key)
+                while len(_fast_key_to_hash) > IMAGE_ANALYSIS_CACHE_SIZE:
+                    _fast_key_to_hash.popitem(last=False)
         
-        # Lock 해제 (분석 완료 후)
-        if file_hash and image_lock and image_lock.locked():
-            try:
-                image_lock.release()
-                print(f"🔓 이미지 분석 Lock 해제 (분석 완료, 해시: {file_hash[:8]}...)")
-            except Exception as release_error:
-                print(f"⚠️ Lock 해제 중 오류: {release_error}")
+        if not file_hash:
+            logger.debug("🖼️ 이미지 분석 시작: %s (해시 없음, 직접 분석)", image_path)
+            return _run_image_analysis(image_path, image_bytes, file_hash)
         
-        return result
+        # 캐시 확인 및 동시 요청 제어 (singleflight: 같은 이미지는 한 요청만 분석)
+        with _cache_lock:
+            if file_hash in _image_analysis_cache:
+                _image_analysis_cache.move_to_end(file_hash)
+                cached_result = _image_analysis_cache[file_hash]
+                logger.debug("⚡ 이미지 분석 캐시 히트! (해시: %s...)", file_hash[:8])
+                return cached_result
             
-    except Exception as e:
-        print(f"❌ 이미지 분석 오류: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        error_result = f"이미지 분석 중 오류가 발생했습니다: {str(e)}"
+            inflight = _image_analysis_inflight.get(file_hash)
+            is_leader = inflight is None
+            if is_leader:
+                inflight = Future()
+                _image_analysis_inflight[file_hash] = inflight
         
-        # Lock 해제 (에러 발생 시에도)
-        if file_hash and image_lock and image_lock.locked():
+        # 동일한 이미지를 다른 요청이 분석 중이면 그 결과를 기다림
+        if not is_leader:
+            logger.debug("⏳ 동일 이미지 분석 진행 중 - 결과 대기 (해시: %s...)", file_hash[:8])
             try:
-                image_lock.release()
-                print(f"🔓 이미지 분석 Lock 해제 (에러 발생, 해시: {file_hash[:8]}...)")
-            except Exception as release_error:
-                print(f"⚠️ Lock 해제 중 오류: {release_error}")
+                return inflight.result(timeout=120)  # 최대 120초 대기 (분석 시간 고려)
+            except FutureTimeoutError:
+                logger.warning("⚠️ 이미지 분석 대기 타임아웃 (120초)")
+                return "이미지 분석 중 다른 요청이 처리 중입니다. 잠시 후 다시 시도해주세요."
         
-        return error_result
-
+        result = None
+        try:
+            logger.debug("🖼️ 이미지 분석 시작: %s (해시: %s...)", image_path, file_hash[:16])
+            result = _run_image_analysis(image_path, image_bytes, file_hash)
+            
+            # 결과를 캐시에 저장 (성공한 경우만)
+            if result and "오류" not in result and "실패" not in result:
+                with _cache_lock:
+                    _image_analysis_cache[file_hash] = result
+                    _image_analysis_cache.move_to_end(file_hash)
+                    # 캐시 크기 제한 (최대 100개, 가장 오래 사용되지 않은 항목부터 제거)
+                    while len(_image_analysis_cache) > IMAGE_ANALYSIS_CACHE_SIZE:
+                        _image_analysis_cache.popitem(last=False)
+                logger.debug("💾 이미지 분석 결과 캐시에 저장됨 (해시: %s...)", file_hash[:8])
+        except Exception as analysis_error:
+            result = f"이미지 분석 중 오류가 발생했습니다: {str(analysis_error)}"
+            raise
+        finally:
+            # 진행 중 표시 제거 후 대기 중인 요청들에게 결과 전달
+            with _cache_lock:
+                _image_analysis_inflight.pop(file_hash, None)
+            inflight.set_result(result)
+        
+        return result
+            
+    except Exception as e:
+        logger.exception("❌ 이미지 분석 오류: %s", e)
+        return f"이미지 분석 중 오류가 발생했습니다: {str(e)}"
@@ -5,7 +5,7 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.http import HttpResponse, Http404
+from django.http import HttpResponse, Http404, StreamingHttpResponse
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -13,14 +13,21 @@ from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.core.cache import cache
 import requests
+import json
 import hmac
 import hashlib
 import uuid
-import os
+import logging
 
 from chat.serializers import UserSerializer, VideoChatSessionSerializer, VideoChatMessageSerializer, VideoAnalysisCacheSerializer
 from chat.models import VideoChatSession, VideoChatMessage, VideoAnalysisCache, Video, User, SocialAccount
-from ..utils.chatbot import ChatBot, chatbots
+from ..utils.chatbot import (
+    ChatBot,
+    chatbots,
+    get_session_chatbot,
+    save_session_chatbot,
+    clear_session_histories,
+)
 from ..utils.file_utils import process_uploaded_file, summarize_content
 from ..utils.error_handlers import get_user_friendly_error_message
 from ..services.optimal_response import (
@@ -33,6 +40,39 @@ from ..services.video_analysis_service import video_analysis_service
 from ..enhanced_video_chat_handler import get_video_chat_handler
 from ..llm_cache_manager import conversation_context_manager
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _json_loads(data):
+    """str/bytes JSON 파싱 (orjson이 있으면 우선 사용)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _stream_chat_events(chatbot, session_id, bot_name, message, **chat_kwargs):
+    """ChatBot.chat_stream 조각을 SSE 이벤트로 변환하고, 스트림이 끝나면 대화 이력 저장
+
+    data: {"delta": 조각} 이벤트를 보내고 마지막에 event: done으로 전체 응답을 한 번 더 보낸다
+    """
+    parts = []
+    stream = chatbot.chat_stream(message, **chat_kwargs)
+    try:
+        for piece in stream:
+            parts.append(piece)
+            yield f"data: {json.dumps({'delta': piece}, ensure_ascii=False)}\n\n"
+    finally:
+        # 클라이언트가 중간에 끊어도 chat_stream이 받은 부분까지 이력에 남기도록 먼저 닫고 저장
+        stream.close()
+        save_session_chatbot(session_id, bot_name, chatbot)
+    yield f"event: done\ndata: {json.dumps({'response': ''.join(parts)}, ensure_ascii=False)}\n\n"
+
 
 class ChatView(APIView):
     def post(self, request, bot_name):
@@ -46,58 +86,52 @@ class ChatView(APIView):
             
             chatbot = chatbots.get(bot_name)
             if not chatbot:
-                print(f"❌ Invalid bot name: {bot_name}")
-                print(f"   사용 가능한 모델: {list(chatbots.keys())[:10]}...")
+                logger.warning("❌ Invalid bot name: %s", bot_name)
+                logger.debug("   사용 가능한 모델: %s...", list(chatbots.keys())[:10])
                 return Response({'error': 'Invalid bot name'}, status=status.HTTP_400_BAD_REQUEST)
 
             # 파일이 업로드된 경우 처리
             if uploaded_file:
                 try:
-                    print(f"파일 업로드 감지: {uploaded_file.name}")
+                    logger.debug("파일 업로드 감지: %s", uploaded_file.name)
                     
                     # 파일에서 텍스트 추출 또는 이미지 파일 식별
                     extracted_content = process_uploaded_file(uploaded_file)
-                    print(f"📄 추출된 텍스트 길이: {len(extracted_content)}자")
-                    print(f"📄 추출된 내용 미리보기 (처음 200자): {extracted_content[:200]}...")
+                    logger.debug("📄 추출된 텍스트 길이: %s자", len(extracted_content))
+                    logger.debug("📄 추출된 내용 미리보기 (처음 200자): %s...", extracted_content[:200])
                     
                     # Ollama로 분석 (이미지는 직접, 텍스트는 전체 내용 전달)
-                    print("Ollama를 사용하여 파일 분석 중...")
+                    logger.debug("Ollama를 사용하여 파일 분석 중...")
                     
-                    # 임시 파일 저장
-                    temp_file_path = None
+                    # 이미지는 업로드 바이트를 그대로 분석에 전달 (임시 파일로 저장했다가 다시 읽지 않음)
+                    image_bytes = None
                     if extracted_content.startswith("IMAGE_FILE:"):
-                        # 이미지 파일을 임시로 저장
-                        import tempfile
-                        import shutil
-                        temp_dir = tempfile.mkdtemp()
-                        temp_file_path = os.path.join(temp_dir, uploaded_file.name)
-                        with open(temp_file_path, 'wb') as temp_file:
-                            uploaded_file.seek(0)  # 파일 포인터 리셋
-                            for chunk in uploaded_file.chunks():
-                                temp_file.write(chunk)
-                        print(f"이미지 파일 임시 저장: {temp_file_path}")
+                        uploaded_file.seek(0)  # 파일 포인터 리셋
+                        image_bytes = uploaded_file.read()
+                        logger.debug("이미지 파일 메모리에서 분석: %s (%s bytes)", uploaded_file.name, len(image_bytes))
                     
                     # 사용자가 질문을 입력한 경우: 전체 내용 전달 (요약하지 않음)
                     # 질문이 없으면 요약 모드 사용
                     use_full_content = bool(user_message and user_message.strip())
                     
                     if use_full_content:
-                        print(f"📋 전체 내용 모드: 추출된 텍스트({len(extracted_content)}자)를 그대로 전달합니다.")
+                        logger.debug("📋 전체 내용 모드: 추출된 텍스트(%s자)를 그대로 전달합니다.", len(extracted_content))
                     else:
-                        print(f"📝 요약 모드: Ollama로 요약합니다.")
+                        logger.debug("📝 요약 모드: Ollama로 요약합니다.")
                     
                     analyzed_content = summarize_content(
                         extracted_content, 
-                        file_path=temp_file_path,
-                        full_content=use_full_content
+                        file_path=uploaded_file.name if image_bytes is not None else None,
+                        full_content=use_full_content,
+                        file_bytes=image_bytes
                     )
                     
-                    print(f"📊 최종 분석 내용 길이: {len(analyzed_content)}자")
+                    logger.debug("📊 최종 분석 내용 길이: %s자", len(analyzed_content))
                     
                     # 사용자 메시지와 파일 분석 결과를 결합
                     if user_message and user_message.strip():
                         # 사용자가 질문을 입력한 경우 - 전체 내용 전달
-                        print(f"📝 사용자 질문과 파일 함께 처리: {user_message}")
+                        logger.debug("📝 사용자 질문과 파일 함께 처리: %s", user_message)
                         if uploaded_file.name.lower().endswith('.pdf'):
                             final_message = f"""다음은 업로드된 PDF 문서의 전체 내용입니다:
 
@@ -127,9 +161,9 @@ class ChatView(APIView):
 {analyzed_content}
 
 위 영어로 작성된 이미지 분석 결과를 바탕으로 이 이미지에 대해 한국어로 자세하고 자연스럽게 설명해주세요. 이미지 분석 결과의 내용을 충실히 반영하여 답변해주세요."""
-                    print("분석 완료")
+                    logger.debug("분석 완료")
                 except Exception as e:
-                    print(f"파일 처리 오류: {str(e)}")
+                    logger.warning("파일 처리 오류: %s", e)
                     final_message = f"파일 처리 중 오류가 발생했습니다: {str(e)}"
             else:
                 final_message = user_message
@@ -143,52 +177,51 @@ class ChatView(APIView):
                 selected_models = request.data.get('selected_models', None)
                 
                 # FormData로 전달된 경우 JSON 파싱
-                if isinstance(selected_models, str):
+                if isinstance(selected_models, (str, bytes)):
                     try:
-                        import json
-                        selected_models = json.loads(selected_models)
-                        print(f"📋 JSON 파싱된 selected_models: {selected_models}")
+                        selected_models = _json_loads(selected_models)
+                        logger.debug("📋 JSON 파싱된 selected_models: %s", selected_models)
                     except Exception as e:
-                        print(f"⚠️ selected_models JSON 파싱 실패: {e}")
+                        logger.warning("⚠️ selected_models JSON 파싱 실패: %s", e)
                         selected_models = None
                 
                 # selected_models가 빈 리스트인 경우 처리
                 if selected_models is not None and len(selected_models) == 0:
-                    print(f"⚠️ selected_models가 빈 리스트입니다. 기본 모델 사용")
+                    logger.warning("⚠️ selected_models가 빈 리스트입니다. 기본 모델 사용")
                     selected_models = None
                 
-                print(f"🎯 사용자 선택 모델들: {selected_models}")
-                print(f"🎯 심판 모델: {judge_model}")
-                print(f"📝 처리할 메시지 길이: {len(final_message)}자")
+                logger.debug("🎯 사용자 선택 모델들: %s", selected_models)
+                logger.debug("🎯 심판 모델: %s", judge_model)
+                logger.debug("📝 처리할 메시지 길이: %s자", len(final_message))
                 
                 # 모델 변경 감지 및 대화 히스토리 초기화 처리
                 session_id = request.data.get('user_id', 'default_user')
                 
                 # 세션이 바뀌었는지 확인 (일반 채팅도 세션별로 초기화)
-                from django.core.cache import cache
                 session_key = f"chat_session_{session_id}"
                 previous_session_id = cache.get(session_key)
                 
                 if previous_session_id is None or previous_session_id != session_id:
                     # 세션이 바뀌었거나 첫 요청인 경우 - 모든 ChatBot의 대화 기록 초기화
-                    print(f"🔄 일반 채팅 세션 변경 감지! 대화 히스토리 초기화")
-                    print(f"   이전 세션: {previous_session_id}")
-                    print(f"   현재 세션: {session_id}")
+                    logger.debug("🔄 일반 채팅 세션 변경 감지! 대화 히스토리 초기화")
+                    logger.debug("   이전 세션: %s", previous_session_id)
+                    logger.debug("   현재 세션: %s", session_id)
                     
                     # 모든 ChatBot 인스턴스의 대화 히스토리 초기화
-                    for bot_name, chatbot in chatbots.items():
+                    for bot_name, chatbot in chatbots.loaded_items():
                         if hasattr(chatbot, 'conversation_history'):
                             chatbot.conversation_history = []
-                            print(f"   ✅ {bot_name} 대화 히스토리 초기화")
+                            logger.debug("   ✅ %s 대화 히스토리 초기화", bot_name)
                     
-                    # ConversationContextManager도 초기화
+                    # 세션별 ChatBot 대화 이력과 ConversationContextManager도 초기화
+                    clear_session_histories(session_id)
                     conversation_context_manager.clear_context(session_id)
                     
                     # 현재 세션 ID를 캐시에 저장
                     cache.set(session_key, session_id, 3600)  # 1시간 유지
-                    print(f"✅ 모든 ChatBot의 대화 히스토리 초기화 완료")
+                    logger.debug("✅ 모든 ChatBot의 대화 히스토리 초기화 완료")
                 else:
-                    print(f"✔️ 동일한 세션 유지 - 대화 히스토리 유지 (세션: {session_id})")
+                    logger.debug("✔️ 동일한 세션 유지 - 대화 히스토리 유지 (세션: %s)", session_id)
                 
                 # 모델 이름 매핑 (표시명 -> 내부명)
                 model_name_mapping = {
@@ -231,32 +264,35 @@ class ChatView(APIView):
                         all_models_changed = len(common_models) == 0
                         
                         if all_models_changed:
-                            print(f"🔄 모든 모델이 교체됨 감지! 대화 히스토리 초기화")
-                            print(f"   이전 모델: {previous_models_sorted}")
-                            print(f"   현재 모델: {current_models}")
-                            print(f"   공통 모델: {list(common_models)} (0개)")
+                            logger.debug("🔄 모든 모델이 교체됨 감지! 대화 히스토리 초기화")
+                            logger.debug("   이전 모델: %s", previous_models_sorted)
+                            logger.debug("   현재 모델: %s", current_models)
+                            logger.debug("   공통 모델: %s (0개)", list(common_models))
                             
                             # 1. ConversationContextManager의 대화 히스토리 초기화
                             conversation_context_manager.clear_context(session_id)
-                            print(f"   ✅ ConversationContextManager 초기화 완료")
+                            logger.debug("   ✅ ConversationContextManager 초기화 완료")
                             
                             # 2. 모든 ChatBot 인스턴스의 대화 히스토리 초기화 (이전 + 현재 모든 모델)
                             all_models_to_clear = set(previous_models_sorted) | set(current_models)
+                            cleared_bot_names = []
                             for model_display_name in all_models_to_clear:
                                 bot_name = model_name_mapping.get(model_display_name)
                                 if bot_name and bot_name in chatbots:
                                     chatbots[bot_name].conversation_history = []
-                                    print(f"   ✅ {model_display_name} ({bot_name}) 대화 히스토리 초기화")
+                                    cleared_bot_names.append(bot_name)
+                                    logger.debug("   ✅ %s (%s) 대화 히스토리 초기화", model_display_name, bot_name)
+                            clear_session_histories(session_id, cleared_bot_names)
                             
-                            print(f"✅ 모든 모델의 대화 히스토리 초기화 완료 ({len(all_models_to_clear)}개 모델)")
+                            logger.debug("✅ 모든 모델의 대화 히스토리 초기화 완료 (%s개 모델)", len(all_models_to_clear))
                         else:
-                            print(f"✔️ 일부 모델만 변경됨 - 대화 히스토리 유지")
-                            print(f"   이전 모델: {previous_models_sorted}")
-                            print(f"   현재 모델: {current_models}")
-                            print(f"   공통 모델 ({len(common_models)}개): {list(common_models)}")
-                            print(f"   → 1-2개 모델 교체이므로 이전 대화 내용 기억")
+                            logger.debug("✔️ 일부 모델만 변경됨 - 대화 히스토리 유지")
+                            logger.debug("   이전 모델: %s", previous_models_sorted)
+                            logger.debug("   현재 모델: %s", current_models)
+                            logger.debug("   공통 모델 (%s개): %s", len(common_models), list(common_models))
+                            logger.debug("   → 1-2개 모델 교체이므로 이전 대화 내용 기억")
                     else:
-                        print(f"📝 첫 요청 또는 이전 모델 정보 없음")
+                        logger.debug("📝 첫 요청 또는 이전 모델 정보 없음")
                     
                     # 현재 모델 목록을 캐시에 저장 (다음 요청을 위해)
                     cache.set(previous_models_key, current_models, 3600)  # 1시간 유지
@@ -264,10 +300,10 @@ class ChatView(APIView):
                 # 1-4단계: 선택된 LLM 병렬 질의 → 심판 모델 검증 → 최적 답변 생성
                 response = None
                 try:
-                    print(f"🚀 최적 답변 생성 시작...")
-                    print(f"📝 사용자 메시지: {final_message[:200]}...")
-                    print(f"🎯 선택된 모델: {selected_models}")
-                    print(f"⚖️ 심판 모델: {judge_model}")
+                    logger.debug("🚀 최적 답변 생성 시작...")
+                    logger.debug("📝 사용자 메시지: %s...", final_message[:200])
+                    logger.debug("🎯 선택된 모델: %s", selected_models)
+                    logger.debug("⚖️ 심판 모델: %s", judge_model)
                     
                     # 질문 유형 감지
                     has_image = uploaded_file and not uploaded_file.name.lower().endswith('.pdf')
@@ -289,12 +325,12 @@ class ChatView(APIView):
                             classification_result = classify_question_type(final_message)
                             if isinstance(classification_result, dict):
                                 question_type = classification_result.get('type', 'factual')
-                                print(f"📝 질문 유형 분류 결과: {question_type}")
+                                logger.debug("📝 질문 유형 분류 결과: %s", question_type)
                                 if classification_result.get('keywords'):
-                                    print(f"   추출된 검증 키워드: {classification_result.get('keywords')}")
+                                    logger.debug("   추출된 검증 키워드: %s", classification_result.get('keywords'))
                             else:
                                 question_type = classification_result
-                                print(f"📝 질문 유형 분류 결과: {question_type}")
+                                logger.debug("📝 질문 유형 분류 결과: %s", question_type)
                     
                     # 모든 모델 교체 여부 확인
                     all_models_changed = False
@@ -307,24 +343,33 @@ class ChatView(APIView):
                             common_models = set(current_models_sorted) & set(previous_models_sorted)
                             all_models_changed = len(common_models) == 0
                     
+                    # 조기 채택 기준 점수 (0~10, 지정하지 않으면 모든 모델 응답을 기다려 심판)
+                    early_exit_threshold = request.data.get('early_exit_threshold')
+                    try:
+                        early_exit_threshold = float(early_exit_threshold) if early_exit_threshold not in (None, '') else None
+                    except (TypeError, ValueError):
+                        logger.warning("⚠️ early_exit_threshold 값이 올바르지 않습니다: %s", early_exit_threshold)
+                        early_exit_threshold = None
+                    
                     final_result = collect_multi_llm_responses(
                         final_message, 
                         judge_model, 
                         selected_models, 
                         question_type=question_type,
                         session_id=session_id,
-                        clear_history=all_models_changed
+                        clear_history=all_models_changed,
+                        early_exit_threshold=early_exit_threshold
                     )
-                    print(f"✅ 최적 답변 생성 완료: {type(final_result)}")
-                    print(f"✅ 최적 답변 결과 키: {list(final_result.keys()) if isinstance(final_result, dict) else 'N/A'}")
+                    logger.debug("✅ 최적 답변 생성 완료: %s", type(final_result))
+                    logger.debug("✅ 최적 답변 결과 키: %s", list(final_result.keys()) if isinstance(final_result, dict) else 'N/A')
                     
                     # 최적 답변 내용 확인
                     optimal_answer = final_result.get("최적의_답변", "")
                     if not optimal_answer:
                         # optimal_answer가 없으면 다른 키 확인
                         optimal_answer = final_result.get("optimal_answer", "")
-                    print(f"📄 최적 답변 내용 길이: {len(optimal_answer) if optimal_answer else 0}자")
-                    print(f"📄 최적 답변 미리보기: {optimal_answer[:300] if optimal_answer else 'None'}...")
+                    logger.debug("📄 최적 답변 내용 길이: %s자", len(optimal_answer) if optimal_answer else 0)
+                    logger.debug("📄 최적 답변 미리보기: %s...", optimal_answer[:300] if optimal_answer else 'None')
                     
                     # optimal_answer가 있으면 최적의_답변으로 변환
                     if optimal_answer and not final_result.get("최적의_답변"):
@@ -332,8 +377,8 @@ class ChatView(APIView):
                     
                     # 결과 포맷팅
                     response = format_optimal_response(final_result)
-                    print(f"✅ 결과 포맷팅 완료: {len(response) if response else 0}자")
-                    print(f"✅ 포맷팅된 응답 미리보기: {response[:500] if response else 'None'}...")
+                    logger.debug("✅ 결과 포맷팅 완료: %s자", len(response) if response else 0)
+                    logger.debug("✅ 포맷팅된 응답 미리보기: %s...", response[:500] if response else 'None')
                     
                     # 대화 맥락에 추가 (session_id는 위에서 이미 선언됨)
                     conversation_context_manager.add_conversation(
@@ -345,11 +390,11 @@ class ChatView(APIView):
                     
                     # response가 None이면 오류 메시지 반환
                     if not response:
-                        print(f"❌ response가 None입니다!")
+                        logger.error("❌ response가 None입니다!")
                         response = "최적 답변 생성에 실패했습니다. 서버 로그를 확인해주세요."
                     
-                    print(f"📤 최종 응답 반환 (길이: {len(response) if response else 0}자)")
-                    print(f"📤 최종 응답 미리보기: {response[:500] if response else 'None'}...")
+                    logger.debug("📤 최종 응답 반환 (길이: %s자)", len(response) if response else 0)
+                    logger.debug("📤 최종 응답 미리보기: %s...", response[:500] if response else 'None')
                     
                     # 프론트엔드에서 분석 데이터를 쉽게 사용할 수 있도록 JSON 데이터도 함께 전송
                     return Response({
@@ -360,10 +405,7 @@ class ChatView(APIView):
                     })
                     
                 except Exception as e:
-                    import traceback
-                    error_trace = traceback.format_exc()
-                    print(f"❌ 최적 답변 생성 실패: {e}")
-                    print(f"❌ 상세 오류:\n{error_trace}")
+                    logger.exception("❌ 최적 답변 생성 실패: %s", e)
                     # 폴백: 사용자 친화적인 오류 메시지 반환
                     friendly_error = get_user_friendly_error_message(e)
                     return Response({'response': friendly_error})
@@ -382,17 +424,32 @@ class ChatView(APIView):
             else:
                 question_type = detect_question_type_from_content(final_message)
             
+            # 세션 전용 ChatBot 사용 (대화 이력은 cache에서 복원하고 응답 후 다시 저장)
+            session_id = request.data.get('user_id', 'default_user')
+            chatbot = get_session_chatbot(session_id, bot_name)
+            # 클라이언트가 허용한 경우에만 동일 요청 응답 캐시 사용 (기본 temperature > 0이라 응답이 매번 다름)
+            cacheable = str(request.data.get('cacheable', '')).lower() in ('1', 'true')
+            
             if uploaded_file and '파일 내용을 분석해' in final_message:
                 # 이미 Ollama로 분석된 내용이므로 간단한 응답 요청
-                simplified_message = f"다음 분석 내용에 대해 간단한 의견을 제시해주세요:\n\n{final_message.split('다음 파일 내용을 분석해주세요:')[1] if '다음 파일 내용을 분석해주세요:' in final_message else final_message}"
-                response = chatbot.chat(simplified_message, has_image=has_image, question_type=question_type)
-            else:
-                response = chatbot.chat(final_message, has_image=has_image, question_type=question_type)
+                final_message = f"다음 분석 내용에 대해 간단한 의견을 제시해주세요:\n\n{final_message.split('다음 파일 내용을 분석해주세요:')[1] if '다음 파일 내용을 분석해주세요:' in final_message else final_message}"
+            
+            # stream=true이면 응답 조각을 SSE(text/event-stream)로 바로 전송 (첫 토큰까지의 대기 시간 단축)
+            if str(request.data.get('stream', '')).lower() in ('1', 'true'):
+                response = StreamingHttpResponse(
+                    _stream_chat_events(chatbot, session_id, bot_name, final_message, has_image=has_image, question_type=question_type),
+                    content_type='text/event-stream'
+                )
+                response['Cache-Control'] = 'no-cache'
+                response['X-Accel-Buffering'] = 'no'  # nginx 버퍼링 비활성화
+                return response
+            
+            response = chatbot.chat(final_message, has_image=has_image, question_type=question_type, cacheable=cacheable)
+            save_session_chatbot(session_id, bot_name, chatbot)
             
             return Response({'response': response})
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ %s 채팅 처리 실패: %s", bot_name, e)
             # 사용자 친화적인 오류 메시지 반환
             friendly_error = get_user_friendly_error_message(e)
             return Response({'error': friendly_error}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -20,7 +20,7 @@ import logging
 
 from chat.serializers import UserSerializer, VideoChatSessionSerializer, VideoChatMessageSerializer, VideoAnalysisCacheSerializer
 from chat.models import VideoChatSession, VideoChatMessage, VideoAnalysisCache, Video, User, SocialAccount
-from ..utils.chatbot import ChatBot, chatbots
+from ..utils.chatbot import ChatBot, chatbots, chat_concurrently
 from ..utils.file_utils import process_uploaded_file, summarize_content
 from ..services.optimal_response import collect_multi_llm_responses, format_optimal_response
 from ..services.video_analysis_service import video_analysis_service
@@ -149,7 +149,7 @@ class VideoChatView(APIView):
                 print(f"   현재 세션 ID: {current_session_id}")
                 
                 # 모든 ChatBot 인스턴스의 대화 히스토리 초기화
-                for bot_name, chatbot in chatbots.items():
+                for bot_name, chatbot in chatbots.loaded_items():
                     if hasattr(chatbot, 'conversation_history'):
                         chatbot.conversation_history = []
                         print(f"   ✅ {bot_name} 대화 히스토리 초기화")
@@ -511,42 +511,50 @@ class VideoChatView(APIView):
                     'default': default_response
                 }
             else:
-                # 각 AI 모델에 질문 전송
-                for bot_name, chatbot in chatbots.items():
-                    if bot_name == 'optimal':
-                        continue  # optimal은 나중에 처리
-                    
-                    try:
-                        # 색상 검색 모드 확인
-                        is_color_search = any(keyword in message.lower() for keyword in ['빨간색', '파란색', '노란색', '초록색', '보라색', '분홍색', '검은색', '흰색', '회색', '주황색', '갈색', '옷'])
-                        
-                        # 간소화된 영상 정보 프롬프트 생성
-                        video_context = f"""
+                # 각 AI 모델에 질문 전송 (모든 모델에 같은 프롬프트를 쓰므로 한 번만 생성)
+                # 색상 검색 모드 확인
+                is_color_search = any(keyword in message.lower() for keyword in ['빨간색', '파란색', '노란색', '초록색', '보라색', '분홍색', '검은색', '흰색', '회색', '주황색', '갈색', '옷'])
+                
+                # 간소화된 영상 정보 프롬프트 생성
+                video_context = f"""
 영상: {analysis_data.get('original_name', 'Unknown')} ({analysis_data.get('file_size', 0) / (1024*1024):.1f}MB)
 분석: {len(analysis_json_data.get('frame_results', []))}개 프레임, {analysis_json_data.get('video_summary', {}).get('total_detections', 0)}개 객체
 품질: {analysis_json_data.get('video_summary', {}).get('quality_assessment', {}).get('overall_score', 0):.2f}
 """
-                        
-                        # 간소화된 프레임 정보
-                        frame_context = ""
-                        if relevant_frames:
-                            frame_context = f"\n관련 프레임 {len(relevant_frames)}개:\n"
-                            for i, frame in enumerate(relevant_frames[:2], 1):  # 최대 2개만
-                                frame_context += f"프레임 {i}: {frame['timestamp']:.1f}초, 사람 {len(frame.get('persons', []))}명\n"
-                        else:
-                            frame_context = "\n관련 프레임 없음\n"
-                        
-                        enhanced_message = f"""{video_context}{frame_context}
+                
+                # 간소화된 프레임 정보
+                frame_context = ""
+                if relevant_frames:
+                    frame_context = f"\n관련 프레임 {len(relevant_frames)}개:\n"
+                    for i, frame in enumerate(relevant_frames[:2], 1):  # 최대 2개만
+                        frame_context += f"프레임 {i}: {frame['timestamp']:.1f}초, 사람 {len(frame.get('persons', []))}명\n"
+                else:
+                    frame_context = "\n관련 프레임 없음\n"
+                
+                enhanced_message = f"""{video_context}{frame_context}
 
 사용자 질문: "{message}"
 
 위 정보를 바탕으로 친근하게 답변해주세요."""
-                        
-                        # 간소화된 AI 프롬프트
-                        ai_prompt = enhanced_message
-                        
-                        # AI별 특성화된 프롬프트로 응답 생성
-                        ai_response = chatbot.chat(ai_prompt)
+                
+                # 간소화된 AI 프롬프트
+                ai_prompt = enhanced_message
+                
+                # optimal은 나중에 처리, 나머지 모델은 동시에 호출
+                named_bots = {}
+                for bot_name in list(chatbots.keys()):
+                    if bot_name == 'optimal':
+                        continue
+                    try:
+                        named_bots[bot_name] = chatbots[bot_name]
+                    except KeyError as e:
+                        print(f"AI {bot_name} 초기화 실패: {str(e)}")
+                chat_results = chat_concurrently(named_bots, ai_prompt)
+                
+                for bot_name, ai_response in chat_results.items():
+                    try:
+                        if isinstance(ai_response, Exception):
+                            raise ai_response
                         
                         # 부적절한 응답 필터링 (영상 정보 부재 메시지)
                         blocked_patterns = [
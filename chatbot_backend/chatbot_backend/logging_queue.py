@@ -0,0 +1,44 @@
+"""
+로그 출력을 요청 처리 스레드에서 분리하기 위한 QueueHandler 설정
+
+핸들러는 레코드를 큐에 넣기만 하고, 실제 stdout/파일 쓰기와 Sentry 전송은 QueueListener 스레드가 담당한다.
+settings.LOGGING의 '()' 팩토리로 한 번만 생성된다.
+"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import sentry_sdk
+    from sentry_sdk.integrations.logging import EventHandler
+    SENTRY_AVAILABLE = True
+except ImportError:
+    SENTRY_AVAILABLE = False
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+
+def queue_handler_factory(log_file=None):
+    """QueueListener를 시작하고 그 큐에 연결된 QueueHandler 반환
+
+    log_file이 있으면 파일에도 쓰고, Sentry가 초기화돼 있으면 ERROR 이상(logger.exception 포함)을 이벤트로 보낸다.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    handlers = [stream_handler]
+    
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    
+    if SENTRY_AVAILABLE and sentry_sdk.get_client().is_active():
+        handlers.append(EventHandler(level=logging.ERROR))
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return QueueHandler(log_queue)
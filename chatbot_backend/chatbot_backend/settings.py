@@ -13,6 +13,8 @@ DEBUG = True
 ALLOWED_HOSTS = ['*']  # 필요한 도메인 추가
 
 ROOT_URLCONF = 'chatbot_backend.urls'
+WSGI_APPLICATION = 'chatbot_backend.wsgi.application'
+ASGI_APPLICATION = 'chatbot_backend.asgi.application'
 STATIC_URL = '/static/'
 
 # Media files
@@ -83,6 +85,17 @@ DATABASES = {
     }
 }
 
+# 캐시 설정 - REDIS_URL이 있으면 Redis를 공유 캐시로 사용 (워커 프로세스가 여럿이어도 세션별 대화 이력이 이어짐)
+# 없으면 Django 기본값인 프로세스별 LocMemCache 사용 (이때는 워커 1개로 실행)
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
 
 # REST Framework 설정
 REST_FRAMEWORK = {
@@ -117,3 +130,39 @@ TEMPLATES = [
         },
     },
 ]
+
+# Sentry (선택사항) - SENTRY_DSN이 있고 sentry-sdk가 설치된 경우에만 사용
+# 로그 이벤트는 아래 LOGGING의 큐 리스너가 보내므로 SDK 자체의 logging 연동은 끈다
+SENTRY_DSN = os.getenv('SENTRY_DSN', '')
+if SENTRY_DSN:
+    try:
+        import sentry_sdk
+        from sentry_sdk.integrations.logging import LoggingIntegration
+        sentry_sdk.init(dsn=SENTRY_DSN, integrations=[LoggingIntegration(level=None, event_level=None)])
+    except ImportError:
+        pass
+
+# 로깅 설정 - 로그는 큐를 거쳐 별도 스레드에서 출력 (운영에서는 LOGLEVEL=INFO로 debug 로그 생략)
+# LOG_FILE을 지정하면 파일에도 기록
+LOGLEVEL = os.getenv('LOGLEVEL', 'DEBUG' if DEBUG else 'INFO').upper()
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'queue': {
+            '()': 'chatbot_backend.logging_queue.queue_handler_factory',
+            'log_file': os.getenv('LOG_FILE') or None,
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'chat': {
+            'handlers': ['queue'],
+            'level': LOGLEVEL,
+            'propagate': False,
+        },
+    },
+}
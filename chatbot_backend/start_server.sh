@@ -36,7 +36,23 @@ echo "=================================="
 echo ""
 
 # Django 서버 실행
-python manage.py runserver
+# SERVER_MODE=asgi 이면 uvicorn(ASGI)으로 실행 - 여러 LLM 호출을 기다리는 동안 워커가 막히지 않음
+# (uvloop가 설치되어 있으면 uvicorn이 자동으로 사용)
+if [ "$SERVER_MODE" = "asgi" ]; then
+    if ! command -v uvicorn >/dev/null 2>&1; then
+        echo "❌ SERVER_MODE=asgi 이지만 uvicorn이 설치되어 있지 않습니다. pip install -r requirements.txt 를 실행하세요."
+        exit 1
+    fi
+    # 세션별 대화 이력은 Django 캐시에 있으므로 공유 캐시(REDIS_URL)가 없으면 워커 1개로 실행
+    if [ -n "$REDIS_URL" ]; then
+        DEFAULT_WORKERS=2
+    else
+        DEFAULT_WORKERS=1
+    fi
+    uvicorn chatbot_backend.asgi:application --host 0.0.0.0 --port 8000 --workers "${SERVER_WORKERS:-$DEFAULT_WORKERS}" --loop auto
+else
+    python manage.py runserver
+fi
 
 echo ""
 echo "=================================="